@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+Compact binary serialization of :py:class:`~estnltk.text.Text` with lazy loading of the layers.
+
+The JSON form of an annotated text must be parsed as a whole even if only one layer is needed. The binary form
+stores every key of the text in a separate section, so the layers can be decoded one by one::
+
+    data = dumps(text)
+    text = loads(data, layers=[WORDS])       # decodes only the text and the words
+    document = BinaryText(data)              # decodes the sections when they are accessed
+    lemmas = [...document[WORDS]...]
+
+The layout of the data is::
+
+    magic "ETXB", version (1 byte)
+    string table:  count, (byte length, UTF-8 bytes) per string
+    shape table:   count, (key count, string indices) per shape
+    contents:      count, (key string index, offset, length) per section
+    sections
+
+All integers are unsigned LEB128 varints, the signed ones are zigzag encoded. The strings (the keys of the
+dictionaries and the string values, for example lemmas and part-of-speech tags) are stored once in the string
+table. The dictionaries are stored as the index of their shape (the tuple of their keys) and the values in the
+order of the keys. The elements of the layers are stored with the start position relative to the start of the
+previous element and the length of the span. The offsets of the sections are relative to the end of the
+contents table.
+
+The values that can be stored are the ones that can be stored as JSON, the result of decoding is equal to
+``json.loads(json.dumps(text))``.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import struct
+
+import six
+
+from .names import *
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+MAGIC = b'ETXB'
+VERSION = 1
+
+# the tags of the values, the values of the tags before NULL are followed by a varint
+STRING, DICT, LIST, INT, NEG_INT, NULL, FALSE, TRUE, FLOAT, LAYER, RAW = range(11)
+
+_DOUBLE = struct.Struct('<d')
+
+
+def _write_varint(out, n):
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    b = data[pos]
+    if b < 0x80:
+        return b, pos + 1
+    result, shift = b & 0x7f, 7
+    while True:
+        pos += 1
+        b = data[pos]
+        result |= (b & 0x7f) << shift
+        if b < 0x80:
+            return result, pos + 1
+        shift += 7
+
+
+def _zigzag(n):
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(n):
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+def _is_layer(value):
+    # a list of elements with simple (start, end) spans
+    if not isinstance(value, list) or not value:
+        return False
+    for element in value:
+        if not isinstance(element, dict):
+            return False
+        start, end = element.get(START), element.get(END)
+        if type(start) not in six.integer_types or type(end) not in six.integer_types:
+            return False
+    return True
+
+
+class _Encoder(object):
+
+    def __init__(self):
+        self.strings = {}
+        self.shapes = {}
+
+    def string(self, s):
+        index = self.strings.get(s)
+        if index is None:
+            if not isinstance(s, six.text_type):
+                return self.string(s.decode('utf-8'))
+            index = self.strings[s] = len(self.strings)
+        return index
+
+    def shape(self, keys):
+        keys = tuple(keys)
+        index = self.shapes.get(keys)
+        if index is None:
+            for key in keys:
+                if not isinstance(key, six.string_types):
+                    raise TypeError('The keys of the dictionaries must be strings, got {0!r}'.format(key))
+            index = self.shapes[keys] = len(self.shapes)
+        return index
+
+    def value(self, out, value):
+        if isinstance(value, six.string_types):
+            out.append(STRING)
+            _write_varint(out, self.string(value))
+        elif isinstance(value, dict):
+            out.append(DICT)
+            _write_varint(out, self.shape(value))
+            for item in value.values():
+                self.value(out, item)
+        elif isinstance(value, (list, tuple)):
+            out.append(LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.value(out, item)
+        elif value is None:
+            out.append(NULL)
+        elif value is True:
+            out.append(TRUE)
+        elif value is False:
+            out.append(FALSE)
+        elif isinstance(value, six.integer_types):
+            if value >= 0:
+                out.append(INT)
+                _write_varint(out, value)
+            else:
+                out.append(NEG_INT)
+                _write_varint(out, -value)
+        elif isinstance(value, float):
+            out.append(FLOAT)
+            out.extend(_DOUBLE.pack(value))
+        else:
+            raise TypeError('{0!r} can not be serialized'.format(value))
+
+    def layer(self, out, elements):
+        out.append(LAYER)
+        _write_varint(out, len(elements))
+        previous = 0
+        for element in elements:
+            start, end = element[START], element[END]
+            _write_varint(out, _zigzag(start - previous))
+            _write_varint(out, _zigzag(end - start))
+            previous = start
+            keys = [key for key in element if key != START and key != END]
+            _write_varint(out, self.shape(keys))
+            for key in keys:
+                self.value(out, element[key])
+
+    def section(self, value):
+        out = bytearray()
+        if isinstance(value, six.string_types) and not isinstance(value, six.text_type):
+            value = value.decode('utf-8')
+        if isinstance(value, six.text_type):
+            # long strings like the text itself are not put to the string table
+            data = value.encode('utf-8')
+            out.append(RAW)
+            _write_varint(out, len(data))
+            out.extend(data)
+        elif _is_layer(value):
+            self.layer(out, value)
+        else:
+            self.value(out, value)
+        return out
+
+
+def dumps(text):
+    """Serialize the text to the binary format.
+
+    Parameters
+    ----------
+    text: estnltk.text.Text or dict
+        The text and its layers.
+
+    Returns
+    -------
+    bytes
+        The serialized text.
+    """
+    encoder = _Encoder()
+    keys = list(text)
+    sections = [encoder.section(text[key]) for key in keys]
+    key_indices = [encoder.string(key) for key in keys]
+    # the keys of the shapes are added to the string table before it is written
+    shapes = sorted(encoder.shapes, key=encoder.shapes.get)
+    for shape in shapes:
+        for key in shape:
+            encoder.string(key)
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    strings = sorted(encoder.strings, key=encoder.strings.get)
+    _write_varint(out, len(strings))
+    for s in strings:
+        data = s.encode('utf-8')
+        _write_varint(out, len(data))
+        out.extend(data)
+    _write_varint(out, len(shapes))
+    for shape in shapes:
+        _write_varint(out, len(shape))
+        for key in shape:
+            _write_varint(out, encoder.string(key))
+    _write_varint(out, len(sections))
+    offset = 0
+    for key_index, section in zip(key_indices, sections):
+        _write_varint(out, key_index)
+        _write_varint(out, offset)
+        _write_varint(out, len(section))
+        offset += len(section)
+    for section in sections:
+        out.extend(section)
+    return bytes(out)
+
+
+class _Decoder(object):
+
+    def __init__(self, data, strings, shapes):
+        self.data = data
+        self.strings = strings
+        self.shapes = shapes
+
+    def value(self, pos):
+        data = self.data
+        tag = data[pos]
+        if tag >= NULL:
+            if tag == NULL:
+                return None, pos + 1
+            if tag == TRUE:
+                return True, pos + 1
+            if tag == FALSE:
+                return False, pos + 1
+            if tag == FLOAT:
+                return _DOUBLE.unpack_from(data, pos + 1)[0], pos + 9
+            raise ValueError('Invalid value tag {0} at position {1}'.format(tag, pos))
+        # the one byte varints are read inline, most of the indices and lengths are small
+        n = data[pos + 1]
+        if n < 0x80:
+            pos += 2
+        else:
+            n, pos = _read_varint(data, pos + 1)
+        if tag == STRING:
+            return self.strings[n], pos
+        if tag == DICT:
+            result = {}
+            value = self.value
+            for key in self.shapes[n]:
+                result[key], pos = value(pos)
+            return result, pos
+        if tag == LIST:
+            result = [None] * n
+            value = self.value
+            for i in range(n):
+                result[i], pos = value(pos)
+            return result, pos
+        return (n if tag == INT else -n), pos
+
+    def section(self, pos):
+        data = self.data
+        tag = data[pos]
+        if tag == RAW:
+            length, pos = _read_varint(data, pos + 1)
+            return bytes(data[pos:pos + length]).decode('utf-8')
+        if tag != LAYER:
+            return self.value(pos)[0]
+        count, pos = _read_varint(data, pos + 1)
+        elements = []
+        start = 0
+        for _ in range(count):
+            delta, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            index, pos = _read_varint(data, pos)
+            start += _unzigzag(delta)
+            element = {START: start, END: start + _unzigzag(length)}
+            for key in self.shapes[index]:
+                element[key], pos = self.value(pos)
+            elements.append(element)
+        return elements
+
+
+class BinaryText(Mapping):
+    """The text and layers in the binary format, decoded when they are accessed.
+
+    Only the header (the string table, the shapes and the table of contents) is decoded when the instance is
+    created. The decoded values are memoized.
+
+    Parameters
+    ----------
+    data: bytes
+        The serialized text, or any object supporting the buffer interface and slicing, like a
+        :py:class:`mmap.mmap`.
+    """
+
+    def __init__(self, data):
+        if six.PY2:
+            data = bytearray(data)
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ValueError('The data is not a serialized Text')
+        if data[len(MAGIC)] != VERSION:
+            raise ValueError('Unsupported version of the binary format: {0}'.format(data[len(MAGIC)]))
+        pos = len(MAGIC) + 1
+        count, pos = _read_varint(data, pos)
+        strings = []
+        for _ in range(count):
+            length, pos = _read_varint(data, pos)
+            strings.append(bytes(data[pos:pos + length]).decode('utf-8'))
+            pos += length
+        count, pos = _read_varint(data, pos)
+        shapes = []
+        for _ in range(count):
+            length, pos = _read_varint(data, pos)
+            shape = []
+            for _ in range(length):
+                index, pos = _read_varint(data, pos)
+                shape.append(strings[index])
+            shapes.append(tuple(shape))
+        count, pos = _read_varint(data, pos)
+        contents = []
+        for _ in range(count):
+            index, pos = _read_varint(data, pos)
+            offset, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            contents.append((strings[index], offset, length))
+        self.__sections = dict((key, (pos + offset, length)) for key, offset, length in contents)
+        self.__keys = [key for key, offset, length in contents]
+        self.__decoder = _Decoder(data, strings, shapes)
+        self.__values = {}
+
+    def __getitem__(self, key):
+        if key not in self.__values:
+            if key not in self.__sections:
+                raise KeyError(key)
+            self.__values[key] = self.__decoder.section(self.__sections[key][0])
+        return self.__values[key]
+
+    def __iter__(self):
+        return iter(self.__keys)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __contains__(self, key):
+        return key in self.__sections
+
+    def section_size(self, key):
+        """The number of bytes the value of the key takes."""
+        return self.__sections[key][1]
+
+    def to_dict(self, layers=None):
+        """The text and the given layers (default: all keys) as a dictionary."""
+        keys = self.__keys if layers is None else [key for key in self.__keys if key == TEXT or key in layers]
+        return dict((key, self[key]) for key in keys)
+
+
+def loads(data, layers=None, **kwargs):
+    """Deserialize a text from the binary format.
+
+    Parameters
+    ----------
+    data: bytes
+        The serialized text.
+    layers: list of str
+        The keys to decode besides the text (default: all keys).
+    kwargs:
+        The keyword arguments of :py:class:`~estnltk.text.Text`.
+
+    Returns
+    -------
+    estnltk.text.Text
+        The text.
+    """
+    from .text import Text
+    return Text(BinaryText(data).to_dict(layers), **kwargs)
@@ -49,7 +49,7 @@ def get_unique_clause_indices( text ):
     # Collect (unique) clause indices over the whole text
     clause_indices = []
     sent_id = 0
-    for sub_text in text.split_by( SENTENCES ):
+    for sub_text in text.view_by( SENTENCES ):
         for word, cl_index in zip( sub_text.words, sub_text.clause_indices ):
             clause_indices.append( sent_id+cl_index )
         nr_of_clauses = len(set(sub_text.clause_indices))
@@ -2,6 +2,7 @@
 from __future__ import unicode_literals, print_function, absolute_import
 
 from .text import Text
+from . import binary_format
 
 import codecs
 import json
@@ -89,3 +90,35 @@ def write_document(doc, fnm):
     """
     with codecs.open(fnm, 'wb', 'ascii') as f:
         f.write(json.dumps(doc, indent=2))
+
+
+def read_binary_document(fnm, layers=None):
+    """Read a document that is stored in the binary format of :py:mod:`estnltk.binary_format`.
+
+    Parameters
+    ----------
+    fnm: str
+        The path of the document.
+    layers: list of str
+        The layers to load (default: all layers).
+
+    Returns
+    -------
+    Text
+    """
+    with open(fnm, 'rb') as f:
+        return binary_format.loads(f.read(), layers)
+
+
+def write_binary_document(doc, fnm):
+    """Write a Text document to file in the binary format of :py:mod:`estnltk.binary_format`.
+
+    Parameters
+    ----------
+    doc: Text
+        The document to save.
+    fnm: str
+        The filename to save the document
+    """
+    with open(fnm, 'wb') as f:
+        f.write(binary_format.dumps(doc))
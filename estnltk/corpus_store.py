@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-mapped corpus store with random access to the documents.
+
+A corpus of JSON files (one file per document or one document per line) must be scanned to reach the N-th
+document. A store keeps the documents in a single append-only data file and their offsets in a fixed-width
+index, both memory-mapped, so any document is read without reading the others::
+
+    with CorpusStoreWriter('corpus') as writer:
+        writer.extend(documents)
+
+    store = CorpusStore('corpus')
+    print(len(store), store[1000].text, store[-1].lemmas)
+    for text in store.iter_shard(worker_id, workers, layers=[WORDS]):
+        ...
+
+The store is a directory with two files:
+
+``documents.bin``
+    The documents in the binary format of :py:mod:`estnltk.binary_format`, one after another.
+``index.bin``
+    The magic ``ECIX``, the version byte and three reserved bytes, followed by the end offset of every
+    document in the data file as an 8-byte little-endian unsigned integer.
+
+The writer flushes the data of the documents before their index entries, so an interrupted writer leaves a
+store of the documents written until the last flush. The writer flushes after every ``flush_every`` documents
+and ``flush_bytes`` bytes of data. The data after the last index entry is truncated when
+the store is opened for writing again.
+
+The stores can be passed to worker processes, they are pickled as their path and memory-mapped again.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import mmap
+import os
+import struct
+
+from six.moves import range
+
+from . import binary_format
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+DATA_FILE = 'documents.bin'
+INDEX_FILE = 'index.bin'
+MAGIC = b'ECIX'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sB3x')
+_OFFSET = struct.Struct('<Q')
+
+
+def _map(path):
+    # the empty files can not be memory-mapped
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _check_header(data, path):
+    if len(data) < _HEADER.size:
+        raise ValueError('Invalid corpus store index: {0}'.format(path))
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError('Invalid corpus store index: {0}'.format(path))
+    if version != VERSION:
+        raise ValueError('Unsupported version of the corpus store: {0}'.format(version))
+
+
+def shard_range(size, worker, workers):
+    """The range of the indices of the documents of the worker, when the documents are divided to contiguous
+    shards of (almost) equal size."""
+    if not 0 <= worker < workers:
+        raise ValueError('The worker id must be between 0 and {0}, got {1}'.format(workers - 1, worker))
+    return range(size * worker // workers, size * (worker + 1) // workers)
+
+
+class CorpusStore(Sequence):
+    """Read-only random access to the documents of a corpus store.
+
+    Parameters
+    ----------
+    path: str
+        The directory of the store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.__data = _map(os.path.join(path, DATA_FILE))
+        self.__index = _map(os.path.join(path, INDEX_FILE))
+        _check_header(self.__index, os.path.join(path, INDEX_FILE))
+        self.__size = (len(self.__index) - _HEADER.size) // _OFFSET.size
+
+    def __len__(self):
+        return self.__size
+
+    def __span(self, i):
+        if i < 0:
+            i += self.__size
+        if not 0 <= i < self.__size:
+            raise IndexError('Document index out of range: {0}'.format(i))
+        end = _OFFSET.unpack_from(self.__index, _HEADER.size + i * _OFFSET.size)[0]
+        start = 0 if i == 0 else _OFFSET.unpack_from(self.__index, _HEADER.size + (i - 1) * _OFFSET.size)[0]
+        return start, end
+
+    def raw(self, i):
+        """The serialized i-th document."""
+        start, end = self.__span(i)
+        return self.__data[start:end]
+
+    def document(self, i):
+        """The i-th document as :py:class:`~estnltk.binary_format.BinaryText`, that decodes the layers when
+        they are accessed."""
+        return binary_format.BinaryText(self.raw(i))
+
+    def get(self, i, layers=None, **kwargs):
+        """The i-th document as :py:class:`~estnltk.text.Text`.
+
+        Parameters
+        ----------
+        i: int
+            The index of the document.
+        layers: list of str
+            The layers to load (default: all layers).
+        kwargs:
+            The keyword arguments of :py:class:`~estnltk.text.Text`.
+        """
+        return binary_format.loads(self.raw(i), layers, **kwargs)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.get(k) for k in range(*i.indices(self.__size))]
+        return self.get(i)
+
+    def __iter__(self):
+        for i in range(self.__size):
+            yield self.get(i)
+
+    def shard(self, worker, workers):
+        """The indices of the documents of the worker, see :py:func:`shard_range`."""
+        return shard_range(self.__size, worker, workers)
+
+    def iter_shard(self, worker, workers, layers=None, **kwargs):
+        """Yield the documents of the worker, the workers together iterate over the whole store once.
+
+        Parameters
+        ----------
+        worker: int
+            The id of the worker, from 0 to ``workers - 1``.
+        workers: int
+            The number of workers.
+        layers: list of str
+            The layers to load (default: all layers).
+        kwargs:
+            The keyword arguments of :py:class:`~estnltk.text.Text`.
+        """
+        for i in self.shard(worker, workers):
+            yield self.get(i, layers, **kwargs)
+
+    def close(self):
+        for data in (self.__data, self.__index):
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def __repr__(self):
+        return 'CorpusStore({0!r}, {1} documents)'.format(self.path, self.__size)
+
+
+class CorpusStoreWriter(object):
+    """Appends documents to a corpus store, the store is created if it does not exist.
+
+    Parameters
+    ----------
+    path: str
+        The directory of the store.
+    flush_every: int
+        Flush after this many documents have been appended since the last flush (default: 1000).
+        If None, only the explicit flushes and closing the writer flush.
+    flush_bytes: int
+        Flush after this many bytes of data have been appended since the last flush (default: 64 MiB).
+        If None, the size of the data does not cause flushes.
+    """
+
+    def __init__(self, path, flush_every=1000, flush_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_bytes = flush_bytes
+        if not os.path.exists(path):
+            os.makedirs(path)
+        index_path = os.path.join(path, INDEX_FILE)
+        data_path = os.path.join(path, DATA_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, 'rb') as f:
+                _check_header(f.read(_HEADER.size), index_path)
+                size = (os.fstat(f.fileno()).st_size - _HEADER.size) // _OFFSET.size
+                end = 0
+                if size:
+                    f.seek(_HEADER.size + (size - 1) * _OFFSET.size)
+                    end = _OFFSET.unpack(f.read(_OFFSET.size))[0]
+        else:
+            with open(index_path, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, VERSION))
+            size = end = 0
+        # drop the data and the partial index entry written after the last flush
+        self.__index = open(index_path, 'r+b')
+        self.__index.truncate(_HEADER.size + size * _OFFSET.size)
+        self.__index.seek(0, os.SEEK_END)
+        self.__data = open(data_path, 'r+b' if os.path.exists(data_path) else 'w+b')
+        self.__data.truncate(end)
+        self.__data.seek(end)
+        self.__end = end
+        self.__flushed_end = end
+        self.__pending = []
+        self.size = size
+
+    def append(self, document):
+        """Append a document (:py:class:`~estnltk.text.Text` or a dict with the text and the layers).
+
+        Returns
+        -------
+        int
+            The index of the document in the store.
+        """
+        data = binary_format.dumps(document)
+        self.__data.write(data)
+        self.__end += len(data)
+        self.__pending.append(self.__end)
+        self.size += 1
+        if ((self.flush_every is not None and len(self.__pending) >= self.flush_every) or
+                (self.flush_bytes is not None and self.__end - self.__flushed_end >= self.flush_bytes)):
+            self.flush()
+        return self.size - 1
+
+    def extend(self, documents):
+        """Append the documents."""
+        for document in documents:
+            self.append(document)
+
+    def flush(self):
+        """Write the data of the appended documents and then their index entries to disk."""
+        self.__data.flush()
+        os.fsync(self.__data.fileno())
+        self.__index.write(b''.join(_OFFSET.pack(end) for end in self.__pending))
+        self.__index.flush()
+        os.fsync(self.__index.fileno())
+        self.__flushed_end = self.__end
+        self.__pending = []
+
+    def close(self):
+        if not self.__index.closed:
+            self.flush()
+            self.__data.close()
+            self.__index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def write_corpus_store(documents, path, **kwargs):
+    """Append the documents to the corpus store in the given directory.
+
+    The keyword arguments are passed to :py:class:`CorpusStoreWriter`.
+
+    Returns
+    -------
+    int
+        The number of documents in the store.
+    """
+    with CorpusStoreWriter(path, **kwargs) as writer:
+        writer.extend(documents)
+    return writer.size
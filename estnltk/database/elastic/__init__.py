@@ -1,16 +1,54 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function, absolute_import
 
-__all__ = ['Index', 'create_index', 'connect', 'query_grammar']
+__all__ = ['Index', 'RawSentence', 'create_index', 'connect', 'migrate', 'positional_tokens', 'query_grammar']
 
-import copy
+import collections
 import elasticsearch
 import elasticsearch.helpers
 import itertools
 import json
+import multiprocessing
+import six
+import sys
+import threading
+import time
+import uuid
+from cached_property import cached_property
+from multiprocessing.pool import ThreadPool
+from six.moves import map, zip, queue
 
 from .mapping import mapping
 from estnltk.text import Text
+from estnltk.text_view import TextView
+
+# bulk responses with these statuses are retried: the cluster was busy or unavailable
+# ('N/A' is the status of connection errors)
+RETRY_STATUSES = (429, 503, 'N/A')
+
+# separates the alternative analyses of a word in the lemmas and postags fields
+ALTERNATIVE_SEPARATOR = '|'
+
+
+def positional_tokens(list_of_lists):
+    """Build a positional token stream from the alternative values of the words.
+
+    Every word takes one whitespace separated token, the alternatives of the word are joined
+    with ``|``. The analyzers in the mapping split the alternatives into tokens at the same
+    position, so phrase queries over lemma or postag sequences match any combination of the
+    alternatives, while the size of the field stays linear in the length of the sentence.
+
+    Parameters
+    ----------
+    list_of_lists : list of list of str
+        For example :py:attr:`~estnltk.text.Text.lemma_lists`.
+
+    Returns
+    -------
+    str
+    """
+    return ' '.join(ALTERNATIVE_SEPARATOR.join(sorted(set(value.replace(' ', '_') for value in values)))
+                    for values in list_of_lists)
 
 
 def create_index(index_name, **kwargs):
@@ -52,6 +90,68 @@ def connect(index_name, **kwargs):
     return Index(client, index_name)
 
 
+def migrate(source_name, target_name, chunk_size=500, **kwargs):
+    """Copy an index created with an older mapping to a new index with the current mapping.
+
+    Elasticsearch does not allow changing the analyzers of existing fields, so the indexes
+    created before the positional ``lemmas`` and ``postags`` fields have to be reindexed.
+    The documents and sentences keep their ids and the sentence fields are rebuilt from
+    the stored estnltk text objects. Point an alias to the new index to switch over.
+
+    Parameters
+    ----------
+    source_name : str
+        Name of the existing index.
+    target_name : str
+        Name of the index to be created.
+    chunk_size : int
+        Number of documents and sentences sent in one bulk request (default: 500).
+    **kwargs
+        Arguments to pass to Elasticsearch instance.
+
+    Returns
+    -------
+
+    Index
+        The new index.
+    """
+    target = create_index(target_name, **kwargs)
+    hits = elasticsearch.helpers.scan(target.client, index=source_name, doc_type='document,sentence',
+                                      query={'_source': True, 'fields': ['_parent']})
+    success, errors = elasticsearch.helpers.bulk(target.client, target._get_migration_actions(hits),
+                                                 chunk_size=chunk_size, raise_on_error=False)
+    if errors:
+        raise elasticsearch.helpers.BulkIndexError('%i document(s) failed to index.' % len(errors), errors)
+    return target
+
+
+class RawSentence(object):
+    """A sentence read from the index, the estnltk text object is decoded only when it is needed."""
+
+    def __init__(self, hit):
+        self.id = hit['_id']
+        self.source = hit['fields']['estnltk_text_object'][0]
+
+    @cached_property
+    def text(self):
+        """The sentence as a :py:class:`~estnltk.text.Text` instance."""
+        return Text(json.loads(self.source))
+
+
+class _ApplyToText(object):
+    """Decodes the raw sentences in the worker processes of :py:meth:`Index.map_sentences`."""
+
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self, source):
+        return self.function(Text(json.loads(source)))
+
+
+# marks the end of a slice in the queue of Index.raw_sentences
+_SLICE_DONE = object()
+
+
 class Index:
     def __init__(self, client, index_name):
         """
@@ -65,6 +165,18 @@ class Index:
         self.client = client
         assert client.indices.exists(index=index_name), 'Index "{}" does not exist'.format(index_name)
 
+    def mapping_version(self):
+        """Version of the mapping the index was created with.
+
+        Indexes created before the mapping was versioned have version 1, use :py:func:`migrate`
+        to bring them up to date.
+        """
+        response = self.client.indices.get_mapping(index=self.index_name, doc_type='sentence')
+        for index in response.values():
+            sentence = index['mappings'].get('sentence', {})
+            return sentence.get('_meta', {}).get('estnltk_mapping_version', 1)
+        return 1
+
     def sentences(self, exclude_ids=None, query=None, return_estnltk_object=True, **kwargs):
         if query is None:
             query = {}
@@ -87,6 +199,123 @@ class Index:
         else:
             raise NotImplementedError('ID exclusion is not implemented')
 
+    def _shard_count(self):
+        settings = self.client.indices.get_settings(index=self.index_name)
+        return int(list(settings.values())[0]['settings']['index']['number_of_shards'])
+
+    def raw_sentences(self, query=None, slices=None, size=1000, **kwargs):
+        """Read the sentences of the index with concurrent scroll cursors.
+
+        Every slice scrolls over its own subset of the shards of the index, so the
+        slices do not read the same sentences twice. The hits are yielded in the order
+        they arrive and the JSON of the sentences is not decoded.
+
+        Parameters
+        ----------
+        query : dict
+            Body of the search request (default: all sentences).
+        slices : int
+            Number of concurrent scroll cursors (default: the number of shards).
+            There are at most as many slices as there are shards.
+        size : int
+            Number of hits per shard fetched with one scroll request (default: 1000).
+        **kwargs
+            Parameters to pass to :py:func:`elasticsearch.helpers.scan`.
+
+        Yields
+        ------
+        RawSentence
+        """
+        query = dict(query or {})
+        query['fields'] = ['estnltk_text_object']
+        shards = self._shard_count()
+        slices = shards if slices is None else max(min(slices, shards), 1)
+
+        def scan(**preference):
+            params = dict(kwargs, **preference)
+            return elasticsearch.helpers.scan(self.client, query=query, index=self.index_name,
+                                              doc_type='sentence', size=size, **params)
+
+        if slices == 1:
+            for hit in scan():
+                yield RawSentence(hit)
+            return
+
+        hits = queue.Queue(maxsize=slices * size)
+        stopped = threading.Event()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    hits.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read_slice(shard_ids):
+            try:
+                for hit in scan(preference='_shards:' + ','.join(map(str, shard_ids))):
+                    if not put(hit):
+                        return
+            except Exception:
+                put(sys.exc_info())
+            put(_SLICE_DONE)
+
+        threads = []
+        for i in range(slices):
+            thread = threading.Thread(target=read_slice, args=(list(range(i, shards, slices)),))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        try:
+            running = slices
+            while running:
+                item = hits.get()
+                if item is _SLICE_DONE:
+                    running -= 1
+                elif isinstance(item, tuple):
+                    six.reraise(*item)
+                else:
+                    yield RawSentence(item)
+        finally:
+            stopped.set()
+
+    def map_sentences(self, function, query=None, processes=None, slices=None, chunksize=100, **kwargs):
+        """Apply a function to the sentences of the index in a process pool.
+
+        The sentences are read with :py:meth:`raw_sentences` and decoded into
+        :py:class:`~estnltk.text.Text` instances in the worker processes.
+
+        Parameters
+        ----------
+        function : callable
+            Picklable function taking a Text, for example a module level function.
+        query : dict
+            Body of the search request (default: all sentences).
+        processes : int
+            Number of worker processes (default: the number of CPUs).
+        slices : int
+            Number of concurrent scroll cursors (default: the number of shards).
+        chunksize : int
+            Number of sentences sent to a worker at once (default: 100).
+        **kwargs
+            Parameters to pass to :py:meth:`raw_sentences`.
+
+        Yields
+        ------
+        The results of the function, in no particular order.
+        """
+        pool = multiprocessing.Pool(processes)
+        try:
+            sources = (sentence.source for sentence in self.raw_sentences(query=query, slices=slices, **kwargs))
+            for result in pool.imap_unordered(_ApplyToText(function), sources, chunksize):
+                yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
     @staticmethod
     def _get_indexable_sentences(document):
         """
@@ -102,44 +331,186 @@ class Index:
 
         """
 
-        def unroll_lists(list_of_lists):
-            for i in itertools.product(*[set(j) for j in list_of_lists]):
-                yield ' '.join(i)
-
-        sents = document.split_by_sentences()
+        sents = document.view_by_sentences()
         for order, sent in enumerate(sents):
-            postags = list(unroll_lists(sent.postag_lists))
-            lemmas = list(unroll_lists(sent.lemma_lists))
-            text = sent.text
-            words = copy.deepcopy(sent.words)
-            for i in words:
-                del i['start']
-                del i['end']
-
-            sentence = {
-                'estnltk_text_object': json.dumps(sent),
-                'meta': {
-                    'order_in_parent': order
-                },
-                'text': text,
-                'words': words,
-                'postags': postags,
-                'lemmas': lemmas
+            yield json.dumps(Index._get_sentence_source(sent, order))
+
+    @staticmethod
+    def _get_sentence_source(sent, order):
+        words = [dict((key, value) for key, value in word.items() if key not in ('start', 'end'))
+                 for word in sent.words]
+        return {
+            'estnltk_text_object': json.dumps(sent.to_dict() if isinstance(sent, TextView) else sent),
+            'meta': {
+                'order_in_parent': order
+            },
+            'text': sent.text,
+            'words': words,
+            'postags': positional_tokens(sent.postag_lists),
+            'lemmas': positional_tokens(sent.lemma_lists)
+        }
+
+    def _get_migration_actions(self, hits):
+        """Bulk actions copying the search hits of an older index to this index."""
+        for hit in hits:
+            action = {
+                '_index': self.index_name,
+                '_type': hit['_type'],
+                '_id': hit['_id'],
+                '_source': hit['_source']
             }
-            yield json.dumps(sentence)
+            if hit['_type'] == 'sentence':
+                parent = hit.get('_parent') or hit.get('fields', {}).get('_parent')
+                if isinstance(parent, list):
+                    parent = parent[0]
+                action['_parent'] = parent
+                sent = Text(json.loads(hit['_source']['estnltk_text_object']))
+                action['_source'] = self._get_sentence_source(sent, hit['_source']['meta']['order_in_parent'])
+            yield action
 
     def save(self, document, meta=None):
+        """Save a single document and its sentences with one bulk request."""
+        self.save_many([document], metas=None if meta is None else [meta])
+
+    def _get_bulk_actions(self, document, meta=None):
         if getattr(document, '__db_meta', None):
             # we should overwrite a previous object
             raise NotImplementedError('Changing objects in the database has not been implemented.')
+        # ids are generated here, so that the sentences can be routed to their parent
+        # in the same request and retried requests do not create duplicates
+        document_id = uuid.uuid4().hex
+        yield {
+            '_index': self.index_name,
+            '_type': 'document',
+            '_id': document_id,
+            '_source': {} if meta is None else meta
+        }
+        for order, sent in enumerate(self._get_indexable_sentences(document)):
+            yield {
+                '_index': self.index_name,
+                '_type': 'sentence',
+                '_id': '{}_{}'.format(document_id, order),
+                '_parent': document_id,
+                '_source': sent
+            }
+
+    def _send_chunk(self, chunk, max_retries, initial_backoff):
+        """Send a chunk of bulk actions, retrying the actions rejected by a busy cluster.
+
+        Returns
+        -------
+        (int, list, int)
+            Number of indexed actions, list of errors and number of retries.
+        """
+        indexed, retries, failed = 0, 0, []
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                retries += 1
+                time.sleep(initial_backoff * 2 ** (attempt - 1))
+            actions = dict((action['_id'], action) for action in chunk)
+            success, errors = elasticsearch.helpers.bulk(self.client, chunk, chunk_size=len(chunk),
+                                                         raise_on_error=False, raise_on_exception=False)
+            indexed += success
+            chunk = []
+            for error in errors:
+                info = list(error.values())[0]
+                if info.get('status') in RETRY_STATUSES and attempt < max_retries:
+                    chunk.append(actions[info['_id']])
+                else:
+                    failed.append(error)
+            if not chunk:
+                break
+        return indexed, failed, retries
+
+    def save_many(self, documents, metas=None, chunk_size=500, threads=1, max_retries=3, initial_backoff=2,
+                  progress=None):
+        """Save documents and their sentences with the bulk API.
+
+        Parameters
+        ----------
+        documents : iterable of Text
+            Documents to save.
+        metas : iterable of dict
+            Meta information of the documents, in the same order (default: empty metas).
+        chunk_size : int
+            Number of documents and sentences sent in one bulk request (default: 500).
+        threads : int
+            Number of concurrent bulk requests, the documents are read only as far as these requests
+            need (default: 1).
+        max_retries : int
+            How many times the actions rejected by a busy cluster are resent (default: 3).
+        initial_backoff : float
+            Seconds to wait before the first retry, doubled after each retry (default: 2).
+        progress : callable
+            If given, called with the statistics after every bulk request. A document is counted when
+            the request with its last action has returned.
+
+        Returns
+        -------
+        dict
+            Statistics: the numbers of documents, indexed actions and retries and elapsed seconds.
+
+        Raises
+        ------
+        elasticsearch.helpers.BulkIndexError
+            If some actions failed to index.
+        """
+        if metas is None:
+            metas = itertools.repeat(None)
+        stats = {'documents': 0, 'indexed': 0, 'retries': 0, 'seconds': 0.0}
+        errors = []
+
+        def actions():
+            for document, meta in zip(documents, metas):
+                document_actions = list(self._get_bulk_actions(document, meta))
+                for i, action in enumerate(document_actions, 1):
+                    yield action, i == len(document_actions)
+
+        def chunks():
+            # the chunks and the numbers of the documents that end in them
+            it = actions()
+            while True:
+                chunk = list(itertools.islice(it, chunk_size))
+                if not chunk:
+                    return
+                yield [action for action, _ in chunk], sum(1 for _, last in chunk if last)
+
+        def send(chunk):
+            return self._send_chunk(chunk, max_retries, initial_backoff)
+
+        def collect(result, count):
+            indexed, chunk_errors, retries = result
+            stats['documents'] += count
+            stats['indexed'] += indexed
+            stats['retries'] += retries
+            stats['seconds'] = time.time() - start
+            errors.extend(chunk_errors)
+            if progress is not None:
+                progress(stats)
+
+        start = time.time()
+        if threads > 1:
+            # at most `threads` chunks are read ahead of the finished requests
+            pool = ThreadPool(threads)
+            pending = collections.deque()
+            try:
+                for chunk, count in chunks():
+                    pending.append((pool.apply_async(send, (chunk,)), count))
+                    if len(pending) >= threads:
+                        result, count = pending.popleft()
+                        collect(result.get(), count)
+                while pending:
+                    result, count = pending.popleft()
+                    collect(result.get(), count)
+            finally:
+                pool.close()
+                pool.join()
         else:
-            # we should create a new object
-            document_in_es = self.client.index(self.index_name, 'document', {} if meta is None else meta)
-            for sent in self._get_indexable_sentences(document):
-                self.client.index(self.index_name,
-                    'sentence',
-                    sent,
-                    parent=document_in_es['_id'])
+            for chunk, count in chunks():
+                collect(send(chunk), count)
+        if errors:
+            raise elasticsearch.helpers.BulkIndexError('%i document(s) failed to index.' % len(errors), errors)
+        return stats
 
     def get_iter(self, document, meta=None):
         if getattr(document, '__db_meta', None):
@@ -1,5 +1,14 @@
 # This is the mapping file for creating new indexes.
 # It is somewhat more verbose than it needs to be, but it is explicit in its choices.
+#
+# Version history:
+#   1 - lemmas and postags contained every combination of the analyses of the words in a sentence
+#   2 - lemmas and postags are positional token streams, where the alternative analyses of a word
+#       are separated by "|" and indexed at the same position. Analyzers of existing fields can not
+#       be changed, so indexes of version 1 have to be copied to a new index with
+#       estnltk.database.elastic.migrate
+MAPPING_VERSION = 2
+
 mapping = {
     "mappings": {
         "document": {
@@ -34,6 +43,9 @@ mapping = {
             "_all": {
                 "enabled": False
             },
+            "_meta": {
+                "estnltk_mapping_version": MAPPING_VERSION
+            },
             "_parent": {
                 "type": "document"
             },
@@ -44,12 +56,11 @@ mapping = {
                     "type": "string"  # Not analyzed, stored as text
                 },
                 "lemmas": {
-                    "analyzer": "estnltk_lowercase",
+                    "analyzer": "estnltk_alternatives_lowercase",  # alternative analyses share a position
                     "norms": {
                         "enabled": False
                     },
-                    "type": "string",
-                    "position_increment_gap": 100  # different analyses are separated by 100 positions
+                    "type": "string"
                 },
                 "meta": {
                     "properties": {
@@ -63,12 +74,11 @@ mapping = {
                     }
                 },
                 "postags": {
-                    "analyzer": "estnltk_uppercase",
+                    "analyzer": "estnltk_alternatives_uppercase",
                     "norms": {
                         "enabled": False
                     },
-                    "type": "string",
-                    "position_increment_gap": 100
+                    "type": "string"
                 },
                 "text": {
                     "analyzer": "whitespace",
@@ -161,7 +171,32 @@ mapping = {
     },
     "settings": {
         "analysis": {
+            "filter": {
+                "estnltk_alternatives": {  # "a|b|c" -> "a", "b", "c" at the position of the word
+                    "type": "pattern_capture",
+                    "preserve_original": False,
+                    "patterns": [
+                        "([^|]+)"
+                    ]
+                }
+            },
             "analyzer": {
+                "estnltk_alternatives_lowercase": {
+                    "filter": [
+                        "estnltk_alternatives",
+                        "lowercase"
+                    ],
+                    "tokenizer": "whitespace",
+                    "type": "custom"
+                },
+                "estnltk_alternatives_uppercase": {
+                    "filter": [
+                        "estnltk_alternatives",
+                        "uppercase"
+                    ],
+                    "tokenizer": "whitespace",
+                    "type": "custom"
+                },
                 "estnltk_lowercase": {
                     "filter": [
                         "lowercase"
@@ -1,12 +1,15 @@
 import collections
 import uuid
-from estnltk.text import Text
 
-try:
-    import sympy
-except ImportError as e:
-    print('Query grammar is a helper module. It has "sympy" as an additional dependancy.')
-    raise e
+
+def _import_sympy():
+    # only building the queries needs sympy
+    try:
+        import sympy
+    except ImportError as e:
+        print('Query grammar is a helper module. It has "sympy" as an additional dependancy.')
+        raise e
+    return sympy
 
 __all__ = ['Grammar', 'Word', 'And', 'Or']
 
@@ -39,6 +42,7 @@ class Grammar:
 
 
     def query(self):
+        sympy = _import_sympy()
         # list of all words in grammar
         words = []
 
@@ -103,61 +107,89 @@ class Grammar:
         return main_query
 
     def annotate(self, estnltk_text, label):
-        # list of all words in grammar
-        words = []
-
-        # list of all operations
-        operations = []
-
-        nodes = [self.root]
-
-        while nodes:
-            node = nodes.pop()
-            if _is_word(node):
-                words.append(node)
-            elif _is_operation(node):
-                nodes.extend(node.nodes)
-                operations.append(node)
-        words_to_symbols = dict(zip(words, sympy.symbols([word.id for word in words])))
-        symbols_to_words = dict((v, k) for (k, v) in words_to_symbols.items())
-        expression = sympy.to_dnf(node_to_symbol(words_to_symbols, self.root), simplify=True)
-
-
-
-        def match(word_object, estnltk_word):
-            assert isinstance(word_object, Word)
-            assert isinstance(estnltk_word, Text)
-
-
-            for param, value in word_object.params.items():
-
-
-                if set(value).issubset(set([i[param] for i in estnltk_word.analysis[0]])):
-                    continue
-                else:
-                    return False
-            return True
+        """Add a layer of the words that satisfy the grammar.
+
+        The grammar tree is evaluated over the whole text: a word node matches the words with an
+        analysis, where the value of every given parameter is one of the given values (like the
+        nested query of :py:func:`word_to_query`), an Or node matches the words matched by any of
+        its nodes and an And node matches the words matched by its nodes, if all of them match
+        some word in the text.
+
+        Parameters
+        ----------
+        estnltk_text : Text
+        label : str
+            Name of the layer to be created.
+        """
+        matcher = _compile(self.root)
+        memo = {}
+        leaf_matches = collections.defaultdict(set)
+        for index, analyses in enumerate(estnltk_text.analysis):
+            values = {}
+            for word, params in matcher.leaves:
+                # words with the same analyses give the same results
+                key = (word.id, _values(analyses, tuple(params), values))
+                result = memo.get(key)
+                if result is None:
+                    result = memo[key] = any(all(value in needed for needed, value in zip(params.values(), found))
+                                             for found in key[1])
+                if result:
+                    leaf_matches[word.id].add(index)
+
+        spans = estnltk_text.word_spans
+        estnltk_text[label] = [{'start': spans[i][0], 'end': spans[i][1]} for i in sorted(matcher(leaf_matches))]
+
+
+def _values(analyses, params, cache):
+    """The tuples of the values of the parameters in every analysis of a word."""
+    if params not in cache:
+        cache[params] = frozenset(tuple(analysis[param] for param in params) for analysis in analyses)
+    return cache[params]
+
+
+def _compile(node):
+    """Compile the grammar tree into a function from the matches of the word nodes to the matches of the tree.
+
+    The returned function has the attribute ``leaves``: a list of (word, params) pairs, where the params
+    map the parameter names to the sets of the allowed values.
+    """
+    if _is_word(node):
+        params = collections.OrderedDict((k, frozenset(v)) for k, v in sorted(node.params.items()))
 
+        def matcher(leaf_matches):
+            return leaf_matches.get(node.id, set())
 
-        words_to_matches = collections.defaultdict(set)
-        e_words = estnltk_text.split_by_words()
+        matcher.leaves = [(node, params)]
+    elif isinstance(node, And):
+        children = [_compile(child) for child in node.nodes]
 
-        spans = [{'start':a, 'end':b} for a,b in  estnltk_text.word_spans]
+        def matcher(leaf_matches):
+            result = set()
+            for child in children:
+                matches = child(leaf_matches)
+                if not matches:
+                    return set()
+                result |= matches
+            return result
 
-        for _ind,e_word in enumerate(e_words):
-            for word in words:
-                if match(word, e_word):
-                    words_to_matches[word].add(_ind)
+        matcher.leaves = [leaf for child in children for leaf in child.leaves]
+    elif isinstance(node, Or):
+        children = [_compile(child) for child in node.nodes]
 
-        if words_to_matches:
-            layer = [spans[i] for i in set.union( *words_to_matches.values() )]
-        else:
-            layer = []
+        def matcher(leaf_matches):
+            result = set()
+            for child in children:
+                result |= child(leaf_matches)
+            return result
 
-        estnltk_text[label] = layer
+        matcher.leaves = [leaf for child in children for leaf in child.leaves]
+    else:
+        raise AssertionError("Don't know what I got or why.")
+    return matcher
 
 
 def node_to_symbol(words_to_symbols, node):
+    sympy = _import_sympy()
     if _is_word(node):
         return words_to_symbols[node]
     elif _is_operation(node):
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Lemmatization of a text column of a relational database table.
+
+The job works with any DB-API 2.0 connection (MySQLdb, psycopg2, sqlite3, ...). The rows having NULL in the
+destination column are read in batches ordered by the primary key (``WHERE pkey > last ORDER BY pkey LIMIT n``),
+so no server-side cursor is needed and an interrupted job continues from the rows that are not lemmatized yet.
+The texts are lemmatized by a pool of worker processes, while the main process reads the next batch and writes
+the results of the previous one with ``executemany``.
+
+Example::
+
+    import MySQLdb
+    from estnltk.database.sql import lemmatize_table
+
+    conn = MySQLdb.connect(user='test', passwd='test', db='test', charset='utf8', use_unicode=True)
+    lemmatize_table(conn, 'lemmatize', 'text', 'lemmatized', quote='`')
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import logging
+import sys
+import time
+from multiprocessing import Pool
+
+from estnltk.text import Text
+
+logger = logging.getLogger('estnltk.database.sql')
+
+READ_SQL = 'select {pkey}, {src_field} from {table} where {dest_field} is null{after} order by {pkey} limit {limit}'
+UPDATE_SQL = 'update {table} set {dest_field}={param} where {pkey}={param}'
+
+PARAMS = {
+    'qmark': '?',
+    'format': '%s',
+    'pyformat': '%s',
+}
+
+
+def lemmatize(text):
+    """The lowercased lemmas of the text separated by spaces, ambiguous lemmas are separated with ``|``."""
+    return ' '.join(Text(text or '').lemmas).lower()
+
+
+def _paramstyle(conn):
+    module = sys.modules.get(type(conn).__module__.split('.')[0])
+    paramstyle = getattr(module, 'paramstyle', 'format')
+    if paramstyle not in PARAMS:
+        raise ValueError('Unsupported DB-API paramstyle {0!r}.'.format(paramstyle))
+    return paramstyle
+
+
+def lemmatize_table(conn, table, src_field, dest_field, pkey='id', function=lemmatize, processes=None,
+                    read_size=10000, write_size=1000, commit_every=10000, chunksize=100, quote='"',
+                    paramstyle=None, report_every=60):
+    """Lemmatize the ``src_field`` column of the table into the ``dest_field`` column.
+
+    Only the rows with NULL in ``dest_field`` are processed, so the job can be restarted after it is interrupted.
+
+    Parameters
+    ----------
+    conn:
+        DB-API 2.0 connection.
+    table: str
+        The name of the table.
+    src_field: str
+        The column of the texts.
+    dest_field: str
+        The column of the lemmatized texts.
+    pkey: str
+        The primary key of the table (default: "id"), its values must be comparable.
+    function: callable
+        A picklable function that converts the text, default: :py:func:`lemmatize`.
+    processes: int
+        Number of worker processes (default: number of CPUs).
+    read_size: int
+        Number of rows read with one query (default: 10000).
+    write_size: int
+        Number of rows updated with one ``executemany`` call (default: 1000).
+    commit_every: int
+        The transaction is committed after this many updated rows (default: 10000) and at the end.
+    chunksize: int
+        Number of texts sent to a worker process at once (default: 100).
+    quote: str
+        The character used for quoting the table and column names (default: '"', use '`' for MySQL).
+    paramstyle: str
+        DB-API paramstyle of the connection: "qmark", "format" or "pyformat". By default, it is taken from
+        the module of the connection.
+    report_every: float
+        The throughput is logged after this many seconds (default: 60).
+
+    Returns
+    -------
+    dict
+        Statistics: the number of updated rows, elapsed seconds and rows per second.
+    """
+    names = dict((name, '{0}{1}{0}'.format(quote, value)) for name, value in
+                 (('table', table), ('src_field', src_field), ('dest_field', dest_field), ('pkey', pkey)))
+    param = PARAMS[paramstyle or _paramstyle(conn)]
+    update_sql = UPDATE_SQL.format(param=param, **names)
+
+    def read(last):
+        after = '' if last is None else ' and {0}>{1}'.format(names['pkey'], param)
+        cursor = conn.cursor()
+        cursor.execute(READ_SQL.format(after=after, limit=int(read_size), **names), () if last is None else (last,))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    stats = {'rows': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+    start = reported = time.time()
+
+    def report():
+        stats['seconds'] = time.time() - start
+        stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+        logger.info('Lemmatized {rows} rows in {seconds:.1f} seconds, {rows_per_second:.1f} rows '
+                    'per second'.format(**stats))
+
+    uncommitted = 0
+    pool = Pool(processes)
+    try:
+        rows = read(None)
+        pending = None
+        while rows or pending is not None:
+            # lemmatize the batch in the pool, while the previous batch is written and the next one is read
+            job = pool.map_async(function, [row[1] for row in rows], chunksize) if rows else None
+            if pending is not None:
+                keys, results = pending[0], pending[1].get()
+                cursor = conn.cursor()
+                for i in range(0, len(keys), write_size):
+                    cursor.executemany(update_sql, list(zip(results[i:i + write_size], keys[i:i + write_size])))
+                    stats['rows'] += len(keys[i:i + write_size])
+                    uncommitted += len(keys[i:i + write_size])
+                    if uncommitted >= commit_every:
+                        conn.commit()
+                        uncommitted = 0
+                cursor.close()
+            if time.time() - reported >= report_every:
+                reported = time.time()
+                report()
+            pending = ([row[0] for row in rows], job) if rows else None
+            rows = read(rows[-1][0]) if rows else []
+        conn.commit()
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+    report()
+    return stats
@@ -353,3 +353,65 @@ def divide(elements, by, translate=False, sep=' '):
     """
     outer_spans = [spans(elem) for elem in by]
     return divide_by_spans(elements, outer_spans, translate=translate, sep=sep)
+
+
+class DivisionIndex(object):
+    """The bins of dividing a layer by another layer, stored as offset arrays.
+
+    The indices of the elements in the i-th bin are ``indices[offsets[i]:offsets[i+1]]``.
+    When every bin is a contiguous range of elements (for example, words in sentences),
+    the bins are sliced directly from the element list.
+    """
+
+    def __init__(self, offsets, indices):
+        self.offsets = offsets
+        self.indices = indices
+        self.contiguous = all(indices[k] + 1 == indices[k + 1]
+                              for a, b in zip(offsets, offsets[1:]) for k in range(a, b - 1))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def bin_indices(self, i):
+        """The indices of the elements in the i-th bin."""
+        return self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+    def range(self, i):
+        """The (start, end) range of the element indices of the i-th bin, when the bins are contiguous."""
+        if not self.contiguous:
+            raise ValueError('The bins are not contiguous ranges of elements.')
+        a, b = self.offsets[i], self.offsets[i + 1]
+        if a < b:
+            return self.indices[a], self.indices[b - 1] + 1
+        # an empty bin is located after the elements of the previous bins
+        end = self.indices[a - 1] + 1 if a > 0 else 0
+        return end, end
+
+    def divide(self, elements):
+        """Group the elements into bins, the bins contain references to the original elements."""
+        offsets, indices = self.offsets, self.indices
+        if self.contiguous:
+            return [elements[indices[a]:indices[a] + b - a] if a < b else [] for a, b in zip(offsets, offsets[1:])]
+        return [[elements[j] for j in indices[a:b]] for a, b in zip(offsets, offsets[1:])]
+
+
+def division_index(elements, by):
+    """Compute the :py:class:`DivisionIndex` of dividing the elements by the elements of ``by``.
+
+    Returns
+    -------
+    DivisionIndex
+        or None, if the elements have multispans, as these are copied and cut to the bins by :py:func:`divide`.
+    """
+    outer_spans = [spans(elem) for elem in by]
+    inner_spans = [spans(elem) for elem in elements]
+    if any(isinstance(span, list) for span in inner_spans):
+        return None
+    offsets, indices = [0], []
+    if len(inner_spans) > 0 and len(outer_spans) > 0:
+        for outer, collection in zip(outer_spans, get_bins(outer_spans, inner_spans)):
+            indices.extend(idx for idx in collection if contains(outer, inner_spans[idx]))
+            offsets.append(len(indices))
+    else:
+        offsets.extend(0 for _ in outer_spans)
+    return DivisionIndex(offsets, indices)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental re-annotation of a :py:class:`~estnltk.text.Text` after its text is edited.
+
+An edit replaces a character range of the text::
+
+    text = Text('Esimene lause.\\n\\nTeine luase.').tag_analysis()
+    text.apply_edits([(22, 27, 'lause')])
+
+Only the paragraphs touched by the edits are tokenized and tagged again: the tokenization layers, the
+morphological analysis, clauses, verb chains, syntax and wordnet annotations depend only on the sentence
+they are in, so the elements of the other paragraphs are kept and their positions are shifted.
+
+The named entity labels and timexes depend on the whole document (the NER features look at the other
+occurrences of the words, the timexes are resolved relative to each other), so these layers are removed and
+reported as stale. They are tagged again, when they are accessed, or with
+``text.tag_layers(text.apply_edits(edits))``.
+
+Other layers are kept, except the elements that overlap an edit; the positions of the elements are shifted.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+from bisect import bisect_left, bisect_right
+
+from .names import *
+
+# layers whose elements are contained in the paragraphs and depend only on their paragraph,
+# the sentence ids of the syntax layers are renumbered after the re-tagged elements are spliced in
+LOCAL_LAYERS = (PARAGRAPHS, SENTENCES, WORDS, CLAUSES, VERB_CHAINS, LAYER_CONLL, LAYER_VISLCG3)
+
+# sentence local annotations that are tagged again in the edited paragraphs, if the text has them
+LOCAL_ANNOTATIONS = (ANALYSIS, CLAUSE_ANNOTATION, CLAUSES, VERB_CHAINS, WORDNET, LAYER_CONLL, LAYER_VISLCG3)
+
+# layers depending on the whole document
+GLOBAL_LAYERS = (TIMEXES, NAMED_ENTITIES)
+
+
+def _check_edits(edits, length):
+    edits = sorted((int(start), int(end), replacement) for start, end, replacement in edits)
+    last_end = 0
+    for start, end, replacement in edits:
+        if start < last_end or start > end or end > length:
+            raise ValueError('Edits must be non-overlapping ranges of the text, got ({0}, {1}).'.format(start, end))
+        last_end = end
+    return edits
+
+
+def _regions(text, edits):
+    """The ranges of the paragraphs touched by the edits, with the edits in them."""
+    if not text.is_tagged(PARAGRAPHS):
+        return [(0, len(text.text), edits)]
+    starts = [p[START] for p in text[PARAGRAPHS]]
+    ends = [p[END] for p in text[PARAGRAPHS]]
+    regions = []
+    for start, end, replacement in edits:
+        i = bisect_right(starts, start) - 1
+        j = bisect_left(ends, end)
+        region_start = starts[i] if i >= 0 else 0
+        region_end = ends[j] if j < len(ends) else len(text.text)
+        if regions and region_start < regions[-1][1]:
+            regions[-1] = (regions[-1][0], max(region_end, regions[-1][1]), regions[-1][2] + [(start, end, replacement)])
+        else:
+            regions.append((region_start, region_end, [(start, end, replacement)]))
+    return regions
+
+
+def _replace(string, edits, offset=0):
+    parts = []
+    last = offset
+    for start, end, replacement in edits:
+        parts.append(string[last - offset:start - offset])
+        parts.append(replacement)
+        last = end
+    parts.append(string[last - offset:])
+    return ''.join(parts)
+
+
+def _delta(edits):
+    return sum(len(replacement) - (end - start) for start, end, replacement in edits)
+
+
+def _first_start(element):
+    start = element[START]
+    return start[0] if isinstance(start, list) else start
+
+
+def _shift(element, delta):
+    element = dict(element)
+    if isinstance(element[START], list):
+        element[START] = [s + delta for s in element[START]]
+        element[END] = [e + delta for e in element[END]]
+    else:
+        element[START] += delta
+        element[END] += delta
+    return element
+
+
+def _is_layer(value):
+    return isinstance(value, list) and all(isinstance(e, dict) and START in e and END in e for e in value)
+
+
+def _local_layer(elements, regions, retagged):
+    """Replace the elements in the regions with the elements of the re-tagged regions.
+
+    The order of the elements is kept, the elements of a region are contiguous in the local layers.
+    """
+    region_starts = [start for start, end, edits in regions]
+    deltas = [0]
+    for start, end, edits in regions:
+        deltas.append(deltas[-1] + _delta(edits))
+    result = []
+    emitted = [0]
+
+    def emit(k):
+        for r in range(emitted[0], k):
+            result.extend(_shift(e, regions[r][0] + deltas[r]) for e in retagged[r])
+        emitted[0] = max(emitted[0], k)
+
+    for element in elements:
+        start = _first_start(element)
+        r = bisect_right(region_starts, start) - 1
+        emit(r + 1)
+        if r < 0 or start >= regions[r][1]:
+            result.append(_shift(element, deltas[r + 1]) if deltas[r + 1] else element)
+    emit(len(regions))
+    return result
+
+
+def _other_layer(elements, edits):
+    """Keep the elements not overlapping the edits with shifted positions."""
+    starts = [start for start, end, replacement in edits]
+    ends = [end for start, end, replacement in edits]
+    deltas = [0]
+    for edit in edits:
+        deltas.append(deltas[-1] + _delta([edit]))
+    result = []
+    for element in elements:
+        spans = list(zip(element[START], element[END])) if isinstance(element[START], list) else \
+            [(element[START], element[END])]
+        # the edits ending before the span start and starting after the span end
+        before = [bisect_right(ends, s) for s, e in spans]
+        after = [bisect_left(starts, e) for s, e in spans]
+        if any(b != a for b, a in zip(before, after)):
+            continue
+        element = dict(element)
+        if isinstance(element[START], list):
+            element[START] = [s + deltas[b] for (s, e), b in zip(spans, before)]
+            element[END] = [e + deltas[b] for (s, e), b in zip(spans, before)]
+        else:
+            element[START] += deltas[before[0]]
+            element[END] += deltas[before[0]]
+        result.append(element)
+    return result
+
+
+def _renumber_sentences(elements, sentence_starts):
+    """Set the ``sent_id`` of the syntax layer elements to the index of their sentence in the whole text.
+
+    The elements of the re-tagged paragraphs are numbered from 0 in every paragraph.
+    """
+    result = []
+    for element in elements:
+        if SENT_ID in element:
+            element = dict(element)
+            element[SENT_ID] = bisect_right(sentence_starts, _first_start(element)) - 1
+        result.append(element)
+    return result
+
+
+def apply_edits(text, edits):
+    """Replace character ranges of the text and re-annotate the changed paragraphs.
+
+    Parameters
+    ----------
+    text: estnltk.text.Text
+        The text to edit.
+    edits: list of (int, int, str)
+        Non-overlapping (start, end, replacement) triples, the positions are in the original text.
+
+    Returns
+    -------
+    list of str
+        The document level layers that were removed and must be tagged again.
+    """
+    edits = _check_edits(edits, len(text.text))
+    if not edits:
+        return []
+    regions = _regions(text, edits)
+    local = [layer for layer in LOCAL_ANNOTATIONS if text.is_tagged(layer)]
+    tokenization = [layer for layer in (PARAGRAPHS, SENTENCES, WORDS) if layer in text]
+    stale = [layer for layer in (LABEL,) + GLOBAL_LAYERS if text.is_tagged(layer)]
+
+    # tag the edited regions as separate texts
+    retagged = []
+    old = text.text
+    for start, end, region_edits in regions:
+        sub = text.__class__(_replace(old[start:end], region_edits, start), **text.get_kwargs())
+        sub.tag_layers(tokenization + local)
+        retagged.append(sub)
+
+    for layer in list(text.keys()):
+        if layer == TEXT or not _is_layer(text[layer]):
+            continue
+        if layer in GLOBAL_LAYERS:
+            del text[layer]
+        elif layer in LOCAL_LAYERS:
+            sub_layers = [sub[layer] if layer in sub else [] for sub in retagged]
+            text[layer] = _local_layer(text[layer], regions, sub_layers)
+        else:
+            text[layer] = _other_layer(text[layer], edits)
+    if SENTENCES in text:
+        sentence_starts = [sentence[START] for sentence in text[SENTENCES]]
+        for layer in (LAYER_CONLL, LAYER_VISLCG3):
+            if layer in text:
+                text[layer] = _renumber_sentences(text[layer], sentence_starts)
+    if LABEL in stale:
+        for word in text[WORDS]:
+            word.pop(LABEL, None)
+        text.touch_layer(LABEL)
+    text[TEXT] = _replace(old, edits)
+    return stale
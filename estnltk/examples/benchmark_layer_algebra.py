@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+#    Compares the running times of estnltk.layer_algebra joins against
+#    straightforward dict-based Python loops on random layers.
+#
+#    Usage:
+#       python -m estnltk.examples.benchmark_layer_algebra [--size 5000]
+#
+from __future__ import unicode_literals, print_function
+
+import random
+import argparse
+
+from timeit import default_timer as timer
+
+from estnltk.names import START, END
+from estnltk.layer_algebra import contains_join, overlaps_join, nearest
+
+
+def random_layer(size, max_length):
+    layer = []
+    for _ in range(size):
+        start = random.randint(0, size * 10)
+        layer.append({START: start, END: start + random.randint(1, max_length)})
+    return layer
+
+
+def loop_contains_join(outer, inner):
+    return [(o, i) for o in outer for i in inner if o[START] <= i[START] and i[END] <= o[END]]
+
+
+def loop_overlaps_join(layer, other):
+    return [(a, b) for a in layer for b in other if max(a[START], b[START]) < min(a[END], b[END])]
+
+
+def loop_nearest(layer, other):
+    result = []
+    for a in layer:
+        b = min(other, key=lambda b: max(0, b[START] - a[END], a[START] - b[END]))
+        result.append((a, b, max(0, b[START] - a[END], a[START] - b[END])))
+    return result
+
+
+def measure(name, func, *args):
+    start = timer()
+    result = func(*args)
+    print('{:<25} {:10.3f} s'.format(name, timer() - start))
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark layer algebra against dict-based loops.')
+    parser.add_argument('--size', type=int, default=2000, help='number of elements in each layer')
+    args = parser.parse_args()
+
+    random.seed(0)
+    outer = random_layer(args.size, 100)
+    inner = random_layer(args.size, 10)
+
+    measure('loop contains join', loop_contains_join, outer, inner)
+    measure('layer_algebra contains', contains_join, outer, inner)
+    measure('loop overlaps join', loop_overlaps_join, outer, inner)
+    measure('layer_algebra overlaps', overlaps_join, outer, inner)
+    measure('loop nearest', loop_nearest, inner, outer)
+    measure('layer_algebra nearest', nearest, inner, outer)
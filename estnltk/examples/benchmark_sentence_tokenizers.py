@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+#    Compares the throughput of the sentence tokenizer backends
+#    (see estnltk.tokenizers.sentence_tokenizers) on the paragraphs of the
+#    arvutustehnika_ja_andmetootlus corpus bundled with estnltk.
+#
+#    Usage:
+#       python -m estnltk.examples.benchmark_sentence_tokenizers [--corpus dir] [--repeat 3]
+#
+from __future__ import unicode_literals, print_function
+
+import argparse
+
+from timeit import default_timer as timer
+
+from estnltk.core import AA_PATH
+from estnltk.names import TEXT
+from estnltk.teicorpus import parse_tei_corpora
+from estnltk.text import paragraph_tokenizer
+from estnltk.tokenizers.sentence_tokenizers import SENTENCE_TOKENIZERS, get_sentence_tokenizer
+
+
+def load_paragraphs(root):
+    paragraphs = []
+    for doc in parse_tei_corpora(root, suffix='.tasak.xml', target=['artikkel']):
+        text = doc[TEXT]
+        paragraphs.extend(text[start:end] for start, end in paragraph_tokenizer.span_tokenize(text))
+    return paragraphs
+
+
+def measure(name, paragraphs, repeat):
+    tokenizer = get_sentence_tokenizer(name)
+    # the first run loads the models
+    start = timer()
+    count = sum(len(list(tokenizer.span_tokenize(para))) for para in paragraphs)
+    first = timer() - start
+    best = first
+    for _ in range(repeat - 1):
+        start = timer()
+        for para in paragraphs:
+            list(tokenizer.span_tokenize(para))
+        best = min(best, timer() - start)
+    chars = sum(len(para) for para in paragraphs)
+    print('{:<10} {:10.3f} s {:10.3f} s {:14,.0f} chars/s {:10} sentences'.format(
+        name, first, best, chars / best, count))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the sentence tokenizer backends.')
+    parser.add_argument('--corpus', default=AA_PATH, help='directory with the *.tasak.xml files')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    paragraphs = load_paragraphs(args.corpus)
+    print('{0} paragraphs, {1} characters'.format(len(paragraphs), sum(len(para) for para in paragraphs)))
+    print('{:<10} {:>12} {:>12} {:>20} {:>20}'.format('backend', 'first run', 'best run', 'speed', 'count'))
+    for name in sorted(SENTENCE_TOKENIZERS):
+        measure(name, paragraphs, args.repeat)
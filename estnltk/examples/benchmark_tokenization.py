@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+#    Compares the speed of creating the paragraphs, sentences and words layers
+#    level by level (tokenizing every sentence separately, as estnltk did before)
+#    with estnltk.tokenizers.fused_tokenizer.tokenize_layers.
+#
+#    Usage:
+#       python -m estnltk.examples.benchmark_tokenization [--file corpus.txt] [--repeat 3]
+#
+from __future__ import unicode_literals, print_function
+
+import io
+import argparse
+
+from timeit import default_timer as timer
+
+from estnltk.names import START, END, TEXT
+from estnltk.text import paragraph_tokenizer, sentence_tokenizer
+from estnltk.tokenizers import EstWordTokenizer
+from estnltk.tokenizers.word_tokenizer import wptokenizer, apply_rules, tri_rules, bi_rules
+from estnltk.tokenizers.fused_tokenizer import tokenize_layers
+
+SAMPLE = ('Eile, 25.-26. mail käis E. Talvik v.a dekaan Tartus, kus ta rääkis 3,14 km pikkusest teest. '
+          'D-vitamiini võeti 1.-3. jaanuaril rohkem kui tavaliselt! Kas see on hea?\n\n')
+
+
+def layered(text):
+    paragraphs, sentences, words = [], [], []
+    for para_start, para_end in paragraph_tokenizer.span_tokenize(text):
+        paragraphs.append({START: para_start, END: para_end})
+        para_text = text[para_start:para_end]
+        for start, end in sentence_tokenizer.span_tokenize(para_text):
+            sentences.append({START: start + para_start, END: end + para_start})
+    for sentence in sentences:
+        sent_start, sent_text = sentence[START], text[sentence[START]:sentence[END]]
+        spans = list(wptokenizer.span_tokenize(sent_text))
+        tokens = [sent_text[s:e] for s, e in spans]
+        tokens, spans = apply_rules(tokens, spans, 3, tri_rules)
+        tokens, spans = apply_rules(tokens, spans, 2, bi_rules)
+        for start, end in spans:
+            words.append({START: start + sent_start, END: end + sent_start, TEXT: sent_text[start:end]})
+    return paragraphs, sentences, words
+
+
+def fused(text):
+    return tokenize_layers(text, paragraph_tokenizer, sentence_tokenizer, EstWordTokenizer())
+
+
+def measure(name, func, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = timer()
+        result = func(text)
+        elapsed = timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print('{:<10} {:10.3f} s {:14,.0f} chars/s'.format(name, best, len(text) / best))
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark level by level and fused tokenization.')
+    parser.add_argument('--file', help='UTF-8 text file to tokenize (default: a generated sample)')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    if args.file:
+        with io.open(args.file, encoding='utf-8') as f:
+            text = f.read()
+    else:
+        text = SAMPLE * 2000
+
+    before = measure('layered', layered, text, args.repeat)
+    after = measure('fused', fused, text, args.repeat)
+    assert before == after, 'the tokenizations differ'
@@ -96,9 +96,9 @@ Outputs the article about Eston Kohver.
 from __future__ import unicode_literals, print_function, absolute_import
 
 import MySQLdb
-import MySQLdb.cursors
 import argparse
-from estnltk.text import Text
+import logging
+from estnltk.database.sql import lemmatize_table
 
 
 def get_mysql_conn(args):
@@ -114,32 +114,15 @@ def get_mysql_conn(args):
     return MySQLdb.connect(**kwargs)
 
 
-def lemmatize(text):
-    return ' '.join(Text(text).lemmas).lower()
-
-READ_SQL = 'select `{pkey}`, `{src_field}` from `{schema}`.`{table}` where `{dest_field}` is null;'
-UPDATE_SQL = 'update `{schema}`.`{table}` set `{dest_field}`=%s where `{pkey}`=%s'
-
-
 def process(args):
-    read_conn = get_mysql_conn(args)
-    write_conn = get_mysql_conn(args)
-
-    read_sql = READ_SQL.format(**vars(args))
-    update_sql = UPDATE_SQL.format(**vars(args))
-
-    read_cur = MySQLdb.cursors.SSCursor(read_conn)
-    read_cur.execute(read_sql)
-    for row in read_cur:
-        pkey, text = row
-        lemmatized = lemmatize(text)
-        write_cur = write_conn.cursor()
-        write_cur.execute(update_sql, (lemmatized, pkey))
-        write_conn.commit()
+    conn = get_mysql_conn(args)
+    lemmatize_table(conn, args.table, args.src_field, args.dest_field, pkey=args.pkey, processes=args.processes,
+                    read_size=args.read_size, write_size=args.write_size, commit_every=args.commit_every,
+                    quote='`')
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='Process some integers.')
+    parser = argparse.ArgumentParser(description='Lemmatize a field in a MySQL table.')
     parser.add_argument('--host', type=str, default='127.0.0.1', help='MySQL server host')
     parser.add_argument('--port', type=int, default=3306, help='MySQL server port')
     parser.add_argument('user', type=str, help='MySQL server user')
@@ -149,6 +132,11 @@ if __name__ == '__main__':
     parser.add_argument('--pkey', type=str, default='id', help='The primary key of the table')
     parser.add_argument('src_field', type=str, help='The field we wish to lemmatize')
     parser.add_argument('dest_field', type=str, help='The field to store the lemmatized str')
+    parser.add_argument('--processes', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--read-size', type=int, default=10000, help='Number of rows read at once')
+    parser.add_argument('--write-size', type=int, default=1000, help='Number of rows updated at once')
+    parser.add_argument('--commit-every', type=int, default=10000, help='Number of rows in a transaction')
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
     process(args)
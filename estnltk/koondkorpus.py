@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""Conversion of the koondkorpus TEI XML files to compressed JSON corpus shards.
+
+The conversion is run with the ``estnltk-koondkorpus`` command (see ``estnltk-koondkorpus --help``)
+or with :py:func:`convert`. The files are parsed by a pool of worker processes, the documents of every
+file are written as one gzip member of JSON lines (one document per line, like in :py:mod:`estnltk.corpus`)
+to one of the shards. Documents having more than the allowed number of sentences are split into smaller
+documents.
+
+Finished files are recorded in the manifest file of the output directory. A line is appended to the
+manifest only after the documents of the file have been flushed to disk, so an interrupted conversion
+can be restarted with the same command: the data written after the last manifest line is truncated and the
+finished files are skipped.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import time
+from multiprocessing import Pool
+
+from .names import TEXT, SENTENCES, PARAGRAPHS, START, END
+from .teicorpus import iterate_tei_documents
+from .corpus_store import write_corpus_store
+from .text import Text
+
+logger = logging.getLogger('koondkorpus')
+
+MANIFEST_FILE = 'manifest.jsonl'
+MAX_SENTENCES = 2500
+
+
+def get_target(fnm):
+    """The type of the <div> elements containing the documents in the given koondkorpus file."""
+    if 'drtood' in fnm:
+        return 'dissertatsioon'
+    if 'ilukirjandus' in fnm:
+        return 'tervikteos'
+    if 'seadused' in fnm:
+        return 'seadus'
+    if 'EestiArst' in fnm:
+        return 'ajakirjanumber'
+    if 'foorumid' in fnm:
+        return 'teema'
+    if 'kommentaarid' in fnm:
+        return 'kommentaarid'
+    if 'uudisgrupid' in fnm:
+        return 'uudisgrupi_salvestus'
+    if 'jututoad' in fnm:
+        return 'jututoavestlus'
+    if 'stenogrammid' in fnm:
+        return 'stenogramm'
+    return 'artikkel'
+
+
+def find_files(start_dir):
+    """The paths of the corpus files relative to the start directory, in sorted order.
+
+    Like in the corpus distribution, the files are taken from the directories without subdirectories,
+    except the ``bin`` directories.
+    """
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(start_dir):
+        if len(dirnames) > 0 or len(filenames) == 0 or 'bin' in dirpath:
+            continue
+        for fnm in filenames:
+            paths.append(os.path.relpath(os.path.join(dirpath, fnm), start_dir))
+    return sorted(paths)
+
+
+def split_document(doc, file_name, max_sentences=MAX_SENTENCES):
+    """Split a document having more than ``max_sentences`` sentences into smaller documents.
+
+    The smaller documents get the attributes of the original document, except the text and its layers,
+    and the attributes ``_text_split_id``, ``_text_split_origin`` (the span of the part in the original
+    text) and ``_text_split_file``.
+
+    Returns
+    -------
+    list of dict
+        The original document, if it is not split.
+    """
+    text = Text(doc).tokenize_sentences()
+    sentences = text[SENTENCES]
+    if len(sentences) <= max_sentences:
+        return [doc]
+    parts = []
+    for i, first in enumerate(range(0, len(sentences), max_sentences)):
+        span = (sentences[first][START], sentences[min(first + max_sentences, len(sentences)) - 1][END])
+        part = dict((key, value) for key, value in doc.items() if key not in (TEXT, SENTENCES, PARAGRAPHS))
+        part[TEXT] = text.text[span[0]:span[1]]
+        part['_text_split_id'] = i
+        part['_text_split_origin'] = str(span)
+        part['_text_split_file'] = file_name
+        parts.append(part)
+    return parts
+
+
+def convert_file(start_dir, file_name, encoding=None, max_sentences=MAX_SENTENCES):
+    """Convert a corpus file to a gzip member of JSON lines.
+
+    Returns
+    -------
+    (bytes, int, int)
+        The compressed documents, the number of documents and the number of split documents.
+    """
+    buffer = io.BytesIO()
+    documents = split = 0
+    with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as f:
+        target = [get_target(os.path.join(start_dir, file_name))]
+        for doc in iterate_tei_documents(os.path.join(start_dir, file_name), target, encoding):
+            doc['file'] = file_name
+            parts = split_document(doc, file_name, max_sentences) if max_sentences else [doc]
+            split += len(parts) > 1
+            for part in parts:
+                f.write((json.dumps(part) + '\n').encode('ascii'))
+                documents += 1
+    return buffer.getvalue(), documents, split
+
+
+def _convert_job(job):
+    start_dir, file_name, encoding, max_sentences = job
+    return (file_name,) + convert_file(start_dir, file_name, encoding, max_sentences)
+
+
+def shard_name(shard):
+    return 'shard-%05d.jsonl.gz' % shard
+
+
+def read_manifest(out_dir):
+    """The entries of the manifest of a conversion, an incomplete last line is ignored.
+
+    Returns
+    -------
+    list of dict
+        The finished files with their shard, offset and length in the shard and numbers of documents.
+    """
+    return _read_manifest(out_dir)[0]
+
+
+def _read_manifest(out_dir):
+    entries, size = [], 0
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return entries, size
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            entries.append(json.loads(line.decode('ascii')))
+            size += len(line)
+    return entries, size
+
+
+def iterate_documents(out_dir):
+    """Yield the documents of the finished files of a conversion as :py:class:`~estnltk.text.Text` instances."""
+    for entry in read_manifest(out_dir):
+        with open(os.path.join(out_dir, shard_name(entry['shard'])), 'rb') as f:
+            f.seek(entry['offset'])
+            data = f.read(entry['length'])
+        with gzip.GzipFile(fileobj=io.BytesIO(data), mode='rb') as f:
+            for line in f.read().decode('ascii').splitlines():
+                yield Text(json.loads(line))
+
+
+def export_store(out_dir, store_path):
+    """Append the documents of the finished files of a conversion to a corpus store.
+
+    The store gives random and sharded access to the documents, see :py:mod:`estnltk.corpus_store`.
+
+    Returns
+    -------
+    int
+        The number of documents in the store.
+    """
+    return write_corpus_store(iterate_documents(out_dir), store_path)
+
+
+def _sync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def convert(start_dir, out_dir, encoding=None, processes=None, shards=16, max_sentences=MAX_SENTENCES):
+    """Convert the koondkorpus files in the start directory to JSON corpus shards in the output directory.
+
+    Parameters
+    ----------
+    start_dir: str
+        The path of the downloaded and extracted koondkorpus files.
+    out_dir: str
+        The directory of the shards and the manifest.
+    encoding: str
+        Encoding of the TEI XML files (default: the encoding of the XML declarations).
+    processes: int
+        Number of worker processes (default: the number of CPUs).
+    shards: int
+        Number of shards (default: 16). Must stay the same, when the conversion is restarted.
+    max_sentences: int
+        Documents with more sentences are split (default: 2500). 0 disables the splitting.
+
+    Returns
+    -------
+    dict
+        Statistics of this run: the numbers of converted files, skipped (previously finished) files,
+        written documents, split documents and elapsed seconds.
+    """
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    entries, manifest_size = _read_manifest(out_dir)
+    if any(entry['shard'] >= shards for entry in entries):
+        raise ValueError('The output directory has more than {} shards.'.format(shards))
+    finished = set(entry['file'] for entry in entries)
+
+    # drop the data written after the last manifest entry of every shard
+    sizes = [0] * shards
+    for entry in entries:
+        sizes[entry['shard']] = max(sizes[entry['shard']], entry['offset'] + entry['length'])
+    files = []
+    for shard, size in enumerate(sizes):
+        path = os.path.join(out_dir, shard_name(shard))
+        f = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        f.truncate(size)
+        f.seek(size)
+        files.append(f)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(manifest_path, 'ab') as manifest:
+        manifest.truncate(manifest_size)
+
+    pending = [fnm for fnm in find_files(start_dir) if fnm not in finished]
+    stats = {'files': 0, 'skipped': len(finished), 'documents': 0, 'split': 0, 'seconds': 0.0}
+    logger.info('Converting {0} files, {1} files are already converted'.format(len(pending), len(finished)))
+    start = time.time()
+    pool = Pool(processes)
+    try:
+        with open(manifest_path, 'ab') as manifest:
+            jobs = [(start_dir, fnm, encoding, max_sentences) for fnm in pending]
+            for file_name, data, documents, split in pool.imap_unordered(_convert_job, jobs):
+                shard = min(range(shards), key=lambda i: files[i].tell())
+                f = files[shard]
+                entry = {'file': file_name, 'shard': shard, 'offset': f.tell(), 'length': len(data),
+                         'documents': documents, 'split': split}
+                f.write(data)
+                _sync(f)
+                manifest.write((json.dumps(entry) + '\n').encode('ascii'))
+                _sync(manifest)
+                stats['files'] += 1
+                stats['documents'] += documents
+                stats['split'] += split
+                stats['seconds'] = time.time() - start
+                logger.info('Converted {0} ({1} documents, {2} split), {3}/{4} files in {5:.1f} seconds'.format(
+                    file_name, documents, split, stats['files'], len(pending), stats['seconds']))
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        for f in files:
+            f.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert koondkorpus TEI XML files to compressed JSON corpus '
+                                                 'shards. An interrupted conversion is resumed by running '
+                                                 'the same command again.')
+    parser.add_argument('startdir', type=str, help='The path of the downloaded and extracted koondkorpus files')
+    parser.add_argument('outdir', type=str, help='The directory to store output results')
+    parser.add_argument('-e', '--encoding', type=str, default=None, help='Encoding of the TEI XML files')
+    parser.add_argument('-p', '--processes', type=int, default=None,
+                        help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('-s', '--shards', type=int, default=16, help='Number of output shards (default: 16)')
+    parser.add_argument('-l', '--limit', type=int, default=MAX_SENTENCES,
+                        help='Documents with more sentences are split, 0 disables splitting '
+                             '(default: {0})'.format(MAX_SENTENCES))
+    parser.add_argument('--store', type=str, default=None,
+                        help='Export the converted documents to a corpus store in this directory')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    stats = convert(args.startdir, args.outdir, args.encoding, args.processes, args.shards, args.limit)
+    logger.info('Converted {files} files ({skipped} skipped), {documents} documents ({split} split) '
+                'in {seconds:.1f} seconds'.format(**stats))
+    if args.store:
+        logger.info('Exported {0} documents to {1}'.format(export_store(args.outdir, args.store), args.store))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Module containing set operations and joins over layers with simple (start, end) spans.
+
+All operations sort the start and end positions of the layers into NumPy arrays and
+use binary search on them, so their cost is O((n + m) log(n + m) + k), where k is the
+size of the result. This is much faster than comparing all element pairs in Python
+loops, when the layers are large.
+
+Example: find the named entities that are inside sentences containing a timex::
+
+    sentences = containing(text.sentences, text.timexes)
+    entities = contained_in(text.named_entities, sentences)
+
+Elements with multispans (lists of starts and ends) are not supported.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import numpy as np
+
+from .names import START, END
+
+
+def span_arrays(layer):
+    """Return the start and end positions of layer elements as NumPy arrays."""
+    starts = np.fromiter((elem[START] for elem in layer), dtype=np.int64, count=len(layer))
+    ends = np.fromiter((elem[END] for elem in layer), dtype=np.int64, count=len(layer))
+    return starts, ends
+
+
+def _check_simple(layer):
+    for elem in layer:
+        if isinstance(elem[START], list):
+            raise ValueError('Layer algebra is not defined for multispan elements.')
+    return layer
+
+
+def _to_layer(starts, ends):
+    return [{START: int(s), END: int(e)} for s, e in zip(starts, ends)]
+
+
+def _expand_ranges(lo, hi):
+    """For every i, enumerate the indices lo[i] <= j < hi[i].
+
+    Returns the array of i-s and the array of j-s.
+    """
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    rows = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, np.repeat(lo, counts) + offsets
+
+
+def _coverage(starts, ends):
+    """Merge the spans into sorted disjoint spans covering the same positions."""
+    keep = starts < ends
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return starts, ends
+    order = np.argsort(starts, kind='mergesort')
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    new_group = np.empty(len(starts), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > reach[:-1]
+    group_starts = np.flatnonzero(new_group)
+    group_ends = np.append(group_starts[1:], len(starts)) - 1
+    return starts[group_starts], reach[group_ends]
+
+
+def _overlapping_pairs(a_starts, a_ends, b_starts, b_ends):
+    """Index pairs (i, j) such that a[i] and b[j] share at least one position."""
+    b_order = np.argsort(b_starts, kind='mergesort')
+    a_order = np.argsort(a_starts, kind='mergesort')
+    b_sorted = b_starts[b_order]
+    a_sorted = a_starts[a_order]
+    # b starts inside a
+    lo = np.searchsorted(b_sorted, a_starts, 'left')
+    hi = np.searchsorted(b_sorted, a_ends, 'left')
+    rows1, cols1 = _expand_ranges(lo, hi)
+    cols1 = b_order[cols1]
+    # a starts strictly inside b
+    lo = np.searchsorted(a_sorted, b_starts, 'right')
+    hi = np.searchsorted(a_sorted, b_ends, 'left')
+    cols2, rows2 = _expand_ranges(lo, hi)
+    rows2 = a_order[rows2]
+    rows = np.concatenate([rows1, rows2])
+    cols = np.concatenate([cols1, cols2])
+    keep = np.maximum(a_starts[rows], b_starts[cols]) < np.minimum(a_ends[rows], b_ends[cols])
+    rows, cols = rows[keep], cols[keep]
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order]
+
+
+def _containing_pairs(outer_starts, outer_ends, inner_starts, inner_ends):
+    """Index pairs (i, j) such that outer[i] contains inner[j]."""
+    order = np.argsort(inner_starts, kind='mergesort')
+    sorted_starts = inner_starts[order]
+    lo = np.searchsorted(sorted_starts, outer_starts, 'left')
+    hi = np.searchsorted(sorted_starts, outer_ends, 'right')
+    rows, cols = _expand_ranges(lo, hi)
+    cols = order[cols]
+    keep = inner_ends[cols] <= outer_ends[rows]
+    rows, cols = rows[keep], cols[keep]
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order]
+
+
+def union(layer, other):
+    """Spans covered by either of the layers.
+
+    Returns
+    -------
+    list of dict
+        Sorted, non-touching elements with ``start`` and ``end`` attributes.
+    """
+    starts, ends = span_arrays(_check_simple(layer))
+    other_starts, other_ends = span_arrays(_check_simple(other))
+    starts, ends = _coverage(np.concatenate([starts, other_starts]), np.concatenate([ends, other_ends]))
+    return _to_layer(starts, ends)
+
+
+def _intersect_coverages(starts, ends, other_starts, other_ends):
+    rows, cols = _overlapping_pairs(starts, ends, other_starts, other_ends)
+    return np.maximum(starts[rows], other_starts[cols]), np.minimum(ends[rows], other_ends[cols])
+
+
+def intersection(layer, other):
+    """Spans covered by both of the layers.
+
+    Returns
+    -------
+    list of dict
+        Sorted elements with ``start`` and ``end`` attributes.
+    """
+    starts, ends = _coverage(*span_arrays(_check_simple(layer)))
+    other_starts, other_ends = _coverage(*span_arrays(_check_simple(other)))
+    return _to_layer(*_intersect_coverages(starts, ends, other_starts, other_ends))
+
+
+def difference(layer, other):
+    """Spans covered by the first layer, but not by the other one.
+
+    Returns
+    -------
+    list of dict
+        Sorted elements with ``start`` and ``end`` attributes.
+    """
+    starts, ends = _coverage(*span_arrays(_check_simple(layer)))
+    other_starts, other_ends = _coverage(*span_arrays(_check_simple(other)))
+    if len(starts) == 0 or len(other_starts) == 0:
+        return _to_layer(starts, ends)
+    # the gaps of the other layer within the first one
+    gap_starts = np.concatenate([[starts[0]], other_ends])
+    gap_ends = np.concatenate([other_starts, [ends[-1]]])
+    keep = gap_starts < gap_ends
+    return _to_layer(*_intersect_coverages(starts, ends, gap_starts[keep], gap_ends[keep]))
+
+
+def contains_join(outer, inner):
+    """Pairs of elements, where the ``outer`` element contains the ``inner`` element.
+
+    Returns
+    -------
+    list of (dict, dict)
+        Pairs of elements ordered by the positions of the elements in the input layers.
+    """
+    rows, cols = _containing_pairs(*(span_arrays(_check_simple(outer)) + span_arrays(_check_simple(inner))))
+    return [(outer[i], inner[j]) for i, j in zip(rows.tolist(), cols.tolist())]
+
+
+def overlaps_join(layer, other):
+    """Pairs of elements that share at least one position.
+
+    Returns
+    -------
+    list of (dict, dict)
+        Pairs of elements ordered by the positions of the elements in the input layers.
+    """
+    rows, cols = _overlapping_pairs(*(span_arrays(_check_simple(layer)) + span_arrays(_check_simple(other))))
+    return [(layer[i], other[j]) for i, j in zip(rows.tolist(), cols.tolist())]
+
+
+def containing(outer, inner):
+    """Elements of ``outer`` layer that contain at least one element of ``inner`` layer."""
+    rows, _ = _containing_pairs(*(span_arrays(_check_simple(outer)) + span_arrays(_check_simple(inner))))
+    return [outer[i] for i in np.unique(rows).tolist()]
+
+
+def contained_in(inner, outer):
+    """Elements of ``inner`` layer that are contained in at least one element of ``outer`` layer."""
+    _, cols = _containing_pairs(*(span_arrays(_check_simple(outer)) + span_arrays(_check_simple(inner))))
+    return [inner[j] for j in np.unique(cols).tolist()]
+
+
+def overlapping(layer, other):
+    """Elements of ``layer`` that share at least one position with an element of ``other``."""
+    rows, _ = _overlapping_pairs(*(span_arrays(_check_simple(layer)) + span_arrays(_check_simple(other))))
+    return [layer[i] for i in np.unique(rows).tolist()]
+
+
+def nearest(layer, other):
+    """Find the nearest element of ``other`` layer for every element of ``layer``.
+
+    The distance between two elements is the number of positions between them,
+    overlapping elements have distance 0. Ties are broken in favour of the element
+    on the left.
+
+    Returns
+    -------
+    list of (dict, dict, int)
+        Triples of an element, its nearest element and the distance. If ``other`` is empty,
+        the nearest element and distance are None.
+    """
+    starts, ends = span_arrays(_check_simple(layer))
+    other_starts, other_ends = span_arrays(_check_simple(other))
+    if len(other) == 0:
+        return [(elem, None, None) for elem in layer]
+    n = len(other_starts)
+
+    # overlapping: among the elements starting before the end, the one reaching furthest
+    by_start = np.argsort(other_starts, kind='mergesort')
+    sorted_starts = other_starts[by_start]
+    reach = np.maximum.accumulate(other_ends[by_start])
+    reach_pos = np.arange(n)
+    reach_pos[other_ends[by_start] < reach] = 0
+    reach_pos = np.maximum.accumulate(reach_pos)
+    k = np.searchsorted(sorted_starts, ends, 'left')
+    prev = np.maximum(k - 1, 0)
+    overlaps = (k > 0) & (reach[prev] > starts)
+
+    # on the right: the first element starting at or after the end
+    right_dist = np.where(k < n, sorted_starts[np.minimum(k, n - 1)] - ends, np.iinfo(np.int64).max)
+    right = by_start[np.minimum(k, n - 1)]
+
+    # on the left: the element with the last end at or before the start
+    by_end = np.argsort(other_ends, kind='mergesort')
+    sorted_ends = other_ends[by_end]
+    j = np.searchsorted(sorted_ends, starts, 'right') - 1
+    left_dist = np.where(j >= 0, starts - sorted_ends[np.maximum(j, 0)], np.iinfo(np.int64).max)
+    left = by_end[np.maximum(j, 0)]
+
+    result = []
+    for i, elem in enumerate(layer):
+        if overlaps[i]:
+            result.append((elem, other[by_start[reach_pos[prev[i]]]], 0))
+        elif left_dist[i] <= right_dist[i]:
+            result.append((elem, other[left[i]], int(left_dist[i])))
+        else:
+            result.append((elem, other[right[i]], int(right_dist[i])))
+    return result
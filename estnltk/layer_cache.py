@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed on-disk cache of computed layers.
+
+The cache is enabled by passing a :py:class:`LayerCache` instance to :py:class:`~estnltk.text.Text`::
+
+    cache = LayerCache('/tmp/layers.db')
+    text = Text('Eile käisin koolis.', layer_cache=cache, creation_date=datetime.datetime(2016, 5, 10))
+    text.tag_timexes()
+    print(cache.report())
+
+The morphological analysis, named entity labels, timexes, clause annotations and verb chains are looked up
+from the cache before they are computed. The key of a layer is the SHA-1 hash of the text, the spans of the
+``words`` layer, the name of the layer, the name and version of the tagger and the keyword arguments the
+tagger depends on. The layers the tagger depends on (for example, the morphological analysis of timex tagging)
+are assumed to be computed with the same taggers and arguments, so they are not part of the key.
+
+The computed layers are stored as compressed JSON in a SQLite database. When the total size of the stored
+layers exceeds the limit, the least recently used layers are removed.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import datetime
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+from .__about__ import __version__
+from .names import *
+from .layer_registry import LAYERS
+
+# the keyword arguments of vabamorf.analyze
+ANALYSIS_KWARGS = ('disambiguate', 'guess', 'propername', 'compound', 'phonetic')
+
+
+def _timex_kwargs(kwargs):
+    creation_date = kwargs.get('creation_date', datetime.datetime.now())
+    return {'creation_date': creation_date.strftime('%Y-%m-%dT%H:%M'),
+            'remove_unnormalized_timexes': kwargs.get('remove_unnormalized_timexes', True)}
+
+
+# layer -> (keyword argument of the tagger in Text, default tagger name, relevant kwargs)
+CACHED_LAYERS = {
+    ANALYSIS: (None, 'vabamorf', lambda kwargs: {}),
+    LABEL: ('ner_tagger', 'NerTagger', lambda kwargs: {}),
+    TIMEXES: ('timex_tagger', 'TimexTagger', _timex_kwargs),
+    CLAUSE_ANNOTATION: ('clause_segmenter', 'ClauseSegmenter', lambda kwargs: {}),
+    VERB_CHAINS: ('verbchain_detector', 'VerbChainDetector', lambda kwargs: {}),
+}
+
+
+def text_digest(text):
+    """The SHA-1 hex digest of the UTF-8 encoded text."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def layer_key(text, layer):
+    """The cache key of a layer of the :py:class:`~estnltk.text.Text` instance."""
+    kwarg, name, relevant = CACHED_LAYERS[layer]
+    kwargs = text.get_kwargs()
+    tagger = kwargs.get(kwarg) if kwarg is not None else None
+    if tagger is not None:
+        name = '{0}.{1}'.format(type(tagger).__module__, type(tagger).__name__)
+    version = getattr(tagger, 'version', __version__)
+    options = dict((key, kwargs[key]) for key in ANALYSIS_KWARGS if key in kwargs)
+    options.update(relevant(kwargs))
+    spans = [(word[START], word[END]) for word in text[WORDS]]
+    data = json.dumps([text_digest(text.text), spans, layer, name, version, options], sort_keys=True)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class LayerCache(object):
+    """SQLite database of computed layers with least recently used eviction.
+
+    Parameters
+    ----------
+    path: str
+        The path of the database file, ':memory:' for an in-memory cache.
+    max_size: int
+        The maximum total size of the compressed layers in bytes (default: 1 GB).
+    """
+
+    def __init__(self, path, max_size=1024**3):
+        self.path = path
+        self.max_size = max_size
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        # the access times are updated on every hit, do not wait for the disk on every commit
+        self.__conn.execute('pragma journal_mode=wal')
+        self.__conn.execute('pragma synchronous=normal')
+        self.__conn.execute('create table if not exists layers (key text primary key, layer text, value blob, '
+                            'size integer, seconds real, accessed real)')
+        self.__conn.execute('create index if not exists layers_accessed on layers (accessed)')
+        self.__conn.commit()
+        self.__size = self.__conn.execute('select coalesce(sum(size), 0) from layers').fetchone()[0]
+        self.__stats = defaultdict(lambda: {'hits': 0, 'misses': 0, 'saved_seconds': 0.0})
+
+    @property
+    def size(self):
+        """The total size of the stored layers in bytes."""
+        return self.__size
+
+    def __len__(self):
+        with self.__lock:
+            return self.__conn.execute('select count(*) from layers').fetchone()[0]
+
+    def get(self, key, layer):
+        """The stored value of the layer or None, if it is not in the cache."""
+        start = time.time()
+        with self.__lock:
+            row = self.__conn.execute('select value, seconds from layers where key=?', (key,)).fetchone()
+            if row is None:
+                self.__stats[layer]['misses'] += 1
+                return None
+            self.__conn.execute('update layers set accessed=? where key=?', (time.time(), key))
+            self.__conn.commit()
+        value = json.loads(zlib.decompress(row[0]).decode('utf-8'))
+        with self.__lock:
+            self.__stats[layer]['hits'] += 1
+            self.__stats[layer]['saved_seconds'] += max(row[1] - (time.time() - start), 0.0)
+        return value
+
+    def put(self, key, layer, value, seconds):
+        """Store the value of the layer that took the given number of seconds to compute."""
+        data = zlib.compress(json.dumps(value).encode('utf-8'))
+        with self.__lock:
+            row = self.__conn.execute('select size from layers where key=?', (key,)).fetchone()
+            if row is not None:
+                self.__size -= row[0]
+            self.__conn.execute('insert or replace into layers values (?, ?, ?, ?, ?, ?)',
+                                (key, layer, sqlite3.Binary(data), len(data), seconds, time.time()))
+            self.__size += len(data)
+            self.__evict()
+            self.__conn.commit()
+
+    def __evict(self):
+        while self.__size > self.max_size:
+            rows = self.__conn.execute('select key, size from layers order by accessed limit 100').fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self.__size <= self.max_size:
+                    break
+                self.__conn.execute('delete from layers where key=?', (key,))
+                self.__size -= size
+
+    def clear(self):
+        """Remove all stored layers and reset the statistics."""
+        with self.__lock:
+            self.__conn.execute('delete from layers')
+            self.__conn.commit()
+            self.__size = 0
+            self.__stats.clear()
+
+    def close(self):
+        self.__conn.close()
+
+    @property
+    def stats(self):
+        """The numbers of hits and misses and the saved time of every layer looked up from the cache.
+
+        Returns
+        -------
+        dict
+            Maps layer names to dictionaries with keys ``hits``, ``misses``, ``hit_rate`` and ``saved_seconds``.
+        """
+        stats = {}
+        with self.__lock:
+            items = [(layer, dict(s)) for layer, s in self.__stats.items()]
+        for layer, s in items:
+            stats[layer] = dict(s, hit_rate=s['hits'] / float(s['hits'] + s['misses']))
+        return stats
+
+    def report(self):
+        """The statistics of the layers as a printable table."""
+        lines = ['{0:<20} {1:>8} {2:>8} {3:>9} {4:>12}'.format('layer', 'hits', 'misses', 'hit rate', 'saved (s)')]
+        for layer, s in sorted(self.stats.items()):
+            lines.append('{0:<20} {hits:>8} {misses:>8} {hit_rate:>9.1%} {saved_seconds:>12.2f}'.format(layer, **s))
+        return '\n'.join(lines)
+
+
+def tag_cached(text, layer, tagger):
+    """Tag the layer of the text with the tagger function, unless the layer is found in the cache of the text."""
+    cache = text.get_kwargs().get('layer_cache')
+    if cache is None:
+        return tagger()
+    if not text.is_tagged(WORDS):
+        text.tokenize_words()
+    _, _, extract, apply = LAYERS[layer]
+    key = layer_key(text, layer)
+    value = cache.get(key, layer)
+    if value is not None:
+        apply(text, value)
+        return text
+    start = time.time()
+    result = tagger()
+    cache.put(key, layer, extract(text), time.time() - start)
+    return result
+
+
+def cached_layer(layer, retag=True):
+    """Decorator of the :py:class:`~estnltk.text.Text` methods that create cacheable layers.
+
+    Parameters
+    ----------
+    layer: str
+        The name of the layer created by the method.
+    retag: bool
+        If False, the method does not recompute the layer if it exists, so the cache is not consulted either.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            if not retag and self.is_tagged(layer):
+                return method(self)
+            return tag_cached(self, layer, lambda: method(self))
+        return wrapper
+    return decorator
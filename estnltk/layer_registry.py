@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of the built-in layers of :py:class:`~estnltk.text.Text` and a scheduler that creates them.
+
+Every layer is created by a :py:class:`~estnltk.text.Text` method and depends on other layers. For example,
+timexes, clause annotations and named entity labels depend only on the morphological analysis, so they can
+be tagged at the same time::
+
+    text = Text('Eile käisin koolis.')
+    text.tag_layers([TIMEXES, NAMED_ENTITIES, VERB_CHAINS])
+
+:py:func:`tag_layers` creates the missing dependencies first and then runs the taggers whose dependencies are
+ready on separate threads. The JVM based taggers (timexes, clauses, syntax) spend their time in external
+processes and the NER tagger in CRFSuite, so the time of tagging all layers is close to the time of the
+longest chain of dependencies.
+
+A tagger that runs concurrently with other taggers gets a deep copy of the text, because the taggers add
+attributes to the same ``words`` layer elements. After the tagger is done, only the attributes of its own
+layer are copied back to the text.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import six
+import sys
+import threading
+from copy import deepcopy
+from six.moves import queue
+
+from .names import *
+
+
+def _word_attributes(layer, *attributes):
+    # the attributes of the words layer elements that make up the layer
+    def extract(text):
+        return [dict((a, word[a]) for a in attributes if a in word) for word in text[WORDS]]
+
+    def apply(text, value):
+        for word, attrs in zip(text[WORDS], value):
+            word.update(attrs)
+        text.touch_layer(layer)
+    return extract, apply
+
+
+def _layer(layer):
+    def extract(text):
+        return text[layer]
+
+    def apply(text, value):
+        text[layer] = value
+    return extract, apply
+
+
+def _timexes():
+    def extract(text):
+        return {CREATION_DATE: text[CREATION_DATE], TIMEXES: text[TIMEXES]}
+
+    def apply(text, value):
+        text[CREATION_DATE] = value[CREATION_DATE]
+        text[TIMEXES] = value[TIMEXES]
+    return extract, apply
+
+
+# layer -> (the Text method creating the layer, dependencies, extract, apply)
+# extract(text) returns the data of the layer, apply(text, data) adds it to another text with the same words
+LAYERS = {
+    PARAGRAPHS: ('tokenize_paragraphs', ()) + _layer(PARAGRAPHS),
+    SENTENCES: ('tokenize_sentences', (PARAGRAPHS,)) + _layer(SENTENCES),
+    WORDS: ('tokenize_words', (SENTENCES,)) + _layer(WORDS),
+    ANALYSIS: ('tag_analysis', (WORDS,)) + _word_attributes(ANALYSIS, TEXT, ANALYSIS),
+    LABEL: ('tag_labels', (ANALYSIS,)) + _word_attributes(LABEL, LABEL),
+    NAMED_ENTITIES: ('tag_named_entities', (LABEL,)) + _layer(NAMED_ENTITIES),
+    TIMEXES: ('tag_timexes', (ANALYSIS,)) + _timexes(),
+    CLAUSE_ANNOTATION: ('tag_clause_annotations', (ANALYSIS,)) +
+                       _word_attributes(CLAUSE_ANNOTATION, CLAUSE_ANNOTATION, CLAUSE_IDX),
+    CLAUSES: ('tag_clauses', (CLAUSE_ANNOTATION,)) + _layer(CLAUSES),
+    VERB_CHAINS: ('tag_verb_chains', (CLAUSES,)) + _layer(VERB_CHAINS),
+    # the disambiguation of the morphological analysis of the syntactic parsers is chosen before it is tagged
+    LAYER_CONLL: ('tag_syntax_maltparser', (ANALYSIS,)) + _layer(LAYER_CONLL),
+    LAYER_VISLCG3: ('tag_syntax_vislcg3', (ANALYSIS,)) + _layer(LAYER_VISLCG3),
+    WORDNET: ('tag_wordnet', (ANALYSIS,)) + _word_attributes(WORDNET, ANALYSIS),
+}
+
+
+SYNTAX_LAYERS = (LAYER_CONLL, LAYER_VISLCG3)
+
+
+def dependencies(layer):
+    """The layers the given layer directly depends on."""
+    return LAYERS[layer][1]
+
+
+def plan(text, layers):
+    """The layers that must be created to tag the given layers, in the order of their dependencies.
+
+    The layers already tagged in the text and their dependencies are left out.
+    """
+    order = []
+
+    def visit(layer):
+        if layer in order or text.is_tagged(layer):
+            return
+        for dependency in dependencies(layer):
+            visit(dependency)
+        order.append(layer)
+
+    for layer in layers:
+        if layer not in LAYERS:
+            raise ValueError('Unknown layer: {0}'.format(layer))
+        visit(layer)
+    return order
+
+
+def _isolated_copy(text):
+    return text.__class__(deepcopy(dict(text)), **text.get_kwargs())
+
+
+def tag_layers(text, layers, concurrent=True):
+    """Tag the given layers and the layers they depend on.
+
+    Parameters
+    ----------
+    text: estnltk.text.Text
+        The text to tag.
+    layers: list of str
+        The names of the layers.
+    concurrent: bool
+        Run the taggers of independent layers on separate threads (default: True).
+
+    Returns
+    -------
+    estnltk.text.Text
+        The text.
+    """
+    for layer in layers:
+        if layer in SYNTAX_LAYERS:
+            # the parser and the disambiguation of its morphological analysis are chosen on the text itself,
+            # the concurrent taggers get copies of the text
+            text.select_syntactic_parser(layer)
+    pending = plan(text, layers)
+    running = set()
+    results = queue.Queue()
+
+    def worker(layer, copy):
+        try:
+            getattr(copy, LAYERS[layer][0])()
+            results.put((layer, LAYERS[layer][2](copy), None))
+        except BaseException:
+            results.put((layer, None, sys.exc_info()))
+
+    error = None
+    while pending or running:
+        ready = [layer for layer in pending
+                 if all(d not in pending and d not in running for d in dependencies(layer))]
+        if error is None and ready and not running and (len(ready) == 1 or not concurrent):
+            # nothing else is running, tag the text itself
+            pending.remove(ready[0])
+            getattr(text, LAYERS[ready[0]][0])()
+            continue
+        if error is None:
+            for layer in ready:
+                pending.remove(layer)
+                running.add(layer)
+                # the copy is made here, as the other threads do not modify the text
+                thread = threading.Thread(target=worker, args=(layer, _isolated_copy(text)))
+                thread.daemon = True
+                thread.start()
+        if not running:
+            break
+        layer, value, exc_info = results.get()
+        running.remove(layer)
+        if exc_info is not None:
+            error = error or exc_info
+            continue
+        LAYERS[layer][3](text, value)
+    if error is not None:
+        six.reraise(*error)
+    return text
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Memoized properties of :py:class:`~estnltk.text.Text` that are invalidated when their layers change.
+
+Every layer of a text has a version counter, that is incremented when the layer is assigned, deleted or
+re-tagged (the taggers adding attributes to the ``words`` layer elements increment the version of their
+attribute, for example ``analysis``). A :py:class:`layer_property` stores its value together with the versions
+of the layers it is computed from and recomputes the value only when one of these versions has changed::
+
+    text = Text('Tere maailm!')
+    text.word_texts                 # computed
+    text.word_texts                 # memoized
+    text.tokenize_words()           # increments the version of "words"
+    text.word_texts                 # computed again
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+VERSIONS = '_layer_versions'
+VALUES = '_layer_property_values'
+
+
+def layer_versions(obj):
+    """The dictionary of the layer versions of the object."""
+    versions = obj.__dict__.get(VERSIONS)
+    if versions is None:
+        versions = obj.__dict__[VERSIONS] = {}
+    return versions
+
+
+def touch(obj, layer):
+    """Increment the version of the layer."""
+    versions = layer_versions(obj)
+    versions[layer] = versions.get(layer, 0) + 1
+
+
+class layer_property(object):
+    """Decorator of a property that is memoized until one of the given layers changes.
+
+    Parameters
+    ----------
+    layers: str
+        The names of the layers (and word attributes) the value of the property depends on.
+    """
+
+    def __init__(self, *layers):
+        self.layers = layers
+        self.func = None
+
+    def __call__(self, func):
+        self.func = func
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+        return self
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        values = obj.__dict__.get(VALUES)
+        if values is None:
+            values = obj.__dict__[VALUES] = {}
+        versions = layer_versions(obj)
+        key = tuple(versions.get(layer, 0) for layer in self.layers)
+        memo = values.get(self.__name__)
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        value = self.func(obj)
+        # the property may have tagged its layers
+        key = tuple(versions.get(layer, 0) for layer in self.layers)
+        values[self.__name__] = (key, value)
+        return value
+
+    def __set__(self, obj, value):
+        raise AttributeError("can't set attribute")
+
+    def __delete__(self, obj):
+        obj.__dict__.get(VALUES, {}).pop(self.__name__, None)
@@ -75,7 +75,7 @@ def json_document_to_estner_document(jsondoc):
         A ner document.
     """
     sentences = []
-    for json_sent in jsondoc.split_by_sentences():
+    for json_sent in jsondoc.view_by_sentences():
         snt = Sentence()
         zipped = list(zip(
             json_sent.word_texts,
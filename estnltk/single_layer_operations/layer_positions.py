@@ -2,6 +2,7 @@
 Lihtkihi elementidega opereerimise tööriistad.
 """
 import copy
+import heapq
 
 
 def touching_right(x, y):
@@ -150,22 +151,48 @@ def pop_first_by_identity(lst, ob):
 
 
 
+def _sweep_intersecting_pairs(elements, strict=False):
+    """
+    Finds pairs of intersecting elements with a sweep over the elements sorted by start
+    in O(n log n + k) time, where k is the number of pairs.
+
+    Returns a list of (i1, i2) index pairs, such that
+    elements[i1]['start'] <= elements[i2]['start'] < elements[i1]['end'].
+    If both orders satisfy the condition, the smaller index comes first.
+    The list is ordered by (i1, i2).
+    If strict is True, zero-length elements are ignored.
+    """
+    # zero-length elements go after the others with the same start, so that they are paired with them
+    order = sorted(range(len(elements)), key=lambda i: (elements[i]['start'], elements[i]['end'] <= elements[i]['start']))
+    active = []  # heap of (end, index)
+    pairs = []
+    for i2 in order:
+        start2, end2 = elements[i2]['start'], elements[i2]['end']
+        while active and active[0][0] <= start2:
+            heapq.heappop(active)
+        if strict and end2 <= start2:
+            continue
+        for _, i1 in active:
+            if i2 < i1 and elements[i1]['start'] == start2 and start2 < end2:
+                pairs.append((i2, i1))
+            else:
+                pairs.append((i1, i2))
+        if start2 < end2:
+            heapq.heappush(active, (end2, i2))
+    pairs.sort()
+    return pairs
+
+
 def iterate_intersecting_pairs(layer):
     """
     Given a layer of estntltk objects, yields pairwise intersecting elements.
     Breaks when the layer is changed or deleted after initializing the iterator.
     """
-    yielded = set()
     ri = layer[:]  # Shallow copy the layer
-    for i1, elem1 in enumerate(ri):
-        for i2, elem2 in enumerate(ri):
-            if i1 != i2 and elem1['start'] <= elem2['start'] < elem1['end']:
-                inds = (i1, i2) if i1 < i2 else (i2, i1)
-                if inds not in yielded and in_by_identity(layer, elem1) and in_by_identity(layer, elem2):
-                    yielded.add(inds)
-                    yield elem1, elem2
-
-
+    for i1, i2 in _sweep_intersecting_pairs(ri):
+        elem1, elem2 = ri[i1], ri[i2]
+        if in_by_identity(layer, elem1) and in_by_identity(layer, elem2):
+            yield elem1, elem2
 
 
 def discard(a, b, **kwargs):
@@ -240,41 +267,65 @@ def make_layer_nonconflicting(layer, merge_func):
     # On ilmne, et kahe võrdse elemendi ühendamine ei tekita uusi konflikte
     # Seega peavad konfliktid minema nulli.
 
+    # Konfliktseid paare otsime pühkimisega (O(n log n + k)) ning elementide olemasolu kihis jälgime
+    # id() järgi, kiht pannakse uuesti kokku iga läbimise lõpus.
+    # Nullpikkusega elemente konfliktideks ei loeta, sest nende tükeldamine ei lõppeks kunagi.
     while True:
-        while True:
-            if not list(iterate_intersecting_pairs(layer)):
-                break
-
-            for a, b in iterate_intersecting_pairs(layer):
-                a, b = (a, b) if a['start'] <= b['start'] else (b, a)
-
-                if equal(a, b):
-                    if a is not b:
-                        layer.append(merge(pop_first_by_identity(layer, a),
-                            pop_first_by_identity(layer, b), merge_func, value='equal'))
-                    continue
-
-                elif nested(a, b) or nested(b, a):
-                    if nested(b, a):
-                        a, b = b, a
-
-                    pop_first_by_identity(layer, b)
-                    pop_first_by_identity(layer, a)
-                    diff = difference(a, b)
-                    layer.extend(diff)
-                    continue
-
-                elif overlapping_right(a, b):
-                    mida, midb = union(copy.deepcopy(a), copy.deepcopy(b))
-                    layer.append(merge(mida, midb, merge_func, value='overlapping_right'))
-
-                    a_m = copy.deepcopy(a)
-                    a, b = delete_left(a, mida)
-                    _, b = delete_right(midb, b)
-                    continue
-
-                else:
-                    print('should not happen')
+        elements = layer[:]
+        pairs = _sweep_intersecting_pairs(elements, strict=True)
+        if not pairs:
+            return layer
+
+        alive = set(id(elem) for elem in elements)
+        removed = set()
+        added = []
+
+        def remove(elem):
+            alive.discard(id(elem))
+            removed.add(id(elem))
+
+        def add(elem):
+            alive.add(id(elem))
+            added.append(elem)
+
+        for i1, i2 in pairs:
+            a, b = elements[i1], elements[i2]
+            if a is b or id(a) not in alive or id(b) not in alive:
+                continue
+            if not max(a['start'], b['start']) < min(a['end'], b['end']):
+                # an earlier split in this pass has already resolved the conflict
+                continue
+            a, b = (a, b) if a['start'] <= b['start'] else (b, a)
+
+            if equal(a, b):
+                remove(a)
+                remove(b)
+                add(merge(a, b, merge_func, value='equal'))
+
+            elif nested(a, b) or nested(b, a):
+                if nested(b, a):
+                    a, b = b, a
+                remove(b)
+                remove(a)
+                for elem in difference(a, b):
+                    add(elem)
+
+            elif overlapping_right(a, b):
+                mida, midb = union(copy.deepcopy(a), copy.deepcopy(b))
+                add(merge(mida, midb, merge_func, value='overlapping_right'))
+
+                # the left part of a and the right part of b remain
+                a_end = a['end']
+                delete_left(a, b)
+                b['start'] = a_end
+
+        kept = [elem for elem in elements if id(elem) not in removed]
+        for elem in added:
+            # an element may have been split again after it was added
+            if id(elem) in alive:
+                alive.discard(id(elem))
+                kept.append(elem)
+        layer[:] = kept
 
 
 '''
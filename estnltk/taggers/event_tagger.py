@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 
 import ahocorasick
 from sys import version_info
+from multiprocessing.pool import ThreadPool
 
 import regex as re
 
@@ -160,7 +161,7 @@ class RegexTagger(KeywordTagger):
     """ 
     """
     def __init__(self, regex_sequence=None, conflict_resolving_strategy='MAX', return_layer=False,
-                 layer_name='regexes'):
+                 layer_name='regexes', threads=1):
         """Initialize a new RegexTagger instance.
         
         Parameters
@@ -173,6 +174,9 @@ class RegexTagger(KeywordTagger):
             if True, KeywordTagger.tag(text) returns a layer. If False, KeywordTagger.tag(text) annotates the text object with the layer instead.
         layer_name: str
             if return_layer is False, KeywordTagger.tag(text) annotates to this layer of the text object. Default 'keywords'
+        threads: int
+            Number of threads the patterns are sharded across when matching (default: 1).
+            The regex engine releases the GIL while scanning, so shards run in parallel.
         """
         if regex_sequence is None:
             raise ValueError("Can't really do something without keywords")
@@ -197,6 +201,12 @@ class RegexTagger(KeywordTagger):
         if conflict_resolving_strategy not in ['ALL', 'MIN', 'MAX']:
             raise ValueError("Unknown conflict_resolving_strategy '%s'." % conflict_resolving_strategy)
         self.conflict_resolving_strategy = conflict_resolving_strategy
+        if threads < 1:
+            raise ValueError("Number of threads must be positive, got %s." % threads)
+        self.threads = threads
+        # compile the patterns once, so that tagging does not depend on the
+        # size of the regex module's internal pattern cache
+        self.compiled_sequence = [(r, re.compile(r)) for r in self.regex_sequence]
 
     def tag(self, text):
         """Retrieves list of regex_matches in text.
@@ -219,14 +229,22 @@ class RegexTagger(KeywordTagger):
             text[self.layer_name] = matches
 
     def _match(self, text):
+        if self.threads == 1 or len(self.compiled_sequence) < 2:
+            return self._match_patterns(self.compiled_sequence, text, concurrent=None)
+        size = -(-len(self.compiled_sequence) // self.threads)
+        shards = [self.compiled_sequence[i:i + size] for i in range(0, len(self.compiled_sequence), size)]
+        pool = ThreadPool(len(shards))
+        try:
+            results = pool.map(lambda shard: self._match_patterns(shard, text, concurrent=True), shards)
+        finally:
+            pool.close()
+        # shards are contiguous, so concatenating them preserves the pattern order
+        return [match for result in results for match in result]
+
+    def _match_patterns(self, compiled_sequence, text, concurrent):
         matches = []
-        if self.mapping:
-            seq = self.map.keys()
-        else:
-            seq = self.regex_sequence
-
-        for r in seq:
-            for matchobj in re.finditer(r, text, overlapped=True):
+        for r, pattern in compiled_sequence:
+            for matchobj in pattern.finditer(text, overlapped=True, concurrent=concurrent):
                 groups = (matchobj.groupdict())
                 result = {
                     'start': matchobj.start(),
@@ -394,22 +412,13 @@ class EventTagger(KeywordTagger):
         return events
 
     def _event_intervals(self, events, text):
-        bookmark = 0
         overlapping_events = False
         last_end = 0
         for event in events:
             if last_end > event[START]:
                 overlapping_events = True
             last_end = event[END]
-            event[WSTART_RAW] = len(text.word_spans)
-            event[WEND_RAW] = 0
-            for i in range(bookmark, len(text.word_spans) - 1):
-                if text.word_spans[i][0] <= event[START] < text.word_spans[i + 1][0]:
-                    event[WSTART_RAW] = i
-                    bookmark = i
-                if text.word_spans[i][0] < event[END] <= text.word_spans[i + 1][0]:
-                    event[WEND_RAW] = i + 1
-                    break
+            event[WSTART_RAW], event[WEND_RAW] = text.word_index_range(event[START], event[END])
         if not overlapping_events:
             w_shift = 0
             c_shift = 0
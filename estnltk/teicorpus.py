@@ -11,17 +11,21 @@ The resulting documents have paragraphs separated by two newlines and sentences
 The original plain text is not known for XML TEI files.
 Note that all punctuation has been separated from words in the TEI files.
 
-TODO: Make this module faster, it is dead slow, probably due to BeautifulSoup4.
+The files are read incrementally with :py:func:`xml.etree.ElementTree.iterparse`: a document is parsed as soon
+as its <div> closes and the parsed elements are cleared, so the memory use does not depend on the size of the file.
+Files with an explicit ``encoding`` are decoded and re-encoded to UTF-8 a chunk at a time as well.
 """
 from __future__ import unicode_literals, print_function, absolute_import
 
 from .core import get_filenames
 from .names import *
 from .text import Text
-from bs4 import BeautifulSoup
-from copy import deepcopy
+from multiprocessing import Pool
+from xml.etree.ElementTree import Element, iterparse
 
+import codecs
 import os
+import re
 
 
 def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encoding=None):
@@ -49,14 +53,50 @@ def parse_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encod
         Corpus containing parsed documents from all files. The file path
         is stored in FILE attribute of the documents.
     """
-    documents = []
-    for fnm in get_filenames(root, prefix, suffix):
-        path = os.path.join(root, fnm)
-        docs = parse_tei_corpus(path, target, encoding)
-        for doc in docs:
-            doc[FILE] = fnm
-        documents.extend(docs)
-    return documents
+    return list(iterate_tei_corpora(root, prefix, suffix, target, encoding))
+
+
+def iterate_tei_corpora(root, prefix='', suffix='.xml', target=['artikkel'], encoding=None, processes=1):
+    """Parse documents from TEI style XML files, yielding the documents one by one.
+
+    The parameters are the same as for :py:func:`parse_tei_corpora`, plus
+
+    processes: int
+        Number of worker processes parsing the files (default: 1, parse in the current process).
+        If more than one, the files are distributed between the worker processes,
+        the documents are still yielded in the order of the files.
+
+    Yields
+    ------
+    estnltk.text.Text
+    """
+    filenames = get_filenames(root, prefix, suffix)
+    jobs = ((root, fnm, target, encoding) for fnm in filenames)
+    if processes > 1:
+        pool = Pool(processes)
+        try:
+            for docs in pool.imap(_parse_file, jobs):
+                for doc in docs:
+                    yield Text(doc)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        for job in jobs:
+            for doc in _iterate_file(*job):
+                yield Text(doc)
+
+
+def _iterate_file(root, fnm, target, encoding):
+    for doc in iterate_tei_documents(os.path.join(root, fnm), target, encoding):
+        doc[FILE] = fnm
+        yield doc
+
+
+def _parse_file(job):
+    """Parse a file in a worker process, the documents are sent back as dictionaries."""
+    return list(_iterate_file(*job))
 
 
 def parse_tei_corpus(path, target=['artikkel'], encoding=None):
@@ -76,17 +116,113 @@ def parse_tei_corpus(path, target=['artikkel'], encoding=None):
     -------
     list of esnltk.text.Text
     """
-    with open(path, 'rb') as f:
-        html_doc = f.read()
+    return [Text(doc) for doc in iterate_tei_documents(path, target, encoding)]
+
+
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+class _RecodedFile(object):
+    """Reads a file in the given encoding as UTF-8 without the XML declaration, a chunk at a time."""
+
+    def __init__(self, f, encoding, chunk_size=1 << 16):
+        self.reader = codecs.getreader(encoding)(f)
+        self.chunk_size = chunk_size
+        # the declaration would override the encoding, it is at the start of the file
+        head = ''
+        while '>' not in head:
+            chunk = self.reader.read(self.chunk_size)
+            if not chunk:
+                break
+            head += chunk
+        self.buffer = XML_DECLARATION.sub('', head).encode('utf-8')
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            chunk = self.reader.read(self.chunk_size)
+            if not chunk:
+                break
+            self.buffer += chunk.encode('utf-8')
+        if size < 0 or len(self.buffer) <= size:
+            result, self.buffer = self.buffer, b''
+        else:
+            result, self.buffer = self.buffer[:size], self.buffer[size:]
+        return result
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def _div_level(name):
+    if name.startswith('div') and name[3:].isdigit():
+        return int(name[3:])
+    return None
+
+
+def iterate_tei_documents(path, target=['artikkel'], encoding=None):
+    """Parse documents from a TEI style XML file incrementally.
+
+    The parameters are the same as for :py:func:`parse_tei_corpus`.
+
+    Yields
+    ------
+    dict
+        The documents with the text, title, type and the metadata of the parent divs,
+        as expected by :py:class:`~estnltk.text.Text`.
+    """
     if encoding:
-        html_doc = html_doc.decode( encoding )
-    soup = BeautifulSoup(html_doc, 'html5lib')
-    title = soup.find_all('title')[0].string
-    
-    documents = []
-    for div1 in soup.find_all('div1'):
-        documents.extend(parse_div(div1, dict(), target))
-    return tokenize_documents(documents)
+        with open(path, 'rb') as f:
+            for doc in _iterate_documents(_RecodedFile(f, encoding), target):
+                yield doc
+    else:
+        for doc in _iterate_documents(path, target):
+            yield doc
+
+
+def _iterate_documents(source, target):
+    stack = []  # the open elements
+    divs = []   # the open divs, as (level, element) pairs
+    for event, elem in iterparse(source, ('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            level = _div_level(_local_name(elem.tag))
+            if level is not None:
+                divs.append((level, elem))
+            continue
+
+        stack.pop()
+        level = _div_level(_local_name(elem.tag))
+        if level is None:
+            if not divs:
+                # no document can contain this element
+                elem.clear()
+            continue
+        divs.pop()
+        if elem.get('type', None) not in target:
+            continue
+        metadata = _parent_metadata(divs, level, target)
+        if metadata is not None:
+            yield tokenize_document(parse_div(elem, metadata))
+            elem.clear()
+
+
+def _parent_metadata(divs, level, target):
+    """Collect the metadata of the chain of divs (div1, div2, ...) leading to a document at the given level.
+
+    Returns None, if the document is not reachable by such a chain, or the chain contains another document.
+    """
+    metadata = {}
+    for ancestor_level, ancestor in reversed(divs):
+        if ancestor_level == level - 1:
+            div_type = ancestor.get('type', None)
+            if div_type in target:
+                return None
+            metadata.setdefault(div_type, div_title(ancestor).strip())
+            level -= 1
+    if level != 1:
+        return None
+    return metadata
 
 
 def get_subdiv(div):
@@ -94,68 +230,84 @@ def get_subdiv(div):
     return 'div' + str(int(n) + 1)
 
 
-def parse_div(soup, metadata, target):
-    """Parse a <div> tag from the file.
-    
+def _nodes(elem):
+    """The child nodes of the element, with the <head> elements replaced by their contents."""
+    if elem.text:
+        yield elem.text
+    for child in elem:
+        if _local_name(child.tag) == 'head':
+            for node in _nodes(child):
+                yield node
+        else:
+            yield child
+        if child.tail:
+            yield child.tail
+
+
+def _string(elem):
+    """The string of an element having a single child string."""
+    children = list(_nodes(elem))
+    if len(children) != 1:
+        return None
+    if isinstance(children[0], Element):
+        return _string(children[0])
+    return children[0]
+
+
+def div_title(div):
+    """The title of a <div>: the text at the beginning of the div, including the text of the <head>."""
+    title = None
+    for node in _nodes(div):
+        if isinstance(node, Element):
+            return _string(node) if title is None else title
+        title = node if title is None else title + node
+    return title
+
+
+def _text(elem):
+    return ''.join(elem.itertext())
+
+
+def parse_div(div, metadata):
+    """Parse a document <div> into structured paragraphs and sentences.
+
     The sections in XML files are given in <div1>, <div2> and <div3>
     tags. Each such tag has a type and name (plus possibly more extra attributes).
     
-    If the div type is found in target variable, the div is parsed
-    into structured paragraphs, sentences and words.
-    
-    Otherwise, the type and name are added as metadata to subdivs
-    and stored in.
-    
     Parameters
     ----------
-    soup: bs4.BeautifulSoup
-        The parsed XML data.
-    metdata: dict
+    div: xml.etree.ElementTree.Element
+        The document div.
+    metadata: dict
         The metadata for parent divs.
-    target: list of str
-        List of <div> types, that are considered documents in the XML files.
-    
-    """
-    documents = []
-    div_type = soup.get('type', None)
-    div_title = list(soup.children)[0].string.strip()
-    
-    if div_type in target:
-        div_authors = soup.find_all('author')
-        document = {
-            'type': div_type,
-            'title': div_title,
-            'paragraphs': parse_paragraphs(soup)
-        }
-        # add author, if it exists
-        if len(div_authors) > 0:
-            div_author = div_authors[0].text.strip()
-            document['author'] = div_author
-        # add collected metadata
-        for k, v in metadata.items():
-            document[k] = v
-        documents.append(document)
-    else:
-        metadata[div_type] = div_title
 
-        # recurse subdivs
-        subdiv_name = get_subdiv(soup.name)
-        subdivs = []
-        if subdiv_name is not None:
-            subdivs = soup.find_all(subdiv_name)
-        if len(subdivs) > 0:
-            for subdiv in subdivs:
-                documents.extend(parse_div(subdiv, deepcopy(metadata), target))
-    return documents
+    Returns
+    -------
+    dict
+    """
+    document = {
+        'type': div.get('type', None),
+        'title': div_title(div).strip(),
+        'paragraphs': parse_paragraphs(div)
+    }
+    # add author, if it exists
+    for author in div.iter():
+        if _local_name(author.tag) == 'author':
+            document['author'] = _text(author).strip()
+            break
+    # add collected metadata
+    for k, v in metadata.items():
+        document[k] = v
+    return document
 
 
-def parse_paragraphs(soup):
+def parse_paragraphs(div):
     """Parse sentences and paragraphs in the section.
     
     Parameters
     ----------
-    soup: bs4.BeautifulSoup
-        The parsed XML data.
+    div: xml.etree.ElementTree.Element
+        The document div.
         
     Returns
     -------
@@ -163,10 +315,14 @@ def parse_paragraphs(soup):
         List of paragraphs given as list of sentences.
     """
     paragraphs = []
-    for para in soup.find_all('p'):
+    for para in div.iter():
+        if _local_name(para.tag) != 'p':
+            continue
         sentences = []
-        for sent in para.find_all('s'):
-            sentence = sent.text.strip()
+        for sent in para.iter():
+            if _local_name(sent.tag) != 's':
+                continue
+            sentence = _text(sent).strip()
             if len(sentence) > 0:
                 sentences.append(sentence)
         if len(sentences) > 0:
@@ -183,13 +339,13 @@ def concatenate(texts, sep=' ', offset=0):
     return sep.join(texts), spans
 
 
+def tokenize_document(doc):
+    """Join the paragraphs of an imported document into its text."""
+    doc[TEXT] = '\n\n'.join(['\n'.join(para[SENTENCES]) for para in doc[PARAGRAPHS]])
+    del doc[PARAGRAPHS]
+    return doc
+
+
 def tokenize_documents(docs):
     """Convert the imported documents to :py:class:'~estnltk.text.Text' instances."""
-    sep = '\n\n'
-    texts = []
-    for doc in docs:
-        text = '\n\n'.join(['\n'.join(para[SENTENCES]) for para in doc[PARAGRAPHS]])
-        doc[TEXT] = text
-        del doc[PARAGRAPHS]
-        texts.append(Text(doc))
-    return texts
+    return [Text(tokenize_document(doc)) for doc in docs]
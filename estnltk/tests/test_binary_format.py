@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..names import *
+from ..text import Text
+from ..binary_format import dumps, loads, BinaryText
+from ..corpus import read_binary_document, write_binary_document
+
+
+class BinaryFormatTest(unittest.TestCase):
+
+    def text(self):
+        text = Text('Esimene lause on siin. Teine lause tuleb nüüd.\n\nKolmas lause.').tag_analysis()
+        text['multi'] = [{START: [0, 23], END: [7, 28], 'value': 'x'}]
+        text['unordered'] = [{START: 8, END: 13}, {START: 0, END: 7, 'score': -0.5}]
+        text['meta'] = {'title': 'Pealkiri', 'year': 2016, 'id': 2 ** 70, 'offset': -3, 'ok': True,
+                        'checked': False, 'missing': None, 'tags': ['a', 'b'], 'empty': []}
+        return text
+
+    def test_round_trip(self):
+        text = self.text()
+        result = loads(dumps(text))
+        self.assertIsInstance(result, Text)
+        self.assertEqual(json.loads(json.dumps(text)), dict(result))
+        self.assertListEqual(text.lemmas, result.lemmas)
+        self.assertLess(len(dumps(text)), len(json.dumps(text)))
+
+    def test_lazy_layers(self):
+        text = self.text()
+        document = BinaryText(dumps(text))
+        self.assertEqual(set(text), set(document))
+        self.assertEqual(text[SENTENCES], document[SENTENCES])
+        self.assertGreater(document.section_size(WORDS), document.section_size(SENTENCES))
+
+        result = loads(dumps(text), layers=[WORDS])
+        self.assertSetEqual({TEXT, WORDS}, set(result))
+        self.assertListEqual(text.lemmas, result.lemmas)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            BinaryText(b'{"text": ""}')
+        with self.assertRaises(ValueError):
+            BinaryText(b'ETXB\x7f')
+        with self.assertRaises(TypeError):
+            dumps({TEXT: '', 'meta': {1: 'a'}})
+        with self.assertRaises(TypeError):
+            dumps({TEXT: '', 'meta': object()})
+
+    def test_files(self):
+        text = self.text()
+        directory = tempfile.mkdtemp()
+        try:
+            fnm = os.path.join(directory, 'text.bin')
+            write_binary_document(text, fnm)
+            self.assertEqual(dict(text), dict(read_binary_document(fnm)))
+            self.assertListEqual(text.word_texts, read_binary_document(fnm, [WORDS]).word_texts)
+        finally:
+            shutil.rmtree(directory)
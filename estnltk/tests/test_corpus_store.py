@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from ..names import *
+from ..text import Text
+from ..corpus_store import CorpusStore, CorpusStoreWriter, write_corpus_store, shard_range, DATA_FILE, INDEX_FILE
+
+
+class CorpusStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'store')
+        self.texts = ['Dokument number {0}. Teine lause.'.format(i) for i in range(10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self):
+        return write_corpus_store((Text(text).tokenize_words() for text in self.texts), self.path)
+
+    def test_random_access(self):
+        self.assertEqual(10, self.write())
+        with CorpusStore(self.path) as store:
+            self.assertEqual(10, len(store))
+            self.assertEqual(self.texts[3], store[3].text)
+            self.assertEqual(self.texts[-1], store[-1].text)
+            self.assertListEqual(self.texts[2:8:3], [text.text for text in store[2:8:3]])
+            self.assertListEqual(self.texts, [text.text for text in store])
+            text = Text(self.texts[3]).tokenize_words()
+            self.assertListEqual(text.word_texts, store[3].word_texts)
+            self.assertSetEqual({TEXT, WORDS}, set(store.get(3, layers=[WORDS])))
+            self.assertEqual(text[SENTENCES], store.document(3)[SENTENCES])
+            with self.assertRaises(IndexError):
+                store[10]
+
+    def test_shards(self):
+        self.write()
+        store = CorpusStore(self.path)
+        self.assertListEqual([range(0, 3), range(3, 6), range(6, 10)], [store.shard(i, 3) for i in range(3)])
+        texts = [text.text for worker in range(3) for text in store.iter_shard(worker, 3, layers=[])]
+        self.assertListEqual(self.texts, texts)
+        self.assertListEqual([], list(shard_range(0, 1, 2)))
+        with self.assertRaises(ValueError):
+            store.shard(3, 3)
+        store = pickle.loads(pickle.dumps(store))
+        self.assertEqual(self.texts[5], store[5].text)
+
+    def test_append(self):
+        write_corpus_store([{TEXT: 'Esimene.'}], self.path)
+        # an interrupted writer leaves data and a partial index entry after the last flush
+        with open(os.path.join(self.path, DATA_FILE), 'ab') as f:
+            f.write(b'garbage')
+        with open(os.path.join(self.path, INDEX_FILE), 'ab') as f:
+            f.write(b'\x01\x02')
+        with CorpusStoreWriter(self.path) as writer:
+            self.assertEqual(1, writer.append({TEXT: 'Teine.'}))
+        self.assertListEqual(['Esimene.', 'Teine.'], [text.text for text in CorpusStore(self.path)])
+
+    def test_flush_every(self):
+        writer = CorpusStoreWriter(self.path, flush_every=3)
+        writer.extend({TEXT: text} for text in self.texts[:7])
+        # the writer is not closed, the documents after the last automatic flush are lost
+        with CorpusStore(self.path) as store:
+            self.assertListEqual(self.texts[:6], [text.text for text in store])
+        del writer
+        with CorpusStoreWriter(self.path) as writer:
+            self.assertEqual(6, writer.size)
+
+    def test_flush_bytes(self):
+        writer = CorpusStoreWriter(self.path, flush_every=None, flush_bytes=1)
+        writer.extend({TEXT: text} for text in self.texts[:2])
+        self.assertEqual(2, len(CorpusStore(self.path)))
+
+    def test_empty(self):
+        CorpusStoreWriter(self.path).close()
+        self.assertEqual(0, len(CorpusStore(self.path)))
+        with open(os.path.join(self.path, INDEX_FILE), 'wb') as f:
+            f.write(b'{"text": ""}')
+        with self.assertRaises(ValueError):
+            CorpusStore(self.path)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+
+from ..names import *
+from ..syntax.parsers import VISLCG3Parser
+from ..text import Text
+
+
+class SyntacticParser(VISLCG3Parser):
+    """Stands in for VISLCG3: the first word of a sentence is the root, the others depend on it."""
+
+    def __init__(self):
+        pass
+
+    def parse_text(self, text, **kwargs):
+        text[LAYER_VISLCG3] = []
+        for sent_id, sentence in enumerate(text.divide(WORDS, SENTENCES)):
+            for i, word in enumerate(sentence):
+                text[LAYER_VISLCG3].append({SENT_ID: sent_id, START: word[START], END: word[END],
+                                            PARSER_OUT: [['@SUBJ', 0 if i else -1]]})
+        return text
+
+
+class ApplyEditsTest(unittest.TestCase):
+
+    text = 'Esimene lause. Teine luase.\n\nKolmas lõik on siin. Ja veel.\n\nNeljas lõik.'
+
+    def assertRetagged(self, edits):
+        text = Text(self.text).tag_analysis()
+        expected = Text(self.text)
+        expected[TEXT] = text.text
+        for start, end, replacement in sorted(edits, reverse=True):
+            expected[TEXT] = expected[TEXT][:start] + replacement + expected[TEXT][end:]
+        expected = Text(expected[TEXT]).tag_analysis()
+        self.assertListEqual([], text.apply_edits(edits))
+        self.assertDictEqual(expected, text)
+        return text
+
+    def test_single_edit(self):
+        text = self.assertRetagged([(21, 26, 'lause')])
+        self.assertEqual('lause', text.lemmas[4])
+
+    def test_multiple_edits(self):
+        self.assertRetagged([(0, 7, 'Üks'), (38, 38, ' pikk'), (60, 66, 'Viimane')])
+
+    def test_paragraph_boundaries(self):
+        # merge the first two paragraphs and split the last one
+        self.assertRetagged([(27, 29, ' '), (67, 67, '\n\nUus lõik.')])
+        self.assertRetagged([(72, 72, '\n\nLõpp.')])
+        self.assertRetagged([(0, 0, 'Algus.\n\n')])
+
+    def test_other_layers(self):
+        text = Text(self.text).tokenize_words()
+        text['marks'] = [{START: 0, END: 7}, {START: 21, END: 26}, {START: 60, END: 66},
+                         {START: [8, 67], END: [13, 71]}]
+        text.apply_edits([(15, 20, 'Kolmas'), (21, 26, 'lause')])
+        self.assertListEqual(['Esimene', 'Neljas', 'lause lõik'], text.texts('marks'))
+
+    def test_cached_properties(self):
+        text = Text(self.text)
+        self.assertEqual('luase', text.word_texts[4])
+        text.apply_edits([(21, 26, 'lause')])
+        self.assertEqual('lause', text.word_texts[4])
+        self.assertEqual(text[TEXT], text.text)
+
+    def test_document_layers(self):
+        text = Text(self.text).tag_named_entities()
+        self.assertListEqual([LABEL, NAMED_ENTITIES], text.apply_edits([(21, 26, 'lause')]))
+        self.assertNotIn(NAMED_ENTITIES, text)
+        self.assertFalse(text.is_tagged(LABEL))
+        self.assertTrue(text.is_tagged(ANALYSIS))
+
+    def test_invalid_edits(self):
+        text = Text(self.text)
+        self.assertRaises(ValueError, text.apply_edits, [(0, 10, 'a'), (5, 12, 'b')])
+        self.assertRaises(ValueError, text.apply_edits, [(70, 80, 'a')])
+
+    def test_syntax(self):
+        text = Text('Esimene lause.\n\nTeine luase.', syntactic_parser=SyntacticParser()).tag_syntax()
+        self.assertListEqual([0, 0, 0, 1, 1, 1], [element[SENT_ID] for element in text[LAYER_VISLCG3]])
+        text.apply_edits([(22, 27, 'lause')])
+        self.assertListEqual([0, 0, 0, 1, 1, 1], [element[SENT_ID] for element in text[LAYER_VISLCG3]])
+        trees = text.syntax_trees(LAYER_VISLCG3)
+        self.assertListEqual([0, 1], [tree.sent_id for tree in trees])
+        self.assertListEqual(['Esimene', 'Teine'], [tree.text for tree in trees])
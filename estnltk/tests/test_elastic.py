@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import json
+import threading
+import unittest
+
+from six.moves import BaseHTTPServer
+from six.moves.urllib.parse import urlparse, parse_qs
+
+from ..text import Text
+from ..database.elastic import Index, RawSentence, positional_tokens
+
+import elasticsearch
+
+
+class BulkStub(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Answers index existence checks and bulk requests like an Elasticsearch server would."""
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+        lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+        server = self.server
+        server.requests += 1
+        items = []
+        for action, source in zip(lines[::2], lines[1::2]):
+            meta = action['index']
+            if server.reject > 0:
+                server.reject -= 1
+                items.append({'index': {'_id': meta['_id'], 'status': 429, 'error': 'rejected'}})
+            else:
+                server.actions.append((meta, source))
+                items.append({'index': {'_id': meta['_id'], 'status': 201}})
+        self.respond({'took': 1, 'errors': False, 'items': items})
+
+
+class BulkIndexingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), BulkStub)
+        self.server.requests = 0
+        self.server.reject = 0
+        self.server.actions = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        client = elasticsearch.Elasticsearch([{'host': '127.0.0.1', 'port': self.server.server_port}])
+        self.index = Index(client, 'test')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def documents(self):
+        return [Text('Esimene lause. Teine lause.'), Text('Kolmas lause.')]
+
+    def test_save_many(self):
+        stats = self.index.save_many(self.documents(), metas=[{'id': 1}, {'id': 2}], chunk_size=2)
+        self.assertEqual(2, stats['documents'])
+        self.assertEqual(5, stats['indexed'])
+        self.assertEqual(3, self.server.requests)
+
+        documents = [(meta, source) for meta, source in self.server.actions if meta['_type'] == 'document']
+        sentences = [(meta, source) for meta, source in self.server.actions if meta['_type'] == 'sentence']
+        self.assertListEqual([{'id': 1}, {'id': 2}], [source for _, source in documents])
+        self.assertListEqual([documents[0][0]['_id']] * 2 + [documents[1][0]['_id']],
+                             [meta['_parent'] for meta, _ in sentences])
+        self.assertListEqual(['Esimene lause.', 'Teine lause.', 'Kolmas lause.'],
+                             [source['text'] for _, source in sentences])
+
+    def test_save_many_threads(self):
+        stats = self.index.save_many(self.documents() * 5, chunk_size=3, threads=3)
+        self.assertEqual(25, stats['indexed'])
+        self.assertEqual(25, len(self.server.actions))
+
+    def test_progress(self):
+        reports = []
+        stats = self.index.save_many(self.documents(), chunk_size=2,
+                                     progress=lambda stats: reports.append(stats['documents']))
+        self.assertListEqual([0, 1, 2], reports)
+        self.assertEqual(2, stats['documents'])
+
+    def test_read_ahead(self):
+        # the documents are read only as far as the running requests need
+        read, reports = [], []
+
+        def documents():
+            for i in range(20):
+                read.append(i)
+                yield Text('Lause.')
+
+        stats = self.index.save_many(documents(), chunk_size=2, threads=2,
+                                     progress=lambda stats: reports.append(len(read) - stats['documents']))
+        self.assertEqual(20, stats['documents'])
+        self.assertLessEqual(max(reports), 3)
+
+    def test_retry(self):
+        self.server.reject = 2
+        stats = self.index.save_many(self.documents(), initial_backoff=0)
+        self.assertEqual(1, stats['retries'])
+        self.assertEqual(5, len(self.server.actions))
+
+    def test_failure(self):
+        self.server.reject = 100
+        self.assertRaises(elasticsearch.helpers.BulkIndexError, self.index.save_many, self.documents(),
+                          max_retries=1, initial_backoff=0)
+
+
+
+class PositionalTokensTest(unittest.TestCase):
+
+    def test_positional_tokens(self):
+        self.assertEqual('maja kass|kassi olema', positional_tokens([['maja'], ['kassi', 'kass', 'kass'], ['olema']]))
+        self.assertEqual('', positional_tokens([]))
+
+    def test_linear_size(self):
+        # every word is ambiguous, unrolling the combinations would give 2 ** 30 strings
+        text = Text(' '.join(['alla keel'] * 15), disambiguate=False).tag_analysis()
+        source = json.loads(next(Index._get_indexable_sentences(text)))
+        self.assertEqual(30, len(source['lemmas'].split()))
+        self.assertEqual(30, len(source['postags'].split()))
+        self.assertEqual('alla kee|keel', ' '.join(source['lemmas'].split()[:2]))
+        self.assertEqual('D|K S', ' '.join(source['postags'].split()[:2]))
+
+    def test_migration_actions(self):
+        sent = Text('Esimene lause.')
+        old_source = {'estnltk_text_object': json.dumps(sent.tag_analysis()), 'meta': {'order_in_parent': 3},
+                      'lemmas': ['esimene lause .'], 'postags': ['O S Z']}
+        hits = [{'_type': 'document', '_id': 'd', '_source': {'id': 1}},
+                {'_type': 'sentence', '_id': 's', '_source': old_source, 'fields': {'_parent': 'd'}}]
+        index = Index.__new__(Index)
+        index.index_name = 'new'
+        document, sentence = index._get_migration_actions(hits)
+        self.assertEqual({'_index': 'new', '_type': 'document', '_id': 'd', '_source': {'id': 1}}, document)
+        self.assertEqual('d', sentence['_parent'])
+        self.assertEqual(3, sentence['_source']['meta']['order_in_parent'])
+        self.assertEqual(positional_tokens(sent.lemma_lists), sentence['_source']['lemmas'])
+
+
+class ScrollStub(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Answers scroll requests like an Elasticsearch server with 4 shards and 10 sentences would."""
+
+    shards = 4
+
+    def log_message(self, *args):
+        pass
+
+    respond = BulkStub.respond
+    do_HEAD = BulkStub.do_HEAD
+
+    def hits(self, shards):
+        return [{'_id': str(i), 'fields': {'estnltk_text_object': [json.dumps(Text('Lause number %d.' % i))]}}
+                for i in range(10) if i % self.shards in shards]
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        if url.path.endswith('/_settings'):
+            return self.respond({'test': {'settings': {'index': {'number_of_shards': str(self.shards)}}}})
+        if url.path.endswith('/_search'):
+            params = parse_qs(url.query)
+            self.server.preferences.append(params.get('preference', [None])[0])
+            shards = params['preference'][0][len('_shards:'):] if 'preference' in params else \
+                ','.join(str(i) for i in range(self.shards))
+            return self.respond({'_scroll_id': shards + ';0', '_shards': {'total': 1, 'failed': 0},
+                                 'hits': {'hits': []}})
+        # scroll
+        shards, page = body.split(';')
+        hits = self.hits([int(i) for i in shards.split(',')]) if page == '0' else []
+        self.respond({'_scroll_id': shards + ';1', '_shards': {'total': 1, 'failed': 0}, 'hits': {'hits': hits}})
+
+    def do_DELETE(self):
+        self.respond({})
+
+
+def sentence_text(text):
+    return text.text
+
+
+class ScrollTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), ScrollStub)
+        self.server.preferences = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        client = elasticsearch.Elasticsearch([{'host': '127.0.0.1', 'port': self.server.server_port}])
+        self.index = Index(client, 'test')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_raw_sentences(self):
+        sentences = list(self.index.raw_sentences())
+        self.assertListEqual([str(i) for i in range(10)], sorted((s.id for s in sentences), key=int))
+        self.assertListEqual(['_shards:0', '_shards:1', '_shards:2', '_shards:3'], sorted(self.server.preferences))
+        sentence = [s for s in sentences if s.id == '3'][0]
+        self.assertIsInstance(sentence, RawSentence)
+        self.assertNotIn('text', sentence.__dict__)
+        self.assertEqual('Lause number 3.', sentence.text.text)
+
+    def test_raw_sentences_slices(self):
+        self.assertEqual(10, len(list(self.index.raw_sentences(slices=2))))
+        self.assertListEqual(['_shards:0,2', '_shards:1,3'], sorted(self.server.preferences))
+        self.assertEqual(10, len(list(self.index.raw_sentences(slices=1))))
+        self.assertEqual(None, self.server.preferences[-1])
+
+    def test_map_sentences(self):
+        texts = self.index.map_sentences(sentence_text, processes=2, chunksize=2)
+        self.assertListEqual(sorted('Lause number %d.' % i for i in range(10)), sorted(texts))
@@ -127,6 +127,14 @@ class EventTaggerTest(unittest.TestCase):
         self.assertListEqual(expected, result)
 
 
+    def test_event_tagger_last_word(self):
+        event_vocabulary = [{'term': 'peavalu'}]
+        text = Text('Esineb peavalu')
+        event_tagger = EventTagger(event_vocabulary, return_layer=True)
+        result = event_tagger.tag(text)
+        expected = [{'term': 'peavalu', 'start': 7, 'end': 14, 'wstart_raw': 1, 'wend_raw': 2, 'cstart': 7, 'wstart': 1, 'bstart': 1}]
+        self.assertListEqual(expected, result)
+
     def test_event_tagger_sort_events(self):
         event_vocabulary = [{'term': 'neli'}, 
                             {'term': 'kolm neli'},
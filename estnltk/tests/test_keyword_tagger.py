@@ -39,3 +39,14 @@ def test_regex_tagger():
         return_layer=True
     )
     assert [{'start':i['start'], 'end':i['end']} for i in k.tag(text)] == [{'end': 2, 'start': 0}, {'end': 14, 'start': 12}]
+
+
+def test_regex_tagger_threads():
+    text = Text('aa bb cc dd aa bb')
+    regexes = ['a+', '(?P<letter>b)b', 'a', 'c|d']
+    k = RegexTagger(regexes, conflict_resolving_strategy='ALL', return_layer=True)
+    expected = k.tag(text)
+
+    k = RegexTagger(regexes, conflict_resolving_strategy='ALL', return_layer=True, threads=3)
+    assert k.tag(text) == expected
+    assert {'start': 3, 'end': 5, 'regex': '(?P<letter>b)b', 'groups': {'letter': 'b'}} in expected
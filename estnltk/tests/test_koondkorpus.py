@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..core import AA_PATH
+from ..koondkorpus import convert, iterate_documents, read_manifest, shard_name, split_document, MANIFEST_FILE
+from ..koondkorpus import export_store
+from ..corpus_store import CorpusStore
+from ..teicorpus import parse_tei_corpora
+from ..text import Text
+
+
+class KoondkorpusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.start = os.path.join(self.dir, 'koond')
+        self.out = os.path.join(self.dir, 'out')
+        os.makedirs(os.path.join(self.start, 'Tea', 'bin'))
+        os.makedirs(os.path.join(self.start, 'Tea', 'arvutustehnika'))
+        self.files = ['tea_AA_00_1.tasak.xml', 'tea_AA_00_2.tasak.xml', 'tea_AA_00_3.tasak.xml']
+        for fnm in self.files:
+            shutil.copy(os.path.join(AA_PATH, fnm), os.path.join(self.start, 'Tea', 'arvutustehnika'))
+        with open(os.path.join(self.start, 'Tea', 'bin', 'header.xml'), 'w') as f:
+            f.write('<header/>')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def expected_texts(self):
+        return sorted(doc.text for doc in parse_tei_corpora(AA_PATH, 'tea_AA_00_', suffix='.tasak.xml')
+                      if '_00_4' not in doc['file'] and '_00_5' not in doc['file'] and '_00_6' not in doc['file'])
+
+    def test_convert(self):
+        stats = convert(self.start, self.out, processes=2, shards=2, max_sentences=0)
+        self.assertEqual(3, stats['files'])
+        docs = list(iterate_documents(self.out))
+        self.assertEqual(stats['documents'], len(docs))
+        self.assertListEqual(self.expected_texts(), sorted(doc.text for doc in docs))
+        self.assertSetEqual(set(os.path.join('Tea', 'arvutustehnika', fnm) for fnm in self.files),
+                            set(doc['file'] for doc in docs))
+
+    def test_split(self):
+        stats = convert(self.start, self.out, processes=1, shards=2, max_sentences=20)
+        self.assertGreater(stats['split'], 0)
+        docs = list(iterate_documents(self.out))
+        self.assertTrue(all(len(Text(doc.text).sentence_texts) <= 20 for doc in docs if '_text_split_id' in doc))
+
+    def test_split_document(self):
+        doc = {'text': 'Esimene lause. Teine lause. Kolmas lause.', 'title': 'Pealkiri'}
+        parts = split_document(doc, 'fail.xml', max_sentences=2)
+        self.assertListEqual(['Esimene lause. Teine lause.', 'Kolmas lause.'], [part['text'] for part in parts])
+        self.assertListEqual([0, 1], [part['_text_split_id'] for part in parts])
+        self.assertEqual('Pealkiri', parts[1]['title'])
+        self.assertEqual('(28, 41)', parts[1]['_text_split_origin'])
+        self.assertListEqual([doc], split_document(doc, 'fail.xml', max_sentences=3))
+
+    def test_resume(self):
+        convert(self.start, self.out, processes=2, shards=2, max_sentences=0)
+        entries = read_manifest(self.out)
+        # simulate a crash while writing the last file: half of its data and manifest line are on the disk
+        last = entries[-1]
+        with open(os.path.join(self.out, MANIFEST_FILE), 'rb+') as f:
+            f.truncate(os.path.getsize(os.path.join(self.out, MANIFEST_FILE)) - 10)
+        with open(os.path.join(self.out, shard_name(last['shard'])), 'rb+') as f:
+            f.truncate(last['offset'] + last['length'] // 2)
+
+        stats = convert(self.start, self.out, processes=2, shards=2, max_sentences=0)
+        self.assertEqual(1, stats['files'])
+        self.assertEqual(2, stats['skipped'])
+        self.assertEqual(last['file'], read_manifest(self.out)[-1]['file'])
+        self.assertListEqual(self.expected_texts(), sorted(doc.text for doc in iterate_documents(self.out)))
+
+        stats = convert(self.start, self.out, processes=2, shards=2, max_sentences=0)
+        self.assertEqual(0, stats['files'])
+        self.assertRaises(ValueError, convert, self.start, self.out, shards=1)
+
+    def test_export_store(self):
+        convert(self.start, self.out, processes=2, shards=2, max_sentences=0)
+        path = os.path.join(self.dir, 'store')
+        self.assertEqual(len(list(iterate_documents(self.out))), export_store(self.out, path))
+        self.assertListEqual(self.expected_texts(), sorted(doc.text for doc in CorpusStore(path)))
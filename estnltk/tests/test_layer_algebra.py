@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import random
+import unittest
+
+from ..names import START, END
+from ..layer_algebra import union, intersection, difference
+from ..layer_algebra import contains_join, overlaps_join, containing, contained_in, overlapping, nearest
+
+
+def span(start, end):
+    return {START: start, END: end}
+
+
+def positions(layer):
+    return set(i for elem in layer for i in range(elem[START], elem[END]))
+
+
+def random_layer(n):
+    layer = []
+    for _ in range(n):
+        start = random.randint(0, 100)
+        layer.append(span(start, start + random.randint(0, 10)))
+    return layer
+
+
+class SetOperationsTest(unittest.TestCase):
+
+    def test_union(self):
+        self.assertListEqual([span(0, 7), span(9, 12)],
+                             union([span(0, 5), span(9, 12)], [span(3, 7), span(10, 11)]))
+
+    def test_intersection(self):
+        self.assertListEqual([span(3, 5), span(10, 11)],
+                             intersection([span(0, 5), span(9, 12)], [span(3, 7), span(10, 11)]))
+
+    def test_difference(self):
+        self.assertListEqual([span(0, 3), span(9, 10), span(11, 12)],
+                             difference([span(0, 5), span(9, 12)], [span(3, 7), span(10, 11)]))
+
+    def test_random(self):
+        random.seed(0)
+        for _ in range(50):
+            a, b = random_layer(random.randint(0, 20)), random_layer(random.randint(0, 20))
+            self.assertEqual(positions(a) | positions(b), positions(union(a, b)))
+            self.assertEqual(positions(a) & positions(b), positions(intersection(a, b)))
+            self.assertEqual(positions(a) - positions(b), positions(difference(a, b)))
+
+
+class JoinTest(unittest.TestCase):
+
+    def test_contains_join(self):
+        outer = [span(0, 10), span(20, 30)]
+        inner = [span(25, 27), span(2, 4), span(8, 12)]
+        self.assertListEqual([(outer[0], inner[1]), (outer[1], inner[0])], contains_join(outer, inner))
+        self.assertListEqual(outer, containing(outer, inner))
+        self.assertListEqual([inner[0], inner[1]], contained_in(inner, outer))
+
+    def test_overlaps_join(self):
+        a = [span(0, 10), span(20, 30)]
+        b = [span(10, 12), span(8, 21), span(5, 5)]
+        self.assertListEqual([(a[0], b[1]), (a[1], b[1])], overlaps_join(a, b))
+        self.assertListEqual(a, overlapping(a, b))
+
+    def test_joins_random(self):
+        random.seed(1)
+        for _ in range(50):
+            a, b = random_layer(random.randint(0, 20)), random_layer(random.randint(0, 20))
+            expected = [(x, y) for x in a for y in b if x[START] <= y[START] and y[END] <= x[END]]
+            self.assertListEqual(expected, contains_join(a, b))
+            expected = [(x, y) for x in a for y in b if max(x[START], y[START]) < min(x[END], y[END])]
+            self.assertListEqual(expected, overlaps_join(a, b))
+
+    def test_nearest(self):
+        a = [span(0, 2), span(10, 12), span(30, 31)]
+        b = [span(4, 6), span(11, 15), span(20, 25)]
+        self.assertListEqual([(a[0], b[0], 2), (a[1], b[1], 0), (a[2], b[2], 5)], nearest(a, b))
+        self.assertListEqual([(a[0], None, None)], nearest(a[:1], []))
+
+    def test_nearest_random(self):
+        random.seed(2)
+        for _ in range(50):
+            a, b = random_layer(random.randint(0, 20)), random_layer(random.randint(1, 20))
+            for x, y, distance in nearest(a, b):
+                self.assertEqual(distance, max(0, y[START] - x[END], x[START] - y[END]))
+                self.assertEqual(distance, min(max(0, z[START] - x[END], x[START] - z[END]) for z in b))
+
+    def test_multispans(self):
+        self.assertRaises(ValueError, union, [{START: [0, 5], END: [2, 7]}], [])
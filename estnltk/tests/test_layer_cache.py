@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..layer_cache import LayerCache
+from ..names import *
+from ..text import Text
+
+
+class CountingTimexTagger(object):
+
+    def __init__(self):
+        self.calls = 0
+
+    def tag_document(self, document, **kwargs):
+        self.calls += 1
+        document[CREATION_DATE] = kwargs['creation_date'].strftime('%Y-%m-%dT%H:%M')
+        document[TIMEXES] = [{START: 0, END: 4, TMX_VALUE: '2016-05-09'}]
+        return document
+
+
+class LayerCacheTest(unittest.TestCase):
+
+    text = 'Eile käisin koolis. Täna olen kodus.'
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = LayerCache(os.path.join(self.dir, 'layers.db'))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.dir)
+
+    def test_analysis(self):
+        expected = Text(self.text).tag_analysis()
+        first = Text(self.text, layer_cache=self.cache).tag_analysis()
+        second = Text(self.text, layer_cache=self.cache).tag_analysis()
+        self.assertDictEqual(expected, first)
+        self.assertDictEqual(expected, second)
+        self.assertEqual(1, self.cache.stats[ANALYSIS]['hits'])
+        self.assertEqual(1, self.cache.stats[ANALYSIS]['misses'])
+        self.assertEqual(0.5, self.cache.stats[ANALYSIS]['hit_rate'])
+
+        # a different text and different arguments have different keys
+        Text(self.text + ' ', layer_cache=self.cache).tag_analysis()
+        Text(self.text, layer_cache=self.cache, disambiguate=False).tag_analysis()
+        self.assertEqual(3, self.cache.stats[ANALYSIS]['misses'])
+        self.assertEqual(3, len(self.cache))
+
+    def test_persistence(self):
+        Text(self.text, layer_cache=self.cache).tag_analysis()
+        self.cache.close()
+        self.cache = LayerCache(os.path.join(self.dir, 'layers.db'))
+        self.assertEqual(1, len(self.cache))
+        self.assertGreater(self.cache.size, 0)
+        Text(self.text, layer_cache=self.cache).tag_analysis()
+        self.assertEqual(1, self.cache.stats[ANALYSIS]['hits'])
+
+    def test_timexes(self):
+        tagger = CountingTimexTagger()
+        kwargs = {'layer_cache': self.cache, 'timex_tagger': tagger, 'creation_date': datetime.datetime(2016, 5, 10)}
+        first = Text(self.text, **kwargs).tag_timexes()
+        second = Text(self.text, **kwargs)
+        second.tag_timexes()
+        self.assertEqual(1, tagger.calls)
+        self.assertListEqual(first[TIMEXES], second[TIMEXES])
+        self.assertEqual('2016-05-10T00:00', second[CREATION_DATE])
+        # the morphological analysis was not needed
+        self.assertFalse(second.is_tagged(ANALYSIS))
+
+        kwargs['creation_date'] = datetime.datetime(2016, 5, 11)
+        Text(self.text, **kwargs).tag_timexes()
+        self.assertEqual(2, tagger.calls)
+
+    def test_eviction(self):
+        Text(self.text, layer_cache=self.cache).tag_analysis()
+        size = self.cache.size
+        self.cache.max_size = size * 2
+        for i in range(5):
+            Text(self.text + ' ' * (i + 1), layer_cache=self.cache).tag_analysis()
+        self.assertLessEqual(self.cache.size, size * 2)
+        self.assertEqual(2, len(self.cache))
+        # the least recently used layers were removed
+        Text(self.text, layer_cache=self.cache).tag_analysis()
+        self.assertEqual(0, self.cache.stats[ANALYSIS]['hits'])
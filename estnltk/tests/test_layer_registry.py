@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import datetime
+import threading
+import time
+import unittest
+
+from ..layer_registry import plan
+from ..names import *
+from ..syntax.parsers import VISLCG3Parser
+from ..text import Text
+
+
+class SlowTagger(object):
+    """Stands in for the JVM and CRFSuite taggers: records the overlapping calls."""
+
+    def __init__(self, state, delay=0.3):
+        self.state = state
+        self.delay = delay
+
+    def enter(self):
+        with self.state['lock']:
+            self.state['active'] += 1
+            self.state['max_active'] = max(self.state['max_active'], self.state['active'])
+        time.sleep(self.delay)
+        with self.state['lock']:
+            self.state['active'] -= 1
+
+
+class TimexTagger(SlowTagger):
+
+    def tag_document(self, document, **kwargs):
+        self.enter()
+        document[CREATION_DATE] = kwargs['creation_date'].strftime('%Y-%m-%dT%H:%M')
+        document[TIMEXES] = [{START: 0, END: 4, TMX_VALUE: '2016-05-09'}]
+        return document
+
+
+class NerTagger(SlowTagger):
+
+    def tag_document(self, document):
+        self.enter()
+        for word in document[WORDS]:
+            word[LABEL] = 'B-LOC' if word[TEXT][0].isupper() else 'O'
+        return document
+
+
+class ClauseSegmenter(SlowTagger):
+
+    def tag(self, text):
+        self.enter()
+        for word in text[WORDS]:
+            word[CLAUSE_ANNOTATION] = None
+            word[CLAUSE_IDX] = 0
+        return text
+
+
+class SyntacticParser(VISLCG3Parser, SlowTagger):
+    """Stands in for VISLCG3: records the arguments and the analyses of the words it parses."""
+
+    def __init__(self, state, delay=0.3):
+        SlowTagger.__init__(self, state, delay)
+
+    def parse_text(self, text, **kwargs):
+        self.enter()
+        self.state['kwargs'] = dict(kwargs)
+        text[LAYER_VISLCG3] = [{START: word[START], END: word[END], 'analyses': len(word[ANALYSIS])}
+                               for word in text[WORDS]]
+        return text
+
+
+class TagLayersTest(unittest.TestCase):
+
+    def text(self, state):
+        return Text('Eile käisin Tartus. Täna olen kodus.', creation_date=datetime.datetime(2016, 5, 10),
+                    timex_tagger=TimexTagger(state), ner_tagger=NerTagger(state),
+                    clause_segmenter=ClauseSegmenter(state))
+
+    def state(self):
+        return {'lock': threading.Lock(), 'active': 0, 'max_active': 0}
+
+    def test_plan(self):
+        text = Text('Eile käisin Tartus.')
+        self.assertListEqual([PARAGRAPHS, SENTENCES, WORDS, ANALYSIS, TIMEXES, LABEL, NAMED_ENTITIES],
+                             plan(text, [TIMEXES, NAMED_ENTITIES]))
+        text.tag_analysis()
+        self.assertListEqual([CLAUSE_ANNOTATION, CLAUSES], plan(text, [CLAUSES, ANALYSIS]))
+        self.assertRaises(ValueError, plan, text, ['unknown'])
+
+    def test_concurrent(self):
+        state = self.state()
+        start = time.time()
+        text = self.text(state).tag_layers([TIMEXES, NAMED_ENTITIES, CLAUSES])
+        elapsed = time.time() - start
+        self.assertEqual(3, state['max_active'])
+
+        sequential_state = self.state()
+        expected = self.text(sequential_state).tag_timexes().tag_named_entities().tag_clauses()
+        self.assertEqual(1, sequential_state['max_active'])
+        self.assertDictEqual(expected, text)
+        self.assertLess(elapsed, 0.9)
+
+    def test_sequential(self):
+        state = self.state()
+        self.text(state).tag_layers([TIMEXES, NAMED_ENTITIES, CLAUSES], concurrent=False)
+        self.assertEqual(1, state['max_active'])
+
+    def test_error(self):
+        # the error of a concurrent tagger is raised, after the other taggers have finished
+        state = self.state()
+        text = Text('Eile käisin Tartus.', creation_date=datetime.datetime(2016, 5, 10),
+                    timex_tagger=TimexTagger(state), ner_tagger=object())
+        self.assertRaises(AttributeError, text.tag_layers, [TIMEXES, LABEL])
+        self.assertEqual(0, state['active'])
+
+    def test_layer_tagger_mapping(self):
+        mapping = Text('Tere').layer_tagger_mapping
+        self.assertEqual('tag_syntax_maltparser', mapping[LAYER_CONLL].__name__)
+        self.assertEqual('tag_syntax_vislcg3', mapping[LAYER_VISLCG3].__name__)
+
+    def test_syntax(self):
+        # the syntax layer is tagged concurrently with the named entity labels, on the same analysis as the text
+        state = self.state()
+        parser = SyntacticParser(state)
+        text = Text('Eile käisin Tartus. Täna olen kodus.', ner_tagger=NerTagger(state), syntactic_parser=parser)
+        text.tag_layers([LAYER_VISLCG3, LABEL])
+        self.assertEqual(2, state['max_active'])
+        self.assertFalse(state['kwargs']['disambiguate'])
+        self.assertFalse(text.get_kwargs()['disambiguate'])
+        self.assertIs(parser, text._Text__syntactic_parser)
+        self.assertListEqual([len(word[ANALYSIS]) for word in text[WORDS]],
+                             [element['analyses'] for element in text[LAYER_VISLCG3]])
+        self.assertTrue(any(len(word[ANALYSIS]) > 1 for word in text[WORDS]))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import pickle
+import unittest
+from copy import deepcopy
+
+from ..names import *
+from ..text import Text
+
+
+class LayerVersionsTest(unittest.TestCase):
+
+    def test_versions(self):
+        text = Text('Esimene lause. Teine lause.')
+        self.assertEqual(1, text.layer_version(TEXT))
+        self.assertEqual(0, text.layer_version(WORDS))
+        text.tokenize_words()
+        self.assertEqual(1, text.layer_version(WORDS))
+        text.tag_analysis()
+        self.assertEqual(1, text.layer_version(ANALYSIS))
+        del text[WORDS]
+        self.assertEqual(2, text.layer_version(WORDS))
+        text.pop(SENTENCES)
+        text.update({SENTENCES: []})
+        self.assertEqual(3, text.layer_version(SENTENCES))
+
+    def test_memoized(self):
+        text = Text('Esimene lause. Teine lause.')
+        self.assertIs(text.word_texts, text.word_texts)
+        self.assertIs(text.lemmas, text.lemmas)
+
+    def test_retokenization(self):
+        text = Text('Esimene lause. Teine lause.')
+        self.assertListEqual(['Esimene lause.', 'Teine lause.'], text.sentence_texts)
+        self.assertEqual(6, len(text.word_texts))
+        text[SENTENCES] = [{START: 0, END: 27}]
+        text.tokenize_words()
+        self.assertListEqual(['Esimene lause. Teine lause.'], text.sentence_texts)
+        self.assertListEqual([(0, 27)], text.sentence_spans)
+
+    def test_retagging(self):
+        text = Text('Esimene lause.')
+        lemmas = text.lemmas
+        spans = text.word_spans
+        for word in text[WORDS]:
+            word[ANALYSIS] = [dict(analysis, lemma=analysis[LEMMA].upper()) for analysis in word[ANALYSIS]]
+        # in place modifications are not seen, until the version is incremented
+        self.assertIs(lemmas, text.lemmas)
+        text.touch_layer(ANALYSIS)
+        self.assertListEqual(['ESIMENE', 'LAUSE', '.'], text.lemmas)
+        # the properties of other layers are not recomputed
+        self.assertIs(spans, text.word_spans)
+        text.tag_analysis()
+        self.assertListEqual(lemmas, text.lemmas)
+
+    def test_copy(self):
+        text = Text('Esimene lause.')
+        lemmas = text.lemmas
+        for copy in (deepcopy(text), pickle.loads(pickle.dumps(text))):
+            self.assertDictEqual(text, copy)
+            self.assertListEqual(lemmas, copy.lemmas)
+            copy.tag_analysis()
+            self.assertListEqual(lemmas, copy.lemmas)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+
+from ..names import *
+from ..text import Text
+from ..database.elastic.query_grammar import Grammar, Word
+
+
+class AnnotateTest(unittest.TestCase):
+
+    def annotate(self, root):
+        text = Text('Kass sõi kala. Koer sõi kassi.')
+        Grammar(root).annotate(text, 'matches')
+        return [match['start'] for match in text['matches']]
+
+    def test_word(self):
+        self.assertListEqual([0, 24], self.annotate(Word(lemma='kass')))
+        self.assertListEqual([5, 20], self.annotate(Word(lemma='sööma', partofspeech='V')))
+        self.assertListEqual([], self.annotate(Word(lemma='sööma', partofspeech='S')))
+        self.assertListEqual([0, 9, 15, 24], self.annotate(Word(partofspeech='S')))
+
+    def test_or(self):
+        self.assertListEqual([0, 15, 24], self.annotate(Word(lemma='kass') | Word(lemma='koer')))
+
+    def test_and(self):
+        self.assertListEqual([0, 15, 24], self.annotate(Word(lemma='kass') & Word(lemma='koer')))
+        self.assertListEqual([], self.annotate(Word(lemma='kass') & Word(lemma='hobune')))
+        self.assertListEqual([5, 9, 20], self.annotate((Word(lemma='hobune') & Word(lemma='kass')) |
+                                                       (Word(lemma='kala') & Word(lemma='sööma'))))
+
+    def test_analyses(self):
+        # the parameters must hold in the same analysis
+        text = Text({TEXT: 'tee', WORDS: [{START: 0, END: 3, TEXT: 'tee', ANALYSIS: [
+            {LEMMA: 'tee', POSTAG: 'S', FORM: 'sg n'},
+            {LEMMA: 'tegema', POSTAG: 'V', FORM: 'o'}]}]})
+        for root, expected in [(Word(lemma='tee', partofspeech='S'), [0]),
+                               (Word(lemma='tegema', partofspeech='V'), [0]),
+                               (Word(lemma='tee', partofspeech='V'), []),
+                               (Word(lemma=['tee', 'tegema'], form='o'), [0]),
+                               (Word(lemma='tee', form=['o', 'sg g']), [])]:
+            Grammar(root).annotate(text, 'matches')
+            self.assertListEqual(expected, [match[START] for match in text['matches']])
@@ -84,3 +84,34 @@ class Tests(unittest.TestCase):
         self.assertTrue(element_positions.overlapping_left({'start': 10, 'end': 20}, {'start': 9, 'end': 15}))
         self.assertTrue(element_positions.overlapping_left({'start': 15, 'end': 20}, {'start': 10, 'end': 16}))
         self.assertFalse(element_positions.overlapping_left({'start': 10, 'end': 20}, {'start': 10, 'end': 19}))
+
+    def test_iterate_intersecting_pairs(self):
+        a = {'start': 0, 'end': 10}
+        b = {'start': 5, 'end': 15}
+        c = {'start': 15, 'end': 20}
+        d = {'start': 0, 'end': 3}
+        pairs = list(element_positions.iterate_intersecting_pairs([a, b, c, d]))
+        self.assertEqual(2, len(pairs))
+        self.assertIs(a, pairs[0][0])
+        self.assertIs(b, pairs[0][1])
+        self.assertIs(a, pairs[1][0])
+        self.assertIs(d, pairs[1][1])
+
+    def test_make_layer_nonconflicting(self):
+        layer = [{'start': 0, 'end': 10}, {'start': 5, 'end': 15}, {'start': 20, 'end': 30}, {'start': 22, 'end': 25}]
+        element_positions.make_layer_nonconflicting(layer, element_positions.discard)
+        self.assertListEqual([(0, 5), (5, 10), (10, 15), (20, 22), (22, 25), (25, 30)],
+                             sorted((e['start'], e['end']) for e in layer))
+
+    def test_make_layer_nonconflicting_merge(self):
+        calls = []
+
+        def concatenate(a, b, value):
+            calls.append(value)
+            return {'v': a['v'] + '+' + b['v']}
+
+        layer = [{'start': 0, 'end': 10, 'v': 'A'}, {'start': 5, 'end': 15, 'v': 'B'}]
+        element_positions.make_layer_nonconflicting(layer, concatenate)
+        self.assertListEqual([(0, 5, 'A'), (5, 10, 'A+B'), (10, 15, 'B')],
+                             sorted((e['start'], e['end'], e['v']) for e in layer))
+        self.assertListEqual(['overlapping_right'], calls)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from ..database.sql import lemmatize, lemmatize_table
+
+
+class LemmatizeTableTest(unittest.TestCase):
+
+    texts = ['Kirjakeel koosneb sõnadest.', 'Tere maailm!', '', None, 'Kohver viidi Venemaale.'] * 5
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.conn = sqlite3.connect(os.path.join(self.dir, 'test.db'))
+        self.conn.execute('create table lemmatize (id integer primary key, text text, lemmatized text)')
+        self.conn.executemany('insert into lemmatize (id, text) values (?, ?)', enumerate(self.texts))
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.dir)
+
+    def lemmatized(self):
+        return [row[0] for row in self.conn.execute('select lemmatized from lemmatize order by id')]
+
+    def test_lemmatize_table(self):
+        stats = lemmatize_table(self.conn, 'lemmatize', 'text', 'lemmatized', processes=2, read_size=4,
+                                write_size=3, commit_every=5, chunksize=2)
+        self.assertEqual(len(self.texts), stats['rows'])
+        self.assertListEqual([lemmatize(text) for text in self.texts], self.lemmatized())
+        self.assertEqual('kirjakeel koosnema sõna .', self.lemmatized()[0])
+
+    def test_resume(self):
+        self.conn.execute("update lemmatize set lemmatized='valmis' where id < 10")
+        self.conn.commit()
+        stats = lemmatize_table(self.conn, 'lemmatize', 'text', 'lemmatized', processes=1, read_size=7)
+        self.assertEqual(len(self.texts) - 10, stats['rows'])
+        self.assertListEqual(['valmis'] * 10 + [lemmatize(text) for text in self.texts[10:]], self.lemmatized())
+        self.assertEqual(0, lemmatize_table(self.conn, 'lemmatize', 'text', 'lemmatized', processes=1)['rows'])
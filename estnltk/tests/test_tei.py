@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function, absolute_import
 
-from ..teicorpus import parse_tei_corpora
+from ..teicorpus import parse_tei_corpora, iterate_tei_corpora, iterate_tei_documents, _RecodedFile
 from ..core import AA_PATH
 
+import io
+import os
+import tempfile
 import unittest
 
 
@@ -12,3 +15,51 @@ class TeiTest(unittest.TestCase):
     def test_parse_tei(self):
         docs = parse_tei_corpora(AA_PATH, 'tea_AA_00')
         self.assertEqual(53, len(docs))
+
+    def test_iterate_tei_processes(self):
+        docs = parse_tei_corpora(AA_PATH, 'tea_AA_00')
+        self.assertListEqual(docs, list(iterate_tei_corpora(AA_PATH, 'tea_AA_00', processes=2)))
+
+
+TEI = '''<teiCorpus xmlns="http://www.tei-c.org/ns/1.0"><TEI><teiHeader><title> Pealkiri </title></teiHeader>
+<text><body>
+<div1 type="ajaleht"><head>Postimees <hi>1999</hi></head>
+ <div2 type="rubriik"> Uudised
+  <div3 type="artikkel"><head>Esimene</head><p><s>Üks <hi rend="x">kaks</hi> .</s><s> </s></p>
+   <p><bibl><author><s>Autor Nimi</s></author></bibl></p></div3>
+ </div2>
+ <div2 type="artikkel"><head>Teine</head><p><s>Kolm .</s></p><div3 type="artikkel"><head>Sees</head><p><s>Neli .</s></p></div3></div2>
+</div1>
+</body></text></TEI></teiCorpus>
+'''
+
+
+class TeiDocumentsTest(unittest.TestCase):
+
+    def test_iterate_tei_documents(self):
+        handle, path = tempfile.mkstemp(suffix='.xml')
+        with os.fdopen(handle, 'wb') as f:
+            f.write(TEI.encode('utf-8'))
+        try:
+            docs = list(iterate_tei_documents(path))
+            self.assertListEqual(docs, list(iterate_tei_documents(path, encoding='utf-8')))
+        finally:
+            os.remove(path)
+        self.assertListEqual([
+            {'type': 'artikkel', 'title': 'Esimene', 'author': 'Autor Nimi', 'ajaleht': 'Postimees',
+             'rubriik': 'Uudised', 'text': 'Üks kaks .\n\nAutor Nimi'},
+            {'type': 'artikkel', 'title': 'Teine', 'ajaleht': 'Postimees', 'text': 'Kolm .\n\nNeli .'}
+        ], docs)
+
+    def test_recoded_file(self):
+        # the file is decoded a chunk at a time, the declaration with the original encoding is removed
+        data = ('<?xml version="1.0" encoding="iso-8859-1"?>' + TEI).encode('iso-8859-1')
+        f = _RecodedFile(io.BytesIO(data), 'iso-8859-1', chunk_size=7)
+        self.assertEqual(TEI.encode('utf-8'), b''.join(iter(lambda: f.read(5), b'')))
+        handle, path = tempfile.mkstemp(suffix='.xml')
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        try:
+            self.assertEqual(2, len(list(iterate_tei_documents(path, encoding='iso-8859-1'))))
+        finally:
+            os.remove(path)
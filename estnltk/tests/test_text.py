@@ -5,6 +5,7 @@ import unittest
 
 from ..text import Text
 from ..names import *
+from ..dividing import divide
 from pprint import pprint
 
 import datetime
@@ -62,6 +63,16 @@ class TokenizationTest(unittest.TestCase):
                 self.assertFalse(s < sentence_end < e )
 
 
+class WordIndexRangeTest(unittest.TestCase):
+
+    def test_word_index_range(self):
+        text = Text('Harva esineb peavalu')
+        self.assertEqual((0, 1), text.word_index_range(0, 5))
+        self.assertEqual((0, 2), text.word_index_range(2, 9))
+        self.assertEqual((1, 2), text.word_index_range(12, 12))
+        self.assertEqual((2, 3), text.word_index_range(13, 20))
+
+
 class TextSplittingTest(unittest.TestCase):
 
     def test_split_by_sentences(self):
@@ -126,6 +137,28 @@ class TextDivideTest(unittest.TestCase):
         divisions[2][1]['text'] = 'LAUSE'
         self.assertEqual(text.words[7]['text'], 'LAUSE')
 
+    def test_memoized_index(self):
+        text = self.text
+        index = text.division_index()
+        self.assertIs(index, text.division_index())
+        self.assertListEqual([(0, 3), (3, 6), (6, 9)], [text.sentence_word_range(i) for i in range(3)])
+        text[SENTENCES] = [{START: 0, END: 27}, {START: 28, END: 41}]
+        self.assertIsNot(index, text.division_index())
+        self.assertListEqual([(0, 6), (6, 9)], [text.sentence_word_range(i) for i in range(2)])
+        self.assertListEqual(divide(text.words, text.sentences), text.divide())
+
+    def test_divide_gaps(self):
+        text = Text('Esimene lause. Teine lause. Kolmas lause!').tokenize_words()
+        text['marks'] = [{START: 0, END: 13}, {START: 15, END: 15}, {START: 28, END: 34}, {START: 39, END: 41}]
+        expected = divide(text.words, text['marks'])
+        self.assertListEqual(expected, text.divide(WORDS, 'marks'))
+        self.assertListEqual([(0, 2), (2, 2), (6, 7), (8, 9)], [text.division_index(WORDS, 'marks').range(i)
+                                                                 for i in range(4)])
+        # multispans are divided as before
+        text['multi'] = [{START: [0, 28], END: [7, 34]}]
+        self.assertIsNone(text.division_index('multi', SENTENCES))
+        self.assertListEqual(divide(text['multi'], text.sentences), text.divide('multi', SENTENCES))
+
     @property
     def text(self):
         return Text('Esimene lause. Teine lause. Kolmas lause!')
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+
+from ..names import *
+from ..text import Text
+
+
+class TextViewTest(unittest.TestCase):
+
+    def text(self):
+        text = Text('Esimene lause on siin. Teine lause tuleb nüüd.\n\nKolmas lause.')
+        text['multi'] = [{START: [0, 23], END: [7, 28]}, {START: [8, 29], END: [13, 34]}]
+        return text.tag_analysis()
+
+    def test_same_as_split(self):
+        text = self.text()
+        for piece, view in zip(text.split_by_sentences(), text.view_by_sentences()):
+            self.assertEqual(piece.text, view.text)
+            self.assertEqual(piece.words, view.words)
+            self.assertEqual(piece.word_spans, view.word_spans)
+            self.assertEqual(piece.lemmas, view.lemmas)
+            self.assertEqual(piece['multi'], view['multi'])
+            self.assertEqual(dict(piece), view.to_dict())
+
+    def test_given_spans(self):
+        text = self.text()
+        view = text.view_given_spans([(6, 22), (23, 46)])[1]
+        self.assertEqual('Teine lause tuleb nüüd.', view.text)
+        self.assertListEqual(['Teine', 'lause', 'tuleb', 'nüüd', '.'], view.word_texts)
+        self.assertListEqual([([0], [5]), ([6], [11])], view.spans('multi'))
+        self.assertEqual(23, view.start)
+        self.assertIs(text, view.parent)
+
+    def test_references_parent(self):
+        text = self.text()
+        view = text.view_by_sentences()[0]
+        self.assertIs(text.words[0][ANALYSIS], view.words[0][ANALYSIS])
+        with self.assertRaises(TypeError):
+            view[WORDS] = []
+
+    def test_tags_parent(self):
+        text = Text('Esimene lause. Teine lause.')
+        view = text.view_by_sentences()[1]
+        self.assertListEqual(['teine', 'lause', '.'], view.lemmas)
+        self.assertTrue(text.is_tagged(ANALYSIS))
+
+    def test_parent_changes(self):
+        text = self.text()
+        view = text.view_by_sentences()[0]
+        self.assertEqual(5, len(view.words))
+        text[WORDS] = text[WORDS][1:]
+        self.assertEqual(4, len(view.words))
+        self.assertEqual('lause', view.word_texts[0])
+
+    def test_empty_window(self):
+        text = self.text()
+        view = text.view_given_spans([(22, 23)])[0]
+        self.assertEqual(0, len(view.words))
+        self.assertListEqual([], view.lemmas)
+
+    def test_multispan_window(self):
+        text = self.text()
+        with self.assertRaises(ValueError):
+            text.view_by('multi')
@@ -4,3 +4,6 @@ from __future__ import unicode_literals, print_function, absolute_import
 
 from ..wiki.tests.test_j2text import *
 from ..wiki.tests.test_parser import *
+from ..wiki.tests.test_shards import *
+from ..wiki.tests.test_multistream import *
+from ..wiki.tests.test_cleaner import *
@@ -10,7 +10,7 @@ from __future__ import unicode_literals, print_function, absolute_import
 from .core import as_unicode, POSTAG_DESCRIPTIONS, CASES, PLURALITY, VERB_TYPES
 from .core import VERB_CHAIN_RES_PATH
 from .names import *
-from .dividing import divide, divide_by_spans
+from .dividing import divide, divide_by_spans, division_index
 from .vabamorf import morf as vabamorf
 from .ner import NerTagger
 from .timex import TimexTagger
@@ -19,33 +19,33 @@ from .clausesegmenter import ClauseSegmenter
 from .mw_verbs.verbchain_detector import VerbChainDetector
 from .textcleaner import TextCleaner
 from .tokenizers import EstWordTokenizer
+from .tokenizers.fused_tokenizer import tokenize_layers
+from .tokenizers.sentence_fitting import fit_sentences
+from .tokenizers.sentence_tokenizers import PunktTokenizer, get_sentence_tokenizer
 from .syntax import MaltParser, VISLCG3Parser, build_trees_from_text
+from .layer_cache import cached_layer
+from .layer_registry import LAYERS, tag_layers
+from .layer_versions import layer_property, layer_versions, touch, VALUES
+from .editing import apply_edits
+from .text_view import views
 
 import six
 import pandas
-import nltk.data
 import regex as re
 from nltk.tokenize.regexp import RegexpTokenizer
 
 from cached_property import cached_property
 from copy import deepcopy
 from collections import defaultdict
+from bisect import bisect_left, bisect_right
 from pprint import pprint
 
 
 # default functionality
 paragraph_tokenizer = RegexpTokenizer('\n\n', gaps=True, discard_empty=True)
 
-# use NLTK-s sentence tokenizer for Estonian, in case it is not downloaded, try to download it first
-sentence_tokenizer = None
-try:
-    sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
-except LookupError:
-    import nltk.downloader
-    nltk.downloader.download('punkt')
-finally:
-    if sentence_tokenizer is None:
-        sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
+# use NLTK-s sentence tokenizer for Estonian, the model is loaded (and downloaded, if missing) when it is first used
+sentence_tokenizer = PunktTokenizer()
 
 word_tokenizer = EstWordTokenizer()
 nertagger = None
@@ -108,8 +108,9 @@ class Text(dict):
             However, it does not create a deep copy.
         paragraph_tokenizer: nltk.tokenize.api.StringTokenizer
             Tokenizer for paragraphs.
-        sentence_tokenizer: nltk.tokenize.api.StringTokenizer
-            Tokenizer for sentences.
+        sentence_tokenizer: nltk.tokenize.api.StringTokenizer or str
+            Tokenizer for sentences or the name of a backend: "punkt" (default), "estnltk" or "koond".
+            See :py:mod:`estnltk.tokenizers.sentence_tokenizers`.
         word_tokenizer: nltk.tokenize.api.StringTokenizer
             Tokenizer for words.
         ner_tagger: estnltk.ner.NerTagger
@@ -128,6 +129,8 @@ class Text(dict):
             TextCleaner class.
         syntactic_parser: estnltk.syntax.parsers.MaltParser|estnltk.syntax.parsers.VISLCG3Parser
             Either VISLCG3 based syntactic analyser or MaltParser.
+        layer_cache: estnltk.layer_cache.LayerCache
+            Cache of the morphological analysis, named entity labels, timexes, clause annotations and verb chains.
         """
         encoding = kwargs.get('encoding', 'utf-8')
         if isinstance(text_or_instance, dict):
@@ -142,8 +145,8 @@ class Text(dict):
     def __load_functionality(self, **kwargs):
         self.__paragraph_tokenizer = kwargs.get(
             'paragraph_tokenizer', paragraph_tokenizer)
-        self.__sentence_tokenizer = kwargs.get(
-            'sentence_tokenizer', sentence_tokenizer)
+        self.__sentence_tokenizer = get_sentence_tokenizer(kwargs.get(
+            'sentence_tokenizer', sentence_tokenizer))
         self.__word_tokenizer = kwargs.get(
             'word_tokenizer', word_tokenizer)
         self.__ner_tagger = kwargs.get( # ner models take time to load, load only when needed
@@ -192,9 +195,96 @@ class Text(dict):
             return layer in self
         return False  # do not remove False
 
+    # ///////////////////////////////////////////////////////////////////
+    # LAYER VERSIONS
+    # ///////////////////////////////////////////////////////////////////
+
+    def __setitem__(self, key, value):
+        super(Text, self).__setitem__(key, value)
+        touch(self, key)
+
+    def __delitem__(self, key):
+        super(Text, self).__delitem__(key)
+        touch(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *args):
+        if key in self:
+            touch(self, key)
+        return super(Text, self).pop(key, *args)
+
+    def popitem(self):
+        key, value = super(Text, self).popitem()
+        touch(self, key)
+        return key, value
+
+    def clear(self):
+        for key in list(self.keys()):
+            touch(self, key)
+        super(Text, self).clear()
+
+    def layer_version(self, layer):
+        """The version of the layer, it is incremented every time the layer is assigned or re-tagged."""
+        return layer_versions(self).get(layer, 0)
+
+    def touch_layer(self, layer):
+        """Increment the version of the layer after modifying its elements in place.
+
+        The properties computed from the layer (for example, ``lemmas`` from ``analysis``) are computed
+        again, when they are accessed next time.
+        """
+        touch(self, layer)
+
+    def invalidate_cached_properties(self):
+        """Remove the computed values of the cached properties, they are computed again when accessed."""
+        self.__dict__.pop(VALUES, None)
+        self.__dict__.pop('_division_indices', None)
+
+    def apply_edits(self, edits):
+        """Replace character ranges of the text and re-annotate only the changed paragraphs.
+
+        See :py:mod:`estnltk.editing` for details.
+
+        Parameters
+        ----------
+        edits: list of (int, int, str)
+            Non-overlapping (start, end, replacement) triples, the positions are in the current text.
+
+        Returns
+        -------
+        list of str
+            The document level layers (named entities, timexes) that were removed and must be tagged again,
+            for example with :py:meth:`~estnltk.text.Text.tag_layers`.
+        """
+        return apply_edits(self, edits)
+
     def tag_all(self):
         """Tag all layers."""
-        return self.tag_timexes().tag_named_entities().tag_verb_chains()
+        return self.tag_layers([TIMEXES, NAMED_ENTITIES, VERB_CHAINS])
+
+    def tag_layers(self, layers, concurrent=True):
+        """Tag the given layers and the layers they depend on.
+
+        The layers that are already tagged are not tagged again. The taggers of the layers that do not depend on
+        each other, for example timexes, clauses and named entities, run at the same time on separate threads.
+        See :py:mod:`estnltk.layer_registry` for the dependencies of the layers.
+
+        Parameters
+        ----------
+        layers: list of str
+            The names of the layers, for example ``[TIMEXES, NAMED_ENTITIES]``.
+        concurrent: bool
+            Run the independent taggers at the same time (default: True).
+        """
+        return tag_layers(self, layers, concurrent)
 
     def texts(self, layer, sep=' '):
         """Retrieve texts for given layer.
@@ -337,7 +427,7 @@ class Text(dict):
     # RETRIEVING AND COMPUTING PROPERTIES
     # ///////////////////////////////////////////////////////////////////
 
-    @cached_property
+    @layer_property(TEXT)
     def text(self):
         """The raw underlying text that was used to initialize the Text instance."""
         return self[TEXT]
@@ -345,19 +435,7 @@ class Text(dict):
     @cached_property
     def layer_tagger_mapping(self):
         """Dictionary that maps layer names to taggers that can create that layer."""
-        return {
-            PARAGRAPHS: self.tokenize_paragraphs,
-            SENTENCES: self.tokenize_sentences,
-            WORDS: self.tokenize_words,
-            ANALYSIS: self.tag_analysis,
-            TIMEXES: self.tag_timexes,
-            NAMED_ENTITIES: self.tag_named_entities,
-            CLAUSE_ANNOTATION: self.tag_clause_annotations,
-            CLAUSES: self.tag_clauses,
-            LAYER_CONLL:   self.tag_syntax_vislcg3,
-            LAYER_VISLCG3: self.tag_syntax_maltparser,
-            WORDNET: self.tag_wordnet
-        }
+        return dict((layer, getattr(self, spec[0])) for layer, spec in LAYERS.items())
 
     def tag(self, layer):
         """Tag the annotations of given layer. It can automatically tag any built-in layer type."""
@@ -376,35 +454,35 @@ class Text(dict):
         self[PARAGRAPHS] = dicts
         return self
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraphs(self):
         """Return the list of ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self[PARAGRAPHS]
 
-    @cached_property
+    @layer_property(TEXT, PARAGRAPHS)
     def paragraph_texts(self):
         """The list of texts representing ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self.texts(PARAGRAPHS)
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraph_spans(self):
         """The list of spans representing ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self.spans(PARAGRAPHS)
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraph_starts(self):
         """The start positions of ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         return self.starts(PARAGRAPHS)
 
-    @cached_property
+    @layer_property(PARAGRAPHS)
     def paragraph_ends(self):
         """The end positions of ``paragraphs`` layer elements."""
         if not self.is_tagged(PARAGRAPHS):
@@ -420,94 +498,53 @@ class Text(dict):
         if not self.is_tagged(PARAGRAPHS):
             self.tokenize_paragraphs()
         tok  = self.__sentence_tokenizer
+        if self.is_tagged(WORDS):
+            # A hack variant: word tokenization has already been made, so
+            # we try to use existing word tokenization (first words, then sentences)
+            self[SENTENCES] = fit_sentences(self[WORDS], self.spans(PARAGRAPHS), tok)
+            return self
+        # Non-hack variant: word tokenization has not been applied yet,
+        # so we proceed in natural order (first sentences, then words)
         text = self.text
         dicts = []
         for paragraph in self[PARAGRAPHS]:
             para_start, para_end = paragraph[START], paragraph[END]
             para_text = text[para_start:para_end]
-            if not self.is_tagged(WORDS):
-                # Non-hack variant: word tokenization has not been applied yet,
-                # so we proceed in natural order (first sentences, then words)
-                spans = tok.span_tokenize(para_text)
-                for start, end in spans:
-                    dicts.append({'start': start+para_start, 'end': end+para_start})
-            else:
-                # A hack variant: word tokenization has already been made, so
-                # we try to use existing word tokenization (first words, then sentences)
-                para_words = \
-                    [ w for w in self[WORDS] if w[START]>=para_start and w[END]<=para_end ]
-                para_word_texts = \
-                    [ w[TEXT] for w in para_words ]
-                try:
-                    # Apply sentences_from_tokens method (if available)
-                    sents = tok.sentences_from_tokens( para_word_texts )
-                except AttributeError as e:
-                    raise
-                # Align result of the sentence tokenization with the initial word tokenization
-                # in order to determine the sentence boundaries
-                i = 0
-                for sentence in sents:
-                    j = 0
-                    firstToken = None
-                    lastToken  = None
-                    while i < len(para_words):
-                        if para_words[i][TEXT] != sentence[j]:
-                            raise Exception('Error on aligning: ', para_word_texts,' and ',sentence,' at positions ',i,j)
-                        if j == 0:
-                            firstToken = para_words[i]
-                        if j == len(sentence) - 1:
-                            lastToken = para_words[i]
-                            i+=1
-                            break
-                        j+=1
-                        i+=1
-                    sentenceDict = \
-                        {'start': firstToken[START], 'end': lastToken[END]}
-                    dicts.append( sentenceDict )
-                # Note: We also need to invalidate the cached properties providing the
-                #       sentence information, as otherwise, if the properties have been
-                #       called already, new calls would return the old state of sentence 
-                #       tokenization;
-                for sentence_attrib in ['sentences', 'sentence_texts', 'sentence_spans', \
-                                        'sentence_starts', 'sentence_ends']:
-                    try:
-                        # invalidate the cache
-                        delattr(self, sentence_attrib)
-                    except AttributeError:
-                        # it's ok, if the cached property has not been called yet
-                        pass
+            spans = tok.span_tokenize(para_text)
+            for start, end in spans:
+                dicts.append({'start': start+para_start, 'end': end+para_start})
         self[SENTENCES] = dicts
         return self
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentences(self):
         """The list of ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self[SENTENCES]
 
-    @cached_property
+    @layer_property(TEXT, SENTENCES)
     def sentence_texts(self):
         """The list of texts representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self.texts(SENTENCES)
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentence_spans(self):
         """The list of spans representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self.spans(SENTENCES)
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentence_starts(self):
         """The list of start positions representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
             self.tokenize_sentences()
         return self.starts(SENTENCES)
 
-    @cached_property
+    @layer_property(SENTENCES)
     def sentence_ends(self):
         """The list of end positions representing ``sentences`` layer elements."""
         if not self.is_tagged(SENTENCES):
@@ -519,10 +556,23 @@ class Text(dict):
 
         Automatically creates ``paragraphs`` and ``sentences`` layers.
         """
-        if not self.is_tagged(SENTENCES):
-            self.tokenize_sentences()
         tok = self.__word_tokenizer
         text = self.text
+        fused = hasattr(tok, 'span_tokenize_windows')
+        if fused and not any(layer in self for layer in (PARAGRAPHS, SENTENCES, WORDS)):
+            # create all three layers in one pass
+            paragraphs, sentences, words = tokenize_layers(
+                text, self.__paragraph_tokenizer, self.__sentence_tokenizer, tok)
+            self[PARAGRAPHS] = paragraphs
+            self[SENTENCES] = sentences
+            self[WORDS] = words
+            return self
+        if not self.is_tagged(SENTENCES):
+            self.tokenize_sentences()
+        if fused:
+            windows = tok.span_tokenize_windows(text, self.spans(SENTENCES))
+            self[WORDS] = [{START: start, END: end, TEXT: text[start:end]} for spans in windows for start, end in spans]
+            return self
         dicts = []
         for sentence in self[SENTENCES]:
             sent_start, sent_end = sentence[START], sentence[END]
@@ -533,6 +583,7 @@ class Text(dict):
         self[WORDS] = dicts
         return self
 
+    @cached_layer(ANALYSIS)
     def tag_analysis(self):
         """Tag ``words`` layer with morphological analysis attributes."""
         if not self.is_tagged(WORDS):
@@ -544,44 +595,67 @@ class Text(dict):
             for word, analysis in zip(sentence, all_analysis):
                 word[ANALYSIS] = analysis[ANALYSIS]
                 word[TEXT] = analysis[TEXT]
+        self.touch_layer(ANALYSIS)
         return self
 
-    @cached_property
+    @layer_property(WORDS)
     def words(self):
         """The list of word elements in ``words`` layer."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self[WORDS]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def word_texts(self):
         """The list of words representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return [word[TEXT] for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS)
     def word_spans(self):
         """The list of spans representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self.spans(WORDS)
 
-    @cached_property
+    @layer_property(WORDS)
     def word_starts(self):
         """The list of start positions representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self.starts(WORDS)
 
-    @cached_property
+    @layer_property(WORDS)
     def word_ends(self):
         """The list of end positions representing ``words`` layer elements."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return self.ends(WORDS)
 
-    @cached_property
+    def word_index_range(self, start, end):
+        """Map a character span to the range of ``words`` layer elements it covers.
+
+        Uses binary search over word start positions, so it is cheap to call
+        for every element of another layer.
+
+        Parameters
+        ----------
+        start: int
+            The start position of the span.
+        end: int
+            The end position of the span.
+
+        Returns
+        -------
+        (int, int)
+            Index of the word containing (or preceding) ``start`` and the index
+            one past the last word that begins before ``end``.
+        """
+        starts = self.word_starts
+        return max(bisect_right(starts, start) - 1, 0), bisect_left(starts, end)
+
+    @layer_property(WORDS, ANALYSIS)
     def analysis(self):
         """The list of analysis of ``words`` layer elements."""
         if not self.is_tagged(ANALYSIS):
@@ -614,7 +688,7 @@ class Text(dict):
         """
         return [self.__get_key(word[ANALYSIS], element, sep) for word in self.words]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def roots(self):
         """The list of word roots.
 
@@ -625,7 +699,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(ROOT)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def lemmas(self):
         """The list of lemmas.
 
@@ -636,7 +710,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(LEMMA)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def lemma_lists(self):
         """Lemma lists.
 
@@ -646,7 +720,7 @@ class Text(dict):
             self.tag_analysis()
         return [[an[LEMMA] for an in word[ANALYSIS]] for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def endings(self):
         """The list of word endings.
 
@@ -657,7 +731,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(ENDING)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def forms(self):
         """Tthe list of word forms.
 
@@ -668,7 +742,7 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(FORM)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def postags(self):
         """The list of word part-of-speech tags.
 
@@ -679,27 +753,27 @@ class Text(dict):
             self.tag_analysis()
         return self.get_analysis_element(POSTAG)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def postag_lists(self):
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
         return [[an[POSTAG] for an in word[ANALYSIS]] for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def postag_descriptions(self):
         """Human-readable POS-tag descriptions."""
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
         return [POSTAG_DESCRIPTIONS.get(tag, '') for tag in self.get_analysis_element(POSTAG)]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def root_tokens(self):
         """Root tokens of word roots."""
         if not self.is_tagged(ANALYSIS):
             self.tag_analysis()
         return self.get_analysis_element(ROOT_TOKENS)
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def descriptions(self):
         """Human readable word descriptions."""
         descs = []
@@ -722,17 +796,40 @@ class Text(dict):
     def tag_syntax_vislcg3(self):
         """ Changes default syntactic parser to VISLCG3Parser, performs syntactic analysis,
             and stores the results in the layer named LAYER_VISLCG3."""
-        if not self.__syntactic_parser or not isinstance(self.__syntactic_parser, VISLCG3Parser):
-            self.__syntactic_parser = VISLCG3Parser()
+        self.select_syntactic_parser(LAYER_VISLCG3)
         return self.tag_syntax()
 
     def tag_syntax_maltparser(self):
         """ Changes default syntactic parser to MaltParser, performs syntactic analysis,
             and stores the results in the layer named LAYER_CONLL."""
-        if not self.__syntactic_parser or not isinstance(self.__syntactic_parser, MaltParser):
-            self.__syntactic_parser = MaltParser()
+        self.select_syntactic_parser(LAYER_CONLL)
         return self.tag_syntax()
 
+    def select_syntactic_parser(self, layer):
+        """ Changes default syntactic parser to the parser of the given syntactic layer
+            (MaltParser for LAYER_CONLL, VISLCG3Parser for LAYER_VISLCG3), unless it is
+            already a parser of that type, and chooses the disambiguation of the
+            morphological analysis of the parser, if the analysis is not tagged yet.
+            :py:meth:`~estnltk.text.Text.tag_layers` calls this before it tags the
+            morphological analysis the syntax layers depend on.
+        """
+        parser_class = {LAYER_CONLL: MaltParser, LAYER_VISLCG3: VISLCG3Parser}[layer]
+        if not self.__syntactic_parser or not isinstance(self.__syntactic_parser, parser_class):
+            self.__syntactic_parser = parser_class()
+        self.__set_syntax_disambiguation()
+        return self
+
+    def __set_syntax_disambiguation(self):
+        if self.is_tagged(ANALYSIS) or 'disambiguate' in self.__kwargs:
+            return
+        if isinstance(self.__syntactic_parser, MaltParser):
+            # By default: Use disambiguation for MaltParser's input
+            self.__kwargs['disambiguate'] = True
+        elif isinstance(self.__syntactic_parser, VISLCG3Parser):
+            # By default: Do not use disambiguation for VISLCG3Parser's input
+            #   (VISLCG3 already does its own rule-based disambiguation)
+            self.__kwargs['disambiguate'] = False
+
     def tag_syntax(self):
         """ Parses this text with the syntactic analyzer (``self.__syntactic_parser``), 
             and stores the found syntactic analyses: into the layer LAYER_CONLL (if MaltParser 
@@ -742,16 +839,8 @@ class Text(dict):
         if self.__syntactic_parser is None:
             self.__syntactic_parser = load_default_syntactic_parser()
         if not self.is_tagged(ANALYSIS):
-            if isinstance(self.__syntactic_parser, MaltParser):
-                # By default: Use disambiguation for MaltParser's input
-                if 'disambiguate' not in self.__kwargs:
-                    self.__kwargs['disambiguate'] = True
-                self.tag_analysis()
-            elif isinstance(self.__syntactic_parser, VISLCG3Parser):
-                # By default: Do not use disambiguation for VISLCG3Parser's input
-                #   (VISLCG3 already does its own rule-based disambiguation)
-                if 'disambiguate' not in self.__kwargs:
-                    self.__kwargs['disambiguate'] = False
+            self.__set_syntax_disambiguation()
+            if isinstance(self.__syntactic_parser, (MaltParser, VISLCG3Parser)):
                 self.tag_analysis()
         return self.__syntactic_parser.parse_text( self, **self.__kwargs )
 
@@ -797,18 +886,19 @@ class Text(dict):
         else:
             raise ValueError('(!) Missing layer name! ')
 
-    @cached_property
+    @layer_property(WORDS, LAYER_CONLL)
     def syntax_trees_conll(self):
         """ Return syntactic trees built from CONLL (MaltParser's) syntactic annotation. """
         assert LAYER_CONLL in self, '(!) Missing syntactic annotations layer: '+LAYER_CONLL+'!'
         return build_trees_from_text( self, layer=LAYER_CONLL )
 
-    @cached_property
+    @layer_property(WORDS, LAYER_VISLCG3)
     def syntax_trees_vislcg3(self):
         """ Return syntactic trees built from VISL CG3's syntactic annotations. """
         assert LAYER_VISLCG3 in self, '(!) Missing syntactic annotations layer: '+LAYER_VISLCG3+'!'
         return build_trees_from_text( self, layer=LAYER_VISLCG3 )
 
+    @cached_layer(LABEL)
     def tag_labels(self):
         """Tag named entity labels in the ``words`` layer."""
         if not self.is_tagged(ANALYSIS):
@@ -816,9 +906,10 @@ class Text(dict):
         if self.__ner_tagger is None:
             self.__ner_tagger = load_default_ner_tagger()
         self.__ner_tagger.tag_document(self)
+        self.touch_layer(LABEL)
         return self
 
-    @cached_property
+    @layer_property(WORDS, LABEL)
     def labels(self):
         """Named entity labels."""
         if not self.is_tagged(LABEL):
@@ -851,7 +942,7 @@ class Text(dict):
         self[NAMED_ENTITIES] = nes
         return self
 
-    @cached_property
+    @layer_property(TEXT, WORDS, ANALYSIS, NAMED_ENTITIES)
     def named_entities(self):
         """The elements of ``named_entities`` layer."""
         if not self.is_tagged(NAMED_ENTITIES):
@@ -859,27 +950,28 @@ class Text(dict):
         phrases = self.split_by(NAMED_ENTITIES)
         return [' '.join(phrase.lemmas) for phrase in phrases]
 
-    @cached_property
+    @layer_property(TEXT, NAMED_ENTITIES)
     def named_entity_texts(self):
         """The texts representing named entities."""
         if not self.is_tagged(NAMED_ENTITIES):
             self.tag_named_entities()
         return self.texts(NAMED_ENTITIES)
 
-    @cached_property
+    @layer_property(NAMED_ENTITIES)
     def named_entity_spans(self):
         """The spans of named entities."""
         if not self.is_tagged(NAMED_ENTITIES):
             self.tag_named_entities()
         return self.spans(NAMED_ENTITIES)
 
-    @cached_property
+    @layer_property(NAMED_ENTITIES)
     def named_entity_labels(self):
         """The named entity labels without BIO prefixes."""
         if not self.is_tagged(NAMED_ENTITIES):
             self.tag_named_entities()
         return [ne[LABEL] for ne in self[NAMED_ENTITIES]]
 
+    @cached_layer(TIMEXES, retag=False)
     def tag_timexes(self):
         """Create ``timexes`` layer.
         Depends on morphological analysis data in ``words`` layer
@@ -892,54 +984,55 @@ class Text(dict):
             self.__timex_tagger.tag_document(self, **self.__kwargs)
         return self
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timexes(self):
         """The list of elements in ``timexes`` layer."""
         if not self.is_tagged(TIMEXES):
             self.tag_timexes()
         return self[TIMEXES]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_texts(self):
         """The list of texts representing ``timexes`` layer elements."""
         return [timex.get(TEXT, '') for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_values(self):
         """The list of timex values of ``timexes`` layer elements."""
         return [timex[TMX_VALUE] for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_types(self):
         """The list of timex types of ``timexes`` layer elements."""
         return [timex[TMX_TYPE] for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_ids(self):
         """The list of timex id-s of ``timexes`` layer elements."""
         return [timex[TMX_ID] for timex in self.timexes]
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_starts(self):
         """The list of start positions of ``timexes`` layer elements."""
         if not self.is_tagged(TIMEXES):
             self.tag_timexes()
         return self.starts(TIMEXES)
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_ends(self):
         """The list of end positions of ``timexes`` layer elements."""
         if not self.is_tagged(TIMEXES):
             self.tag_timexes()
         return self.ends(TIMEXES)
 
-    @cached_property
+    @layer_property(TIMEXES)
     def timex_spans(self):
         """The list of spans of ``timexes`` layer elements."""
         if not self.is_tagged(TIMEXES):
             self.tag_timexes()
         return self.spans(TIMEXES)
 
+    @cached_layer(CLAUSE_ANNOTATION)
     def tag_clause_annotations(self):
         """Tag clause annotations in ``words`` layer.
         Depends on morphological analysis.
@@ -948,16 +1041,18 @@ class Text(dict):
             self.tag_analysis()
         if self.__clause_segmenter is None:
             self.__clause_segmenter = load_default_clausesegmenter()
-        return self.__clause_segmenter.tag(self)
+        self.__clause_segmenter.tag(self)
+        self.touch_layer(CLAUSE_ANNOTATION)
+        return self
 
-    @cached_property
+    @layer_property(WORDS, CLAUSE_ANNOTATION)
     def clause_annotations(self):
         """The list of clause annotations in ``words`` layer."""
         if not self.is_tagged(CLAUSE_ANNOTATION):
             self.tag_clause_annotations()
         return [word.get(CLAUSE_ANNOTATION, None) for word in self[WORDS]]
 
-    @cached_property
+    @layer_property(WORDS, CLAUSE_ANNOTATION)
     def clause_indices(self):
         """The list of clause indices in ``words`` layer.
         The indices are unique only in the boundary of a single sentence.
@@ -996,14 +1091,14 @@ class Text(dict):
         self[CLAUSES] = clauses
         return self
 
-    @cached_property
+    @layer_property(CLAUSES)
     def clauses(self):
         """The elements of ``clauses`` multilayer."""
         if not self.is_tagged(CLAUSES):
             self.tag_clauses()
         return self[CLAUSES]
 
-    @cached_property
+    @layer_property(TEXT, CLAUSES)
     def clause_texts(self):
         """The texts of ``clauses`` multilayer elements.
         Non-consequent spans are concatenated with space character by default.
@@ -1013,6 +1108,7 @@ class Text(dict):
             self.tag_clauses()
         return self.texts(CLAUSES)
 
+    @cached_layer(VERB_CHAINS)
     def tag_verb_chains(self):
         """Create ``verb_chains`` layer.
            Depends on ``clauses`` layer.
@@ -1036,75 +1132,75 @@ class Text(dict):
         self[VERB_CHAINS] = verbchains
         return self
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chains(self):
         """The list of elements of ``verb_chains`` layer."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self[VERB_CHAINS]
 
-    @cached_property
+    @layer_property(TEXT, VERB_CHAINS)
     def verb_chain_texts(self):
         """The list of texts of ``verb_chains`` layer elements."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self.texts(VERB_CHAINS)
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_patterns(self):
         """The patterns of ``verb_chains`` elements."""
         return [vc[PATTERN] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_roots(self):
         """The chain roots of ``verb_chains`` elements."""
         return [vc[ROOTS] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_morphs(self):
         """The morph attributes of ``verb_chains`` elements."""
         return [vc[MORPH] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_polarities(self):
         """The polarities of ``verb_chains`` elements."""
         return [vc[POLARITY] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_tenses(self):
         """The tense attributes of ``verb_chains`` elements."""
         return [vc[TENSE] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_moods(self):
         """The mood attributes of ``verb_chains`` elements."""
         return [vc[MOOD] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_voices(self):
         """The voice attributes of ``verb_chains`` elements."""
         return [vc[VOICE] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_clause_indices(self):
         """The clause indices of ``verb_chains`` elements."""
         return [vc[CLAUSE_IDX] for vc in self.verb_chains]
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_starts(self):
         """The start positions of ``verb_chains`` elements."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self.starts(VERB_CHAINS)
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_ends(self):
         """The end positions of ``verb_chains`` elements."""
         if not self.is_tagged(VERB_CHAINS):
             self.tag_verb_chains()
         return self.ends(VERB_CHAINS)
 
-    @cached_property
+    @layer_property(VERB_CHAINS)
     def verb_chain_other_verbs(self):
         """The other verb attributes of ``verb_chains`` elements."""
         return [vc[OTHER_VERBS] for vc in self.verb_chains]
@@ -1120,17 +1216,20 @@ class Text(dict):
             wordnet_tagger = WordnetTagger()
         self.__wordnet_tagger = wordnet_tagger
         if len(kwargs) > 0:
-            return self.__wordnet_tagger.tag_text(self, **kwargs)
-        return self.__wordnet_tagger.tag_text(self, **self.__kwargs)
+            result = self.__wordnet_tagger.tag_text(self, **kwargs)
+        else:
+            result = self.__wordnet_tagger.tag_text(self, **self.__kwargs)
+        self.touch_layer(WORDNET)
+        return result
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS, WORDNET)
     def wordnet_annotations(self):
         """The list of wordnet annotations of ``words`` layer."""
         if not self.is_tagged(WORDNET):
             self.tag_wordnet()
         return [[a[WORDNET] for a in analysis] for analysis in self.analysis]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS, WORDNET)
     def synsets(self):
         """The list of annotated synsets of ``words`` layer."""
         synsets = []
@@ -1142,7 +1241,7 @@ class Text(dict):
             synsets.append(word_synsets)
         return synsets
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS, WORDNET)
     def word_literals(self):
         """The list of literals per word in ``words`` layer."""
         literals = []
@@ -1159,7 +1258,7 @@ class Text(dict):
     # SPELLCHECK
     # ///////////////////////////////////////////////////////////////////
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def spelling(self):
         """Flag incorrectly spelled words.
         Returns a list of booleans, where element at each position denotes, if the word at the same position
@@ -1169,14 +1268,14 @@ class Text(dict):
             self.tokenize_words()
         return [data[SPELLING] for data in vabamorf.spellcheck(self.word_texts, suggestions=False)]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def spelling_suggestions(self):
         """The list of spelling suggestions per misspelled word."""
         if not self.is_tagged(WORDS):
             self.tokenize_words()
         return [data[SUGGESTIONS] for data in vabamorf.spellcheck(self.word_texts, suggestions=True)]
 
-    @cached_property
+    @layer_property(WORDS, ANALYSIS)
     def spellcheck_results(self):
         """The list of True/False values denoting the correct spelling of words."""
         if not self.is_tagged(WORDS):
@@ -1222,7 +1321,7 @@ class Text(dict):
         to this Text."""
         return self.__text_cleaner.is_valid(self[TEXT])
 
-    @cached_property
+    @layer_property(TEXT)
     def invalid_characters(self):
         """List of invalid characters found in this text."""
         return self.__text_cleaner.invalid_characters(self[TEXT])
@@ -1361,6 +1460,44 @@ class Text(dict):
             spans = [(mo.start(), mo.end()) for mo in regex.finditer(text)]
         return self.split_given_spans(spans)
 
+    def view_given_spans(self, spans):
+        """Read-only views of the text, one per span.
+
+        Unlike :py:meth:`~estnltk.text.Text.split_given_spans`, the layers are not copied: the views reference
+        the elements of this text and translate their positions when they are read.
+        See :py:mod:`estnltk.text_view` for details.
+
+        Parameters
+        ----------
+        spans: list of (int, int)
+            The (start, end) positions of the views.
+
+        Returns
+        -------
+        list of estnltk.text_view.TextView
+        """
+        return views(self, spans)
+
+    def view_by(self, layer):
+        """Read-only views of the text defined by elements of given layer.
+
+        Parameters
+        ----------
+        layer: str
+            The layer defining the start and end positions of the views, it must not be a multilayer.
+
+        Returns
+        -------
+        list of estnltk.text_view.TextView
+        """
+        if not self.is_tagged(layer):
+            self.tag(layer)
+        return views(self, self.spans(layer), by=layer)
+
+    def view_by_sentences(self):
+        """Read-only views of the individual sentences."""
+        return self.view_by(SENTENCES)
+
     # ///////////////////////////////////////////////////////////////////
     # DIVIDING
     # ///////////////////////////////////////////////////////////////////
@@ -1381,11 +1518,35 @@ class Text(dict):
         -------
         list of (list of dict)
         """
+        index = self.division_index(layer, by)
+        if index is None:
+            return divide(self[layer], self[by])
+        return index.divide(self[layer])
+
+    def division_index(self, layer=WORDS, by=SENTENCES):
+        """The :py:class:`~estnltk.dividing.DivisionIndex` of dividing the layer by the other layer.
+
+        The index is memoized until either of the layers is assigned again (see :py:meth:`layer_version`).
+
+        Returns
+        -------
+        estnltk.dividing.DivisionIndex
+            or None, if the layer has multispan elements.
+        """
         if not self.is_tagged(layer):
             self.tag(layer)
         if not self.is_tagged(by):
             self.tag(by)
-        return divide(self[layer], self[by])
+        indices = self.__dict__.setdefault('_division_indices', {})
+        versions = (self.layer_version(layer), self.layer_version(by))
+        memo = indices.get((layer, by))
+        if memo is None or memo[0] != versions:
+            memo = indices[(layer, by)] = (versions, division_index(self[layer], self[by]))
+        return memo[1]
+
+    def sentence_word_range(self, i):
+        """The (start, end) range of the indices of the ``words`` layer elements in the i-th sentence."""
+        return self.division_index(WORDS, SENTENCES).range(i)
 
     # ///////////////////////////////////////////////////////////////////
     # FILTERING
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Read-only views of the windows of a :py:class:`~estnltk.text.Text`.
+
+:py:meth:`~estnltk.text.Text.split_by` copies every element of every layer to the resulting pieces and translates
+their positions. The code that only reads the pieces can use views instead::
+
+    text = Text('Esimene lause. Teine lause.')
+    for sentence in text.view_by_sentences():
+        print(sentence.text, sentence.lemmas)
+
+A :py:class:`TextView` references the layers of the parent text. The elements of its layers are wrapped in
+:py:class:`ElementView` instances, that translate the ``start`` and ``end`` positions relative to the window
+when they are read. The elements of a layer in the windows are found once for all views of the same split,
+when the layer is first accessed. The views have the same properties as the
+:py:class:`~estnltk.text.Text` (``words``, ``lemmas``, ``clause_indices`` etc); the layers missing from the
+parent are tagged in the parent.
+
+The values of the elements (for example, the morphological analysis) are the values of the parent elements,
+they must not be modified. Use :py:meth:`~estnltk.text.Text.split_by` to get independent copies.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import functools
+import six
+from six.moves import range
+
+from .names import *
+from .dividing import convert_span, spans, get_bins, span_filters_list
+from .layer_registry import LAYERS
+from .layer_versions import layer_property, layer_versions, VERSIONS
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    from collections import Mapping, Sequence
+
+# Text methods that tag the layers, the views tag the parent text instead
+TAGGERS = dict((spec[0], layer) for layer, spec in LAYERS.items())
+
+# Text methods that only read the layers and work on the views as well
+READ_METHODS = ('texts', 'texts_from_spans', 'spans', 'starts', 'ends', 'is_simple', 'is_multi',
+                'get_analysis_element', '_Text__get_key', 'word_index_range', 'get_elements_in_span',
+                'divide', 'division_index', 'sentence_word_range')
+
+
+class ElementView(Mapping):
+    """Read-only view of a layer element with the positions relative to the start of the window."""
+
+    __slots__ = ('_element', '_offset', '_spans')
+
+    def __init__(self, element, offset, spans=None):
+        self._element = element
+        self._offset = offset
+        # the spans of a multispan element that are in the window
+        self._spans = spans
+
+    def __getitem__(self, key):
+        if key == START:
+            if self._spans is None:
+                return self._element[START] - self._offset
+            return [start - self._offset for start, end in self._spans]
+        if key == END:
+            if self._spans is None:
+                return self._element[END] - self._offset
+            return [end - self._offset for start, end in self._spans]
+        return self._element[key]
+
+    def __iter__(self):
+        return iter(self._element)
+
+    def __len__(self):
+        return len(self._element)
+
+    def __contains__(self, key):
+        return key in self._element
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class LayerView(Sequence):
+    """Read-only view of the elements of a layer in a window."""
+
+    def __init__(self, elements, indices, spans, offset):
+        self._elements = elements
+        self._indices = indices
+        self._spans = spans
+        self._offset = offset
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        spans = None if self._spans is None else self._spans[i]
+        return ElementView(self._elements[self._indices[i]], self._offset, spans)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LayerView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class SpanWindows(object):
+    """The windows of the views of a split and the elements of the parent layers in each window.
+
+    Parameters
+    ----------
+    parent: estnltk.text.Text
+        The text.
+    spans: list of (int, int)
+        The windows, in the order of their positions.
+    by: str
+        The layer the spans are taken from, its division index is used when the layer has not changed.
+    """
+
+    def __init__(self, parent, spans, by=None):
+        self.parent = parent
+        self.spans = [convert_span(span) for span in spans]
+        if any(isinstance(span, list) for span in self.spans):
+            raise ValueError('The windows of the views must be simple (start, end) spans, '
+                             'use split_given_spans for multispans.')
+        self.by = by
+        self.by_version = None if by is None else parent.layer_version(by)
+        self.__bins = {}
+
+    def __len__(self):
+        return len(self.spans)
+
+    def elements(self, layer, i):
+        """The indices of the layer elements in the i-th window and their spans in the window or None."""
+        version = self.parent.layer_version(layer)
+        memo = self.__bins.get(layer)
+        if memo is None or memo[0] != version:
+            memo = self.__bins[layer] = (version, self.__divide(layer))
+        return memo[1](i)
+
+    def __divide(self, layer):
+        elements = self.parent[layer]
+        if not elements or not self.spans:
+            return lambda i: ([], None)
+        if self.by is not None and self.parent.layer_version(self.by) == self.by_version:
+            index = self.parent.division_index(layer, self.by)
+            if index is not None and index.contiguous:
+                return lambda i: (range(*index.range(i)), None)
+            if index is not None:
+                return lambda i: (index.bin_indices(i), None)
+        inner = [spans(element) for element in elements]
+        bins = []
+        for span, collection in zip(self.spans, get_bins(self.spans, inner)):
+            if isinstance(inner[0], list):
+                indices, filtered = [], []
+                for idx in collection:
+                    inside = span_filters_list(span, inner[idx])
+                    if inside is not None:
+                        indices.append(idx)
+                        filtered.append(inside)
+                bins.append((indices, filtered))
+            else:
+                bins.append((list(collection), None))
+        return lambda i: bins[i]
+
+
+class TextView(Mapping):
+    """Read-only view of a window of a :py:class:`~estnltk.text.Text`.
+
+    The views are created with :py:meth:`~estnltk.text.Text.view_given_spans` and
+    :py:meth:`~estnltk.text.Text.view_by`. The keys of a view are ``text`` and the layers of the parent.
+    """
+
+    def __init__(self, parent, windows, i):
+        self.__parent = parent
+        self.__windows = windows
+        self.__i = i
+        self.start, self.end = windows.spans[i]
+        # the properties are memoized until the layers of the parent change
+        self.__dict__[VERSIONS] = layer_versions(parent)
+
+    @property
+    def parent(self):
+        """The text the view is a window of."""
+        return self.__parent
+
+    def __getitem__(self, key):
+        if key == TEXT:
+            return self.__parent[TEXT][self.start:self.end]
+        value = self.__parent[key]
+        if not isinstance(value, list):
+            raise KeyError(key)
+        indices, spans = self.__windows.elements(key, self.__i)
+        return LayerView(value, indices, spans, self.start)
+
+    def __iter__(self):
+        yield TEXT
+        for key, value in self.__parent.items():
+            if key != TEXT and isinstance(value, list):
+                yield key
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def __contains__(self, key):
+        return key == TEXT or isinstance(dict.get(self.__parent, key), list)
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name.startswith('_TextView__'):
+            raise AttributeError(name)
+        if name in TAGGERS:
+            return functools.partial(self.__tag_parent, TAGGERS[name])
+        attr = getattr(type(self.__parent), name, None)
+        if isinstance(attr, layer_property):
+            return attr.__get__(self, type(self))
+        if name in READ_METHODS and attr is not None:
+            return six.get_unbound_function(attr).__get__(self, type(self))
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
+    def __tag_parent(self, layer):
+        if not self.__parent.is_tagged(layer):
+            self.__parent.tag(layer)
+        return self
+
+    def tag(self, layer):
+        """Tag the layer in the parent text, unless it is already tagged."""
+        return self.__tag_parent(layer)
+
+    def is_tagged(self, layer):
+        return self.__parent.is_tagged(layer)
+
+    def layer_version(self, layer):
+        return self.__parent.layer_version(layer)
+
+    def get_kwargs(self):
+        return self.__parent.get_kwargs()
+
+    def to_dict(self):
+        """The text and the layers of the window as a dictionary, like the pieces of
+        :py:meth:`~estnltk.text.Text.split_given_spans`.
+
+        The elements are shallow copies, their values are shared with the parent text.
+        """
+        result = {TEXT: self[TEXT]}
+        for key in self:
+            if key != TEXT:
+                result[key] = [dict(element) for element in self[key]]
+        return result
+
+    def __str__(self):
+        return self[TEXT]
+
+    def __unicode__(self):
+        return self[TEXT]
+
+    def __repr__(self):
+        return 'TextView({0!r}, {1}, {2})'.format(self[TEXT], self.start, self.end)
+
+
+def views(text, spans, by=None):
+    """Read-only views of the text, one per span."""
+    windows = SpanWindows(text, spans, by)
+    return [TextView(text, windows, i) for i in range(len(windows))]
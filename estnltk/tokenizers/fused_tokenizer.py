@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Tokenization of paragraphs, sentences and words at once.
+
+Tokenizing level by level (paragraphs, then the sentences of every paragraph and then the words of every
+sentence) slices the text on every level and translates the positions of the tokens of every sentence. :py:func:`tokenize_layers` creates the same layers in one pass: the sentence spans are
+collected first and the word pattern is then matched in the sentence windows of the original text, so the token
+positions need no translation and the joining rules look only at the tokens that touch each other::
+
+    paragraphs, sentences, words = tokenize_layers(text, paragraph_tokenizer, sentence_tokenizer, EstWordTokenizer())
+
+The words are the same as the ones of :py:class:`~estnltk.tokenizers.word_tokenizer.EstWordTokenizer` applied
+to every sentence separately. :py:meth:`~estnltk.text.Text.tokenize_words` uses this function, when
+none of the three layers exist. See ``estnltk/examples/benchmark_tokenization.py`` for the speed comparison.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+from estnltk.names import START, END, TEXT
+
+
+def tokenize_layers(text, paragraph_tokenizer, sentence_tokenizer, word_tokenizer):
+    """Create the ``paragraphs``, ``sentences`` and ``words`` layers of the text.
+
+    Parameters
+    ----------
+    text: str
+        The text.
+    paragraph_tokenizer: nltk.tokenize.api.StringTokenizer
+        Tokenizer for paragraphs.
+    sentence_tokenizer: nltk.tokenize.api.StringTokenizer
+        Tokenizer for sentences, it is applied to every paragraph.
+    word_tokenizer: estnltk.tokenizers.word_tokenizer.EstWordTokenizer
+        Tokenizer for words, it must have the ``span_tokenize_windows`` method.
+
+    Returns
+    -------
+    (list of dict, list of dict, list of dict)
+        The elements of the paragraphs, sentences and words layers.
+    """
+    paragraphs = []
+    sentence_spans = []
+    for para_start, para_end in paragraph_tokenizer.span_tokenize(text):
+        paragraphs.append({START: para_start, END: para_end})
+        for start, end in sentence_tokenizer.span_tokenize(text[para_start:para_end]):
+            sentence_spans.append((start + para_start, end + para_start))
+    sentences = [{START: start, END: end} for start, end in sentence_spans]
+    words = [{START: start, END: end, TEXT: text[start:end]}
+             for spans in word_tokenizer.span_tokenize_windows(text, sentence_spans) for start, end in spans]
+    return paragraphs, sentences, words
@@ -59,19 +59,21 @@ break_patterns = [ \
 
 
 class SentenceTokenizerForKoond( StringTokenizer ):
+    """Sentence tokenizer with post-processing fixes for koondkorpus texts.
+
+    Parameters
+    ----------
+    sentence_tokenizer: nltk.tokenize.api.StringTokenizer
+        The tokenizer performing the initial tokenization (default: NLTK punkt for Estonian,
+        loaded when it is first used).
+    """
     sentence_tokenizer = None
 
-    def __init__(self, **kwargs):
-        # use NLTK-s sentence tokenizer for Estonian, in case it is not downloaded, try to download it first
-        import nltk.data
-        try:
-            self.sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
-        except LookupError:
-            import nltk.downloader
-            nltk.downloader.download('punkt')
-        finally:
-            if self.sentence_tokenizer is None:
-                self.sentence_tokenizer = nltk.data.load('tokenizers/punkt/estonian.pickle')
+    def __init__(self, sentence_tokenizer=None, **kwargs):
+        if sentence_tokenizer is None:
+            from .sentence_tokenizers import PunktTokenizer
+            sentence_tokenizer = PunktTokenizer()
+        self.sentence_tokenizer = sentence_tokenizer
 
     def tokenize(self, s):
         return self.tokenize_text(s)[0]
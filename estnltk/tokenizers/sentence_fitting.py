@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Fitting sentence boundaries onto an existing word tokenization.
+
+Pre-tokenized corpora come with their own words, and the sentence tokenizer must not split or join them. The
+sentence tokenizer gets the word texts of every paragraph and the resulting sentences are aligned with the
+words::
+
+    sentences = fit_sentences(words, paragraphs, sentence_tokenizer)
+
+:py:meth:`~estnltk.text.Text.tokenize_sentences` uses this, when the ``words`` layer already exists.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+from bisect import bisect_left
+
+from estnltk.names import START, END, TEXT
+from .sentence_tokenizers import sentences_from_tokens
+
+
+def paragraph_words(words, paragraphs):
+    """The words contained in every paragraph.
+
+    The words are found with binary search over their start positions, when they are in the order of their
+    positions, so the cost is O(W log W + P) instead of checking every word for every paragraph.
+
+    Parameters
+    ----------
+    words: list of dict
+        The elements of the words layer.
+    paragraphs: list of (int, int)
+        The (start, end) spans of the paragraphs.
+
+    Returns
+    -------
+    list of (list of dict)
+        The words of every paragraph, in the order of the words layer.
+    """
+    starts = [word[START] for word in words]
+    if any(a > b for a, b in zip(starts, starts[1:])):
+        return [[w for w in words if w[START] >= para_start and w[END] <= para_end]
+                for para_start, para_end in paragraphs]
+    result = []
+    for para_start, para_end in paragraphs:
+        i, j = bisect_left(starts, para_start), bisect_left(starts, para_end)
+        result.append([w for w in words[i:j] if w[END] <= para_end])
+    return result
+
+
+def align_sentences(words, sentences):
+    """The (start, end) spans of the sentences given as lists of the texts of the consequent words."""
+    spans = []
+    i = 0
+    for sentence in sentences:
+        if not sentence:
+            continue
+        first = i
+        for token in sentence:
+            if i >= len(words) or words[i][TEXT] != token:
+                raise Exception('Error on aligning: ', [w[TEXT] for w in words], ' and ', sentence,
+                                ' at positions ', i, i - first)
+            i += 1
+        spans.append((words[first][START], words[i - 1][END]))
+    return spans
+
+
+def fit_sentences(words, paragraphs, sentence_tokenizer):
+    """Create the sentences layer on top of the existing words.
+
+    Parameters
+    ----------
+    words: list of dict
+        The elements of the words layer, with the ``text`` attribute.
+    paragraphs: list of (int, int)
+        The (start, end) spans of the paragraphs, the sentences do not cross them.
+    sentence_tokenizer: nltk.tokenize.api.StringTokenizer
+        The sentence tokenizer. Its ``sentences_from_tokens`` method is used, if it has one (NLTK punkt), otherwise
+        the tokens are joined with spaces and split with ``span_tokenize``.
+
+    Returns
+    -------
+    list of dict
+        The elements of the sentences layer.
+    """
+    sentences = []
+    for para_words in paragraph_words(words, paragraphs):
+        tokens = [w[TEXT] for w in para_words]
+        if hasattr(sentence_tokenizer, 'sentences_from_tokens'):
+            sents = sentence_tokenizer.sentences_from_tokens(tokens)
+        else:
+            sents = sentences_from_tokens(sentence_tokenizer, tokens)
+        sentences.extend({START: start, END: end} for start, end in align_sentences(para_words, sents))
+    return sentences
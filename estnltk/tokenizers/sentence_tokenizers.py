@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Sentence tokenizer backends.
+
+The sentence tokenizer of :py:class:`~estnltk.text.Text` is chosen with the ``sentence_tokenizer`` keyword
+argument, either as a tokenizer instance or by the name of a backend::
+
+    Text('Tere! Kuidas läheb?', sentence_tokenizer='estnltk')
+
+The backends are:
+
+``punkt`` (default)
+    NLTK punkt tokenizer trained for Estonian. The model is loaded when the first sentence is tokenized,
+    and downloaded with the NLTK downloader only if it is not installed.
+``estnltk``
+    :py:class:`EstSentenceTokenizer`, a rule based tokenizer shipped with estnltk. It needs no model, gives the
+    same result everywhere and is several times faster than punkt.
+``koond``
+    :py:class:`~estnltk.tokenizers.sent_tokenizer_for_koond.SentenceTokenizerForKoond`, punkt with the
+    post-processing fixes for the Estonian Reference Corpus.
+
+See ``estnltk/examples/benchmark_sentence_tokenizers.py`` for the throughput of the backends.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import re
+import threading
+
+import six
+from nltk.tokenize.api import StringTokenizer
+
+PUNKT_MODEL = 'tokenizers/punkt/estonian.pickle'
+
+# abbreviations that are not followed by a sentence break, even if the next word is capitalized
+ABBREVIATIONS = frozenset([
+    'apr', 'aug', 'dets', 'dots', 'dr', 'hr', 'hrl', 'ik', 'ingl', 'jaan', 'jr', 'jun', 'jul', 'k', 'kd', 'kl',
+    'kpt', 'kr', 'kt', 'lad', 'lg', 'lk', 'lp', 'ltn', 'lüh', 'mag', 'mh', 'mnt', 'mr', 'mrs', 'ms', 'nn', 'nov',
+    'nr', 'nt', 'nö', 'okt', 'p.s', 'pr', 'prl', 'prof', 'pst', 'rmtk', 'saj', 'sealh', 'sen', 'sept', 'sh', 'skp',
+    'sm', 'snd', 'sr', 'st', 'tlk', 'tn', 'toim', 'u', 'ul', 'v', 'vaat', 'veebr', 'vm', 'vrd', 'vt', 'õp',
+])
+
+# a sentence ending punctuation followed by optional closing quotes and brackets and a space
+ENDING = re.compile('(?P<punct>[.!?…]+)(?P<close>["\'»“”)\\]]*)(?=\\s+(?P<next>\\S))', re.U)
+# a missing space after a sentence: ... teeme valikuid.Valime kõike ...
+JOINED = re.compile('[a-zöäüõšž]{2,}\\.(?=[A-ZÖÄÜÕŠŽ][a-zöäüõšž]+)', re.U)
+# the characters that do not start a sentence
+CONTINUATION = re.compile('[a-zöäüõšž,;:)\\]]', re.U)
+OPENING = '"\'(«“„['
+
+
+class EstSentenceTokenizer(StringTokenizer):
+    """Rule based sentence tokenizer for Estonian.
+
+    A sentence ends with ``.``, ``!``, ``?`` or ``…`` (and optional closing quotes and brackets), if the next
+    word does not start with a lowercase letter or a comma. A period does not end a sentence after a single
+    uppercase letter (name initials) or after the abbreviations in :py:data:`ABBREVIATIONS`. A sentence also
+    ends after a period between two words, when the second word is capitalized (``valikuid.Valime``).
+
+    Parameters
+    ----------
+    abbreviations: set of str
+        The lowercase abbreviations without the final period (default: :py:data:`ABBREVIATIONS`).
+    """
+
+    def __init__(self, abbreviations=ABBREVIATIONS):
+        self.abbreviations = abbreviations
+
+    def __is_break(self, s, match):
+        if CONTINUATION.match(match.group('next')):
+            return False
+        if match.group('punct') != '.':
+            return True
+        # the abbreviations are short, do not look further back
+        window = max(match.start() - 20, 0)
+        token_start = max(s.rfind(c, window, match.start()) for c in ' \t\n') + 1
+        token = s[max(token_start, window):match.start()].lstrip(OPENING)
+        if len(token) == 1 and token.isupper():
+            return False
+        return token.lower() not in self.abbreviations
+
+    def sentence_ends(self, s):
+        """The end positions of the sentences, except the last one."""
+        ends = [match.end() for match in ENDING.finditer(s) if self.__is_break(s, match)]
+        ends.extend(match.end() for match in JOINED.finditer(s))
+        return sorted(ends)
+
+    def span_tokenize(self, s):
+        spans = []
+        start = 0
+        for end in self.sentence_ends(s) + [len(s)]:
+            # the sentences do not contain the surrounding whitespace
+            while start < end and s[start].isspace():
+                start += 1
+            last = end
+            while last > start and s[last - 1].isspace():
+                last -= 1
+            if last > start:
+                spans.append((start, last))
+            start = end
+        return spans
+
+    def tokenize(self, s):
+        return [s[start:end] for start, end in self.span_tokenize(s)]
+
+
+class PunktTokenizer(StringTokenizer):
+    """NLTK punkt sentence tokenizer for Estonian, the model is loaded when it is first used."""
+
+    def __init__(self, model=PUNKT_MODEL):
+        self.model = model
+        self.__tokenizer = None
+        self.__lock = threading.Lock()
+
+    @property
+    def tokenizer(self):
+        """The loaded :py:class:`nltk.tokenize.punkt.PunktSentenceTokenizer`."""
+        if self.__tokenizer is None:
+            with self.__lock:
+                if self.__tokenizer is None:
+                    self.__tokenizer = load_punkt(self.model)
+        return self.__tokenizer
+
+    def tokenize(self, s):
+        return self.tokenizer.tokenize(s)
+
+    def span_tokenize(self, s):
+        return self.tokenizer.span_tokenize(s)
+
+    def sentences_from_tokens(self, tokens):
+        return self.tokenizer.sentences_from_tokens(tokens)
+
+    def __getstate__(self):
+        return {'model': self.model}
+
+    def __setstate__(self, state):
+        self.__init__(state['model'])
+
+
+def load_punkt(model=PUNKT_MODEL):
+    """Load the punkt model, download the NLTK punkt models, if it is not installed."""
+    import nltk.data
+    try:
+        return nltk.data.load(model)
+    except LookupError:
+        import nltk.downloader
+        nltk.downloader.download('punkt')
+    return nltk.data.load(model)
+
+
+def sentences_from_tokens(tokenizer, tokens):
+    """Split a list of tokens into sentences with any sentence tokenizer that has the ``span_tokenize`` method.
+
+    The tokens are joined with spaces; a sentence break inside a token is moved to the end of the token.
+    """
+    text = ' '.join(tokens)
+    starts = []
+    position = 0
+    for token in tokens:
+        starts.append(position)
+        position += len(token) + 1
+    sentences = []
+    i = 0
+    for start in [start for start, _ in tokenizer.span_tokenize(text)][1:] + [len(text) + 1]:
+        sentence = []
+        while i < len(tokens) and starts[i] < start:
+            sentence.append(tokens[i])
+            i += 1
+        if sentence:
+            sentences.append(sentence)
+    return sentences
+
+
+def _koond():
+    from .sent_tokenizer_for_koond import SentenceTokenizerForKoond
+    return SentenceTokenizerForKoond()
+
+
+# backend name -> function creating the tokenizer
+SENTENCE_TOKENIZERS = {
+    'punkt': PunktTokenizer,
+    'estnltk': EstSentenceTokenizer,
+    'koond': _koond,
+}
+
+
+def get_sentence_tokenizer(tokenizer):
+    """The sentence tokenizer instance for the given backend name or the tokenizer itself."""
+    if isinstance(tokenizer, six.string_types):
+        if tokenizer not in SENTENCE_TOKENIZERS:
+            raise ValueError('Unknown sentence tokenizer: {0}, use one of {1}'.format(
+                tokenizer, ', '.join(sorted(SENTENCE_TOKENIZERS))))
+        return SENTENCE_TOKENIZERS[tokenizer]()
+    return tokenizer
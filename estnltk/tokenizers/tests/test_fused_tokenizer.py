@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+
+from ...names import *
+from ...text import Text, paragraph_tokenizer, sentence_tokenizer
+from ..word_tokenizer import EstWordTokenizer, wptokenizer, apply_rules, tri_rules, bi_rules
+from ..fused_tokenizer import tokenize_layers
+
+TEXT_ = ('Eile, 25.-26. mail käis E. Talvik v.a dekaan Tartus, kus ta rääkis 3,14 km pikkusest teest.\n\n'
+         'D-vitamiini võeti 1.-3. jaanuaril rohkem! Kas see on hea?Ei tea.Mul jääb puudu 8.—12. klassist.')
+
+
+def sentence_words(text, start, end):
+    sent_text = text[start:end]
+    spans = list(wptokenizer.span_tokenize(sent_text))
+    tokens, spans = apply_rules([sent_text[s:e] for s, e in spans], spans, 3, tri_rules)
+    tokens, spans = apply_rules(tokens, spans, 2, bi_rules)
+    return [(s + start, e + start) for s, e in spans]
+
+
+class FusedTokenizerTest(unittest.TestCase):
+
+    def test_same_as_layered(self):
+        paragraphs, sentences, words = tokenize_layers(TEXT_, paragraph_tokenizer, sentence_tokenizer,
+                                                       EstWordTokenizer())
+        self.assertListEqual([(0, 91), (93, 188)], [(p[START], p[END]) for p in paragraphs])
+        expected = [span for s in sentences for span in sentence_words(TEXT_, s[START], s[END])]
+        self.assertListEqual(expected, [(w[START], w[END]) for w in words])
+        self.assertListEqual([TEXT_[s:e] for s, e in expected], [w[TEXT] for w in words])
+        self.assertIn('25.-26.', [w[TEXT] for w in words])
+
+    def test_windows(self):
+        tokenizer = EstWordTokenizer()
+        windows = [(0, 13), (6, 20), (40, 52)]
+        self.assertListEqual([sentence_words(TEXT_, s, e) for s, e in windows],
+                             tokenizer.span_tokenize_windows(TEXT_, windows))
+
+    def test_text(self):
+        text = Text(TEXT_)
+        text.tokenize_words()
+        expected = Text(TEXT_)
+        expected.tokenize_sentences()
+        self.assertListEqual(expected[PARAGRAPHS], text[PARAGRAPHS])
+        self.assertListEqual(expected[SENTENCES], text[SENTENCES])
+        self.assertListEqual([span for s in expected.sentence_spans for span in sentence_words(TEXT_, *s)],
+                             text.word_spans)
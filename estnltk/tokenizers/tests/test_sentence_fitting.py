@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import re
+import unittest
+
+from ...names import *
+from ...text import Text, sentence_tokenizer
+from ..sentence_fitting import paragraph_words, align_sentences, fit_sentences
+
+
+class SentenceFittingTest(unittest.TestCase):
+
+    def words(self, text):
+        return [{START: m.start(), END: m.end(), TEXT: m.group()} for m in re.finditer(r'\S+', text)]
+
+    def test_paragraph_words(self):
+        words = self.words('a b c d e')
+        paragraphs = [(0, 3), (4, 5), (6, 9)]
+        self.assertListEqual([words[0:2], words[2:3], words[3:5]], paragraph_words(words, paragraphs))
+        # unordered words keep their order
+        self.assertListEqual([[words[4], words[3]], [words[1], words[0]]],
+                             paragraph_words(words[::-1], [(6, 9), (0, 3)]))
+
+    def test_align(self):
+        words = self.words('Tere . Kuidas läheb ?')
+        self.assertListEqual([(0, 6), (7, 21)], align_sentences(words, [['Tere', '.'], ['Kuidas', 'läheb', '?']]))
+        with self.assertRaises(Exception):
+            align_sentences(words, [['Tere', '!']])
+
+    def test_fit(self):
+        text = 'Esimene lause . Teine lause .\n\nKolmas lause .'
+        sentences = fit_sentences(self.words(text), [(0, 29), (31, 45)], sentence_tokenizer)
+        self.assertListEqual([(0, 15), (16, 29), (31, 45)], [(s[START], s[END]) for s in sentences])
+
+    def test_text(self):
+        text = Text('Esimene lause. Teine lause.\n\nKolmas lause.')
+        text.tokenize_words()
+        expected = text[SENTENCES]
+        del text[SENTENCES]
+        text.tokenize_sentences()
+        self.assertListEqual(expected, text[SENTENCES])
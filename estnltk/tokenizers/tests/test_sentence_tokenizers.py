@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import pickle
+import unittest
+
+from ...names import *
+from ...text import Text
+from ..sent_tokenizer_for_koond import SentenceTokenizerForKoond
+from ..sentence_tokenizers import EstSentenceTokenizer, PunktTokenizer, get_sentence_tokenizer, sentences_from_tokens
+
+
+class EstSentenceTokenizerTest(unittest.TestCase):
+
+    def tokenize(self, s):
+        return EstSentenceTokenizer().tokenize(s)
+
+    def test_endings(self):
+        self.assertListEqual(['Tere!', 'Kuidas läheb?', 'Hästi.'], self.tokenize('Tere! Kuidas läheb? Hästi.'))
+        self.assertListEqual(['Ta ütles: "Tule siia."', 'Ma tulin.'], self.tokenize('Ta ütles: "Tule siia." Ma tulin.'))
+
+    def test_no_break(self):
+        self.assertListEqual(['Kirja saatis E. Talvik Tartust.'], self.tokenize('Kirja saatis E. Talvik Tartust.'))
+        self.assertListEqual(['Vt. Tabel 3 ja nt. Joonis 2.'], self.tokenize('Vt. Tabel 3 ja nt. Joonis 2.'))
+        self.assertListEqual(['Ta sündis 5. mail.'], self.tokenize('Ta sündis 5. mail.'))
+
+    def test_joined(self):
+        self.assertListEqual(['Teeme valikuid.', 'Valime kõike.'], self.tokenize('Teeme valikuid.Valime kõike.'))
+        self.assertListEqual(['Vaata www.neti.ee lehte.'], self.tokenize('Vaata www.neti.ee lehte.'))
+
+    def test_spans(self):
+        self.assertListEqual([(1, 6), (8, 13)], EstSentenceTokenizer().span_tokenize(' Tere.\n Head!\n'))
+        self.assertListEqual([], EstSentenceTokenizer().span_tokenize('  '))
+
+    def test_sentences_from_tokens(self):
+        tokens = ['Tere', '.', 'Kuidas', 'läheb', '?', 'Hästi']
+        self.assertListEqual([['Tere', '.'], ['Kuidas', 'läheb', '?'], ['Hästi']],
+                             sentences_from_tokens(EstSentenceTokenizer(), tokens))
+        tokens = ['Tere!', 'Kuidas', 'läheb?', 'Hästi']
+        self.assertListEqual([['Tere!'], ['Kuidas', 'läheb?'], ['Hästi']],
+                             sentences_from_tokens(EstSentenceTokenizer(), tokens))
+
+
+class SentenceTokenizerBackendsTest(unittest.TestCase):
+
+    def test_names(self):
+        self.assertIsInstance(get_sentence_tokenizer('estnltk'), EstSentenceTokenizer)
+        self.assertIsInstance(get_sentence_tokenizer('punkt'), PunktTokenizer)
+        self.assertIsInstance(get_sentence_tokenizer('koond'), SentenceTokenizerForKoond)
+        tokenizer = EstSentenceTokenizer()
+        self.assertIs(tokenizer, get_sentence_tokenizer(tokenizer))
+        with self.assertRaises(ValueError):
+            get_sentence_tokenizer('unknown')
+
+    def test_text(self):
+        text = Text('Tere! Kuidas läheb?\n\nHästi.', sentence_tokenizer='estnltk')
+        self.assertListEqual(['Tere!', 'Kuidas läheb?', 'Hästi.'], text.sentence_texts)
+        self.assertListEqual([['Tere', '!'], ['Kuidas', 'läheb', '?'], ['Hästi', '.']],
+                             [s.word_texts for s in text.split_by_sentences()])
+
+    def test_fitting(self):
+        text = Text({TEXT: 'Tere! Kuidas läheb?', WORDS: [{START: 0, END: 5, TEXT: 'Tere!'},
+                                                          {START: 6, END: 12, TEXT: 'Kuidas'},
+                                                          {START: 13, END: 19, TEXT: 'läheb?'}]},
+                    sentence_tokenizer='estnltk')
+        self.assertListEqual([(0, 5), (6, 19)], text.sentence_spans)
+
+    def test_punkt(self):
+        tokenizer = pickle.loads(pickle.dumps(PunktTokenizer()))
+        self.assertListEqual(['Tere!', 'Kuidas läheb?'], tokenizer.tokenize('Tere! Kuidas läheb?'))
+        koond = SentenceTokenizerForKoond(EstSentenceTokenizer())
+        self.assertListEqual(['Tere!', 'Kuidas läheb?'], koond.tokenize('Tere! Kuidas läheb?'))
@@ -20,9 +20,12 @@ from nltk.tokenize.api import StringTokenizer
 
 from estnltk.textcleaner import EST_ALPHA, EST_ALPHA_UPPER
 
+import re as std_re
 import regex as re
 
 wptokenizer = WordPunctTokenizer()
+# the pattern of WordPunctTokenizer compiled with the standard re module, as NLTK does
+wordpunct = std_re.compile(wptokenizer._pattern, wptokenizer._flags)
 digits = re.compile('\d+')
 
 #  Listing of different hypen/minus/dash symbols in utf8;
@@ -101,12 +104,72 @@ def apply_rules(tokens, spans, n, rules):
     return res_tokens, res_spans
 
 
+# the lengths of the tokens the rules can join: the middle token of the tri rules is a hyphen, ".-", ".", ","
+# or "/" and one of the tokens of the bi rules is "." or a hyphen
+def tri_candidate(spans):
+    return spans[1][1] - spans[1][0] <= 2
+
+
+def bi_candidate(spans):
+    return spans[0][1] - spans[0][0] == 1 or spans[1][1] - spans[1][0] == 1
+
+
+def join_spans(text, spans, n, rules, candidate=None):
+    """The same as :py:func:`apply_rules`, but the tokens are given only by their spans in the text.
+
+    The tokens are sliced from the text only when n consequent tokens touch each other and pass the
+    ``candidate`` test of their spans, which is much faster than carrying the token strings along with the spans.
+    """
+    res_spans = []
+    for span in spans:
+        # most tokens are separated by spaces, so check first if the last two tokens touch
+        touches = res_spans and res_spans[-1][1] == span[0]
+        res_spans.append(span)
+        if touches and len(res_spans) >= n:
+            window = res_spans[-n:]
+            if all(window[i][1] == window[i + 1][0] for i in range(n - 1)) and \
+                    (candidate is None or candidate(window)):
+                test_tokens = [text[s:e] for s, e in window]
+                for rule in rules:
+                    if rule(*test_tokens):
+                        res_spans[-n:] = [(res_spans[-n][0], res_spans[-1][1])]
+    return res_spans
+
+
+def join_tokens(text, spans):
+    """Apply the tri rules and then the bi rules to the token spans of the text."""
+    return join_spans(text, join_spans(text, spans, 3, tri_rules, tri_candidate), 2, bi_rules, bi_candidate)
+
+
+def word_span_tokenize(text):
+    return join_tokens(text, [m.span() for m in wordpunct.finditer(text)])
+
+
 def word_tokenize(text):
-    spans = list(wptokenizer.span_tokenize(text))
-    tokens = [text[s:e] for s, e in spans]
-    tokens, spans = apply_rules(tokens, spans, 3, tri_rules)
-    tokens, spans = apply_rules(tokens, spans, 2, bi_rules)
-    return tokens, spans
+    spans = word_span_tokenize(text)
+    return [text[s:e] for s, e in spans], spans
+
+
+def windows_span_tokenize(text, windows):
+    """Tokenize the windows of the text without slicing the text.
+
+    The word pattern is matched in the windows of the text with the ``pos`` and ``endpos`` arguments, so the
+    token spans are relative to the start of the text and need no translation. The result is the same as
+    tokenizing every window separately.
+
+    Parameters
+    ----------
+    text: str
+        The text.
+    windows: list of (int, int)
+        The (start, end) spans of the windows, for example sentences.
+
+    Returns
+    -------
+    list of (list of (int, int))
+        The spans of the tokens in each window, relative to the start of the text.
+    """
+    return [join_tokens(text, [m.span() for m in wordpunct.finditer(text, start, end)]) for start, end in windows]
 
 
 class EstWordTokenizer(StringTokenizer):
@@ -115,4 +178,8 @@ class EstWordTokenizer(StringTokenizer):
         return word_tokenize(s)[0]
 
     def span_tokenize(self, s):
-        return word_tokenize(s)[1]
+        return word_span_tokenize(s)
+
+    def span_tokenize_windows(self, s, windows):
+        """The spans of the tokens in the given windows of the string, see :py:func:`windows_span_tokenize`."""
+        return windows_span_tokenize(s, windows)
@@ -4,6 +4,9 @@ __author__ = 'Andres'
 
 
 import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
 
 # Matches tags
 tagRE = re.compile(r'(.*?)<(/?\w+)[^>]*>(?:([^<]*)(<.*?>)?)?')
@@ -49,9 +52,7 @@ placeholder_tags = {'math':'formula', 'code':'codice'}
 quote_quote = re.compile(r'""([^"]*?)""')
 
 # Match selfClosing HTML tags
-selfClosing_tag_patterns = [
-    re.compile(r'<\s*%s\b[^>]*/\s*>' % tag, re.DOTALL | re.IGNORECASE) for tag in selfClosingTags
-]
+selfClosing_tag_pattern = re.compile(r'<\s*(?:%s)\b[^>]*/\s*>' % '|'.join(selfClosingTags), re.DOTALL | re.IGNORECASE)
 
 # Match HTML placeholder tags
 placeholder_tag_patterns = [
@@ -59,22 +60,96 @@ placeholder_tag_patterns = [
      repl) for tag, repl in placeholder_tags.items()
 ]
 
-# Match ignored tags
-ignored_tag_patterns = []
-def ignoreTag(tag):
-    left = re.compile(r'<%s\b[^>/]*>' % tag, re.IGNORECASE) # both <ref> and <reference>
-    right = re.compile(r'</\s*%s>' % tag, re.IGNORECASE)
-    ignored_tag_patterns.append((left, right))
+# Match ignored tags, both <ref> and <reference>
+ignored_tag_pattern = re.compile(r'<(?:%s)\b[^>/]*>|</\s*(?:%s)>' % ('|'.join(ignoredTags), '|'.join(ignoredTags)),
+                                 re.IGNORECASE)
+
+# Match discarded elements
+discard_element_patterns = [
+    (re.compile(r'<\s*%s\b[^>/]*>' % tag), re.compile(r'<\s*/\s*%s>' % tag)) for tag in discardElements
+]
+
+# Cleanup
+space_before_punctuation = re.compile(u' (,:\.\)\]Â»)')
+space_after_punctuation = re.compile(u'(\[\(Â«) ')
+punctuation_lines = re.compile(r'\n\W+?\n', flags=re.U)
+
+
+class StageTimer(object):
+    """Collects the time spent in the stages of parsing and cleaning the pages.
+
+    The totals of the stages and the slowest pages are kept, so that pathological pages can be found::
+
+        timer = StageTimer()
+        text = clean(text, timer)
+        timer.endPage(title)
+        print(timer.report())
+    """
+
+    def __init__(self, slowest=10):
+        self.totals = defaultdict(float)
+        self.pages = 0
+        self.slowest = []  # (seconds, title, stage times) of the slowest pages
+        self.keep = slowest
+        self.current = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.current[name] += time.time() - start
+
+    def endPage(self, title):
+        """Add the times of the stages since the previous page to the totals."""
+        seconds = sum(self.current.values())
+        for name, value in self.current.items():
+            self.totals[name] += value
+        self.pages += 1
+        self.slowest.append((seconds, title, dict(self.current)))
+        self.slowest = sorted(self.slowest, key=lambda page: -page[0])[:self.keep]
+        self.current = defaultdict(float)
+
+    def report(self):
+        lines = ['{} pages, {:.3f} seconds'.format(self.pages, sum(self.totals.values()))]
+        for name, value in sorted(self.totals.items(), key=lambda item: -item[1]):
+            lines.append('    {:<20} {:10.3f}'.format(name, value))
+        lines.append('Slowest pages:')
+        for seconds, title, stages in self.slowest:
+            worst = max(stages, key=stages.get) if stages else ''
+            lines.append('    {:10.3f} {} (slowest stage: {})'.format(seconds, title, worst))
+        return '\n'.join(lines)
+
+
+@contextmanager
+def _noStage():
+    yield
+
+
+def timedStage(timer, name):
+    """The stage of the timer, or a context that does nothing, if the timer is None."""
+    if timer is None:
+        return _noStage()
+    return timer.stage(name)
+
+
+_delimiters = {}
+
+
+def _compileDelimiter(delim):
+    if delim not in _delimiters:
+        _delimiters[delim] = re.compile(delim)
+    return _delimiters[delim]
 
-for tag in ignoredTags:
-    ignoreTag(tag)
 
 def dropNested(text, openDelim, closeDelim):
     """
     A matching function for nested expressions, e.g. namespaces and tables.
+    The delimiters are regular expressions, either compiled or not.
     """
-    openRE = re.compile(openDelim)
-    closeRE = re.compile(closeDelim)
+    openRE = openDelim if hasattr(openDelim, 'search') else _compileDelimiter(openDelim)
+    closeRE = closeDelim if hasattr(closeDelim, 'search') else _compileDelimiter(closeDelim)
     # partition text in separate blocks { } { }
     spans = []                # pairs (s, e) for each partition
     nest = 0                    # nesting level
@@ -126,79 +201,78 @@ def dropSpans(spans, text):
     Drop from text the blocks identified in :param spans:, possibly nested.
     """
     spans.sort()
-    res = ''
+    res = []
     offset = 0
     for s, e in  spans:
         if offset <= s:         # handle nesting
             if offset < s:
-                res += text[offset:s]
+                res.append(text[offset:s])
             offset = e
-    res += text[offset:]
-    return res
+    res.append(text[offset:])
+    return ''.join(res)
 
-def clean(text):
+def replacePlaceholders(pattern, placeholder, text):
     """
-    Transforms wiki markup.
-    @see https://www.mediawiki.org/wiki/Help:Formatting
+    Replace the matches of the pattern with numbered placeholders, equal matches get the same number.
     """
+    numbers = {}
+    counter = [0]
 
+    def replace(match):
+        counter[0] += 1
+        return numbers.setdefault(match.group(), '%s_%d' % (placeholder, counter[0]))
 
+    return pattern.sub(replace, text)
 
-    text = bold_italic.sub(r'\1', text)
-    text = bold.sub(r'\1', text)
-    text = italic_quote.sub(r'"\1"', text)
-    text = italic.sub(r'"\1"', text)
-    text = quote_quote.sub(r'"\1"', text)
-    # residuals of unbalanced quotes
-    text = text.replace("'''", '').replace("''", '"')
-    text = newlines.sub(r'\n', text)
-    text = bulletlist.sub(r'', text)
-
-    # Collect spans
-
-    spans = []
-    # Drop HTML comments
-    for m in comment.finditer(text):
-            spans.append((m.start(), m.end()))
-
-    # Drop self-closing tags
-    for pattern in selfClosing_tag_patterns:
-        for m in pattern.finditer(text):
-            spans.append((m.start(), m.end()))
+def clean(text, timer=None):
+    """
+    Transforms wiki markup.
+    @see https://www.mediawiki.org/wiki/Help:Formatting
 
-    # Drop ignored tags
-    for left, right in ignored_tag_patterns:
-        for m in left.finditer(text):
-            spans.append((m.start(), m.end()))
-        for m in right.finditer(text):
-            spans.append((m.start(), m.end()))
+    If a :py:class:`StageTimer` is given, the time spent in the stages is added to it.
+    """
 
-    # Bulk remove all spans
-    text = dropSpans(spans, text)
+    with timedStage(timer, 'clean.quotes'):
+        text = bold_italic.sub(r'\1', text)
+        text = bold.sub(r'\1', text)
+        text = italic_quote.sub(r'"\1"', text)
+        text = italic.sub(r'"\1"', text)
+        text = quote_quote.sub(r'"\1"', text)
+        # residuals of unbalanced quotes
+        text = text.replace("'''", '').replace("''", '"')
+        text = newlines.sub(r'\n', text)
+        text = bulletlist.sub(r'', text)
+
+    # Collect the spans of comments, self-closing tags and ignored tags and remove them at once
+    with timedStage(timer, 'clean.tags'):
+        spans = [m.span() for m in comment.finditer(text)]
+        spans.extend(m.span() for m in selfClosing_tag_pattern.finditer(text))
+        spans.extend(m.span() for m in ignored_tag_pattern.finditer(text))
+        text = dropSpans(spans, text)
 
     # Drop discarded elements
-    for tag in discardElements:
-        text = dropNested(text, r'<\s*%s\b[^>/]*>' % tag, r'<\s*/\s*%s>' % tag)
+    with timedStage(timer, 'clean.elements'):
+        for openRE, closeRE in discard_element_patterns:
+            text = dropNested(text, openRE, closeRE)
 
     # Expand placeholders
-    for pattern, placeholder in placeholder_tag_patterns:
-        index = 1
-        for match in pattern.finditer(text):
-            text = text.replace(match.group(), '%s_%d' % (placeholder, index))
-            index += 1
+    with timedStage(timer, 'clean.placeholders'):
+        for pattern, placeholder in placeholder_tag_patterns:
+            text = replacePlaceholders(pattern, placeholder, text)
 
-    text = text.replace('<<', u'Â«').replace('>>', u'Â»')
+        text = text.replace('<<', u'Â«').replace('>>', u'Â»')
 
     #############################################
 
     # Cleanup text
-    text = text.replace('\t', ' ')
-    text = spaces.sub(' ', text)
-    text = dots.sub('...', text)
-    text = re.sub(u' (,:\.\)\]Â»)', r'\1', text)
-    text = re.sub(u'(\[\(Â«) ', r'\1', text)
-    text = re.sub(r'\n\W+?\n', '\n', text, flags=re.U) # lines with only punctuations
-    text = text.replace(',,', ',').replace(',.', '.')
+    with timedStage(timer, 'clean.cleanup'):
+        text = text.replace('\t', ' ')
+        text = spaces.sub(' ', text)
+        text = dots.sub('...', text)
+        text = space_before_punctuation.sub(r'\1', text)
+        text = space_after_punctuation.sub(r'\1', text)
+        text = punctuation_lines.sub('\n', text) # lines with only punctuations
+        text = text.replace(',,', ',').replace(',.', '.')
 
     return text
 
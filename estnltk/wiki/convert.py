@@ -3,6 +3,7 @@ from __future__ import unicode_literals, print_function, absolute_import
 __author__ = 'Andres'
 
 from .. import Text
+from ..corpus_store import CorpusStoreWriter
 from .jsonWriter import fileCleanerRegEx
 import argparse
 import codecs
@@ -92,7 +93,7 @@ def json_format(j_obj):
     return new
 
 
-def json_2_text(inp, out, verbose = False):
+def json_2_text(inp, out, verbose = False, store = False):
     """Convert a Wikipedia article to Text object.
     Concatenates the sections in wikipedia file and rearranges other information so it
     can be interpreted as a Text object.
@@ -108,32 +109,54 @@ def json_2_text(inp, out, verbose = False):
 
     verbose: if True, prints every article title and total count of converted files
              if False prints every 50th count
+
+    store: if True, the articles are appended to the corpus store in the output directory
+           (see estnltk.corpus_store) instead of writing a .txt file per article
     Returns
     -------
     estnltk.text.Text
         The Text object.
     """
 
-    for root, dirs, filenames in os.walk(inp):
-        for f in filenames:
-            log = codecs.open(os.path.join(root, f), 'r')
-            j_obj = json.load(log)
-            j_obj = json_format(j_obj)
-
-            #not needed, cause the json_format takes care of the right structuring
-            #text = Text(j_obj)
-
-            textWriter(j_obj, out, verbose)
+    writer = CorpusStoreWriter(out) if store else None
+    try:
+        for root, dirs, filenames in os.walk(inp):
+            for f in filenames:
+                log = codecs.open(os.path.join(root, f), 'r')
+                j_obj = json.load(log)
+                j_obj = json_format(j_obj)
+
+                #not needed, cause the json_format takes care of the right structuring
+                #text = Text(j_obj)
+
+                if writer is not None:
+                    storeWriter(j_obj, writer, verbose)
+                else:
+                    textWriter(j_obj, out, verbose)
+    finally:
+        if writer is not None:
+            writer.close()
 
 def textWriter(jsonObj, dir, verbose):
-    global count
-    global printcount
     if not os.path.exists(dir):
         os.makedirs(dir)
 
     with codecs.open(dir+re.sub(fileCleanerRegEx,'',jsonObj['data']['title']+".txt"), 'w', encoding='utf-8') as outfile:
         json.dump(jsonObj, outfile, sort_keys = True, indent = 4)
 
+    progress(jsonObj, verbose)
+
+
+def storeWriter(jsonObj, writer, verbose):
+    # the articles without text are stored with an empty text, so they can be read as Text objects
+    jsonObj.setdefault('text', '')
+    writer.append(jsonObj)
+    progress(jsonObj, verbose)
+
+
+def progress(jsonObj, verbose):
+    global count
+    global printcount
     count += 1
     printcount +=1
 
@@ -159,10 +182,14 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true",
                         help='Print written article titles and count.')
 
+    parser.add_argument("-s", "--store", action="store_true",
+                        help='Append the articles to a corpus store in the output folder instead of JSON files.')
+
     args = parser.parse_args()
     inp = args.input
     out = args.output
     verbose = args.verbose
+    store = args.store
 
     if not os.path.exists(inp):
         print('Input directory does not exist!')
@@ -170,7 +197,7 @@ def main():
     if not os.path.exists(out):
         os.mkdir(out)
 
-    json_2_text(inp, out, verbose)
+    json_2_text(inp, out, verbose, store)
     print('Done!')
 
 
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Random access to multistream Wikipedia dumps.
+
+A multistream dump (for example etwiki-latest-pages-articles-multistream.xml.bz2) is a concatenation
+of bz2 streams, each containing up to 100 pages. The accompanying index file
+(etwiki-latest-pages-articles-multistream-index.txt.bz2) has a line ``offset:page id:title`` for every page,
+where the offset is the position of the stream of the page in the dump. So single pages or ranges of
+streams can be decompressed without reading the dump from the start::
+
+    dump = MultistreamDump('etwiki-latest-pages-articles-multistream.xml.bz2',
+                           'etwiki-latest-pages-articles-multistream-index.txt.bz2')
+    title, timestamp, text = dump.page('Algriim')
+
+The tags and texts yielded by :py:meth:`MultistreamDump.tags` can be passed to the parsers in
+:py:mod:`estnltk.wiki.parser` in place of the output of parse_and_remove.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import bz2
+import codecs
+import io
+import os
+from bisect import bisect_right
+from functools import partial
+from itertools import groupby
+from multiprocessing import Pool
+
+from .parser import parse_and_remove, wikiPages, _parseToRecord
+from .shards import ShardWriter
+
+
+def readIndex(path):
+    """Read the index of a multistream dump, compressed or not.
+
+    Returns
+    -------
+    list of (int, int, str)
+        The stream offset, page id and title of every page.
+    """
+    if path.endswith('.bz2'):
+        f = codecs.getreader('utf-8')(bz2.BZ2File(path))
+    else:
+        f = codecs.open(path, 'r', encoding='utf-8')
+    entries = []
+    with f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line:
+                offset, page_id, title = line.split(':', 2)
+                entries.append((int(offset), int(page_id), title))
+    return entries
+
+
+def _streamTags(path, offset, end):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = bz2.decompress(f.read(end - offset))
+    # the streams contain bare page elements, the last one also the end tag of the dump
+    data = b'<pages>' + data.replace(b'</mediawiki>', b'') + b'</pages>'
+    return parse_and_remove(io.BytesIO(data), 'pages/pages')
+
+
+def _parseStream(stream, path, verbose=False):
+    offset, end = stream
+    return [_parseToRecord(page, verbose) for page in wikiPages(_streamTags(path, offset, end))]
+
+
+class MultistreamDump(object):
+
+    def __init__(self, path, index_path):
+        """
+        Parameters
+        ----------
+        path : str
+            Path of the multistream dump.
+        index_path : str
+            Path of the index of the dump.
+        """
+        self.path = path
+        self.entries = readIndex(index_path)
+        self.titles = dict((title, offset) for offset, _, title in self.entries)
+        #: the offsets of the streams and the numbers of pages in them
+        self.streams = [(offset, len(list(group))) for offset, group in groupby(e[0] for e in self.entries)]
+        self.offsets = [offset for offset, _ in self.streams]
+        self.size = os.path.getsize(path)
+
+    def _end(self, offset):
+        i = bisect_right(self.offsets, offset)
+        return self.offsets[i] if i < len(self.offsets) else self.size
+
+    def streamRange(self, offset):
+        """The start and end positions of the stream at the given offset."""
+        return offset, self._end(offset)
+
+    def tags(self, offsets=None):
+        """Yield the tags and texts of the pages in the given streams (default: all streams)."""
+        for offset in self.offsets if offsets is None else offsets:
+            for tag_text in _streamTags(self.path, *self.streamRange(offset)):
+                yield tag_text
+
+    def pages(self, offsets=None):
+        """Yield the title, timestamp and text of the pages in the given streams (default: all streams)."""
+        return wikiPages(self.tags(offsets))
+
+    def page(self, title):
+        """Decompress the stream of a single page and return its title, timestamp and text.
+
+        Raises
+        ------
+        KeyError
+            If there is no page with the given title.
+        """
+        for page in self.pages([self.titles[title]]):
+            if page[0] == title:
+                return page
+        raise KeyError(title)
+
+    def workerOffsets(self, worker, workers):
+        """The offsets of the streams of a worker, when the streams are divided between the given number of workers."""
+        return self.offsets[worker::workers]
+
+
+def parallelMultistreamParser(dump, outputdir, shards=8, processes=None, streams_per_commit=10, verbose=False):
+    """Parse a multistream dump to compressed json-lines shards, like :py:func:`estnltk.wiki.parser.parallelWikiParser`.
+
+    The worker processes decompress and parse whole streams, the main process only writes the results.
+    The progress is committed after every ``streams_per_commit`` streams and an interrupted run is resumed
+    from the first stream that was not committed.
+
+    Parameters
+    ----------
+    dump : MultistreamDump
+    outputdir : str
+        Directory of the shards.
+    shards : int
+        Number of shards (default: 8).
+    processes : int
+        Number of worker processes (default: the number of CPUs).
+    streams_per_commit : int
+        Number of streams between the commits (default: 10).
+
+    Returns
+    -------
+    int
+        The number of pages read from the dump.
+    """
+    writer = ShardWriter(outputdir, shards)
+    streams, pages = [], 0
+    for offset, count in dump.streams:
+        if pages >= writer.pages:
+            streams.append((offset, count))
+        pages += count
+    if pages - sum(count for _, count in streams) != writer.pages:
+        writer.close()
+        raise ValueError('The committed pages do not end at a stream boundary, the output is not from this dump.')
+
+    worker = partial(_parseStream, path=dump.path, verbose=verbose)
+    pool = Pool(processes)
+    try:
+        for i in range(0, len(streams), streams_per_commit):
+            batch = streams[i:i + streams_per_commit]
+            results = pool.map(worker, [dump.streamRange(offset) for offset, _ in batch])
+            for (offset, count), records in zip(batch, results):
+                if len(records) != count:
+                    raise ValueError('The stream at {} has {} pages, the index lists {}.'.format(offset, len(records), count))
+                for record in records:
+                    writer.add(record)
+            writer.commit()
+            if verbose:
+                print('Committed pages:', writer.pages)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        writer.close()
+    return writer.pages
@@ -8,16 +8,18 @@ import re
 from xml.etree.ElementTree import iterparse
 import argparse
 from bz2 import BZ2File
-import time
-from copy import copy
 from .infoBox import infoBoxParser
 from .sections import sectionsParser
 from .references import referencesFinder,refsParser
 from .categoryParser import categoryParser
 from .jsonWriter import jsonWriter
-from .cleaner import clean
+from .cleaner import clean, StageTimer, timedStage
 from .internalLink import findBalanced
 from .cleaner import dropSpans
+from .shards import ShardWriter, compressRecord
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
 
 # Matches bold/italic
 bold_italic = re.compile(r"'''''(.*?)'''''")
@@ -66,116 +68,179 @@ def parse_and_remove(filename, path):
 def templatesCollector(text, open, close):
     """leaves related articles and wikitables in place"""
     others = []
-    spans = [i for i in findBalanced(text, open, close)]
-    spanscopy = copy(spans)
-    for i in range(len(spans)):
-        start, end = spans[i]
-
+    spans = []
+    for start, end in findBalanced(text, open, close):
         o = text[start:end]
         ol = o.lower()
         if 'vaata|' in ol or 'wikitable' in ol:
-            spanscopy.remove(spans[i])
             continue
         others.append(o)
-    text = dropSpans(spanscopy, text)
+        spans.append((start, end))
+    text = dropSpans(spans, text)
 
     return text, others
 
-def etWikiParser(data, outputdir, verbose = False):
-    global dropcount
-
-    if not outputdir[-1] == r'/':
-        outputdir += r'/'
-
-    totalwriter = 0
-    totalComp = 0
-    totalTime = 0
-    pageObj = {}
+def wikiPages(data):
+    """Collect the title, timestamp and text of every page from the output of parse_and_remove."""
+    page = {}
     for tag, text in data:
         if tag and text:
             tag, text = as_unicode(tag), as_unicode(text)
-            #print(tag, text)
 
         if 'title' in tag:
+            page['title'] = text
 
-        #Drop wikipedia internal pages.
+        if 'timestamp' in tag:
+            page['timestamp'] = text
 
+        if 'text' in tag:
+            yield page.get('title'), page.get('timestamp'), text
 
 
-            pageObj['title'] = text
+def parsePage(title, timestamp, text, verbose=False, timer=None):
+    """Parse the text of a page to an article object, returns None for dropped pages.
 
-            pageObj['url'] = linkBegin+text.replace(' ', '_')
+    If a :py:class:`~estnltk.wiki.cleaner.StageTimer` is given, the times of the stages are added to it.
+    """
+    global dropcount
 
+    pageObj = {}
+    if title is not None:
+        pageObj['title'] = title
+        pageObj['url'] = linkBegin+title.replace(' ', '_')
+    if timestamp is not None:
+        pageObj['timestamp'] = timestamp
+
+    if verbose:
+        print('-----------')
+        print(title, end=' ')
+
+#Drop wikipedia internal pages.
+    for page in dropPages:
+        if title is not None and page in title:
             if verbose:
-                print('-----------')
-                print(pageObj['title'], end=' ')
+                dropcount += 1
+                print('Dropped Page count', dropcount, text.strip())
+            return None
 
-        if 'timestamp' in tag:
-            pageObj['timestamp'] = text
-
-    #Drop redirects
-
-        if 'text' in tag:
-
-            for page in dropPages:
-                if page in pageObj['title']:
-                    if verbose:
-                        dropcount += 1
-                        print('Dropped Page count', dropcount, text.strip())
-                    continue
-
-            try:
-                if '#REDIRECT' in text or '#suuna' in text:
-                    if verbose:
-                        dropcount += 1
-                        print('Dropped Page count:', dropcount, text.strip())
-                    continue
-            except TypeError:
-                print(pageObj)
-                continue
-            compStart = time.time()
-
-    #Finds and marks nicely all the references in the article, returns a tag:reference dictionary
-            text, refsDict = referencesFinder(text)
-
-    #Infoboxes
-            m = re.search(ib, text)
-            if m:
-                text, pageObj['infobox'] = infoBoxParser(text)
+#Drop redirects
+    try:
+        if '#REDIRECT' in text or '#suuna' in text:
+            if verbose:
+                dropcount += 1
+                print('Dropped Page count:', dropcount, text.strip())
+            return None
+    except TypeError:
+        print(pageObj)
+        return None
+
+#Finds and marks nicely all the references in the article, returns a tag:reference dictionary
+    with timedStage(timer, 'references'):
+        text, refsDict = referencesFinder(text)
+
+#Infoboxes
+    with timedStage(timer, 'infobox'):
+        m = re.search(ib, text)
+        if m:
+            text, pageObj['infobox'] = infoBoxParser(text)
 
 #Finds links in references TODO: find unbracketed external links
 
-            if refsDict:
-                refsDict = refsParser(refsDict)
-                pageObj['references'] = refsDict
+    with timedStage(timer, 'references'):
+        if refsDict:
+            refsDict = refsParser(refsDict)
+            pageObj['references'] = refsDict
 #Categories, cleaning, and other element.
-            if '{' in text:
-                text, pageObj['other'] = templatesCollector(text, '{', '}')
+    with timedStage(timer, 'templates'):
+        if '{' in text:
+            text, pageObj['other'] = templatesCollector(text, '{', '}')
 
-            text, catList = categoryParser(text)
-            text = clean(text)
-            pageObj['categories'] = catList
+    with timedStage(timer, 'categories'):
+        text, catList = categoryParser(text)
+    text = clean(text, timer)
+    pageObj['categories'] = catList
 
 #SectionParser is where all the work with links, images etc gets done
-            sectionobj = (sectionsParser(text))
-            pageObj['sections'] = sectionobj
+    with timedStage(timer, 'sections'):
+        sectionobj = (sectionsParser(text))
+    pageObj['sections'] = sectionobj
 
+    if timer is not None:
+        timer.endPage(title)
+    return pageObj
 
-            #Precious time
 
-            thisComp = time.time() - compStart
-            totalComp += thisComp
-            #print('Progtime : ',thisComp , totalComp)
-            timestart = time.time()
-            jsonWriter(pageObj, outputdir, verbose)
-            thisWrite = time.time()-timestart
-            totalwriter += thisWrite
-            #print('Writetime: ' , thisWrite ,totalwriter)
+def etWikiParser(data, outputdir, verbose = False, timings = False):
+    """Parse the pages to json files in the output directory.
+
+    With timings, a report of the time spent in the parsing stages and of the slowest pages is printed at the end.
+    """
 
+    if not outputdir[-1] == r'/':
+        outputdir += r'/'
 
-            pageObj = {}
-            totalTime +=thisComp + thisWrite
-            #print('Totaltime: ' , totalTime)
+    timer = StageTimer() if timings else None
+    for title, timestamp, text in wikiPages(data):
+        pageObj = parsePage(title, timestamp, text, verbose, timer)
+        if pageObj is not None:
+            jsonWriter(pageObj, outputdir, verbose)
+    if timer is not None:
+        print(timer.report())
+
+
+def _parseToRecord(page, verbose=False):
+    """Parse a page in a worker process, returns the title and the compressed json line of the article."""
+    pageObj = parsePage(*page, verbose=verbose)
+    if pageObj is None:
+        return None
+    return pageObj['title'], compressRecord(pageObj)
+
+
+def parallelWikiParser(data, outputdir, shards=8, processes=None, commit_every=1000, verbose=False):
+    """Parse the pages in a process pool and write the articles to compressed json-lines shards.
+
+    The output directory gets the shards, an index of the articles and a progress file, that is
+    written after every ``commit_every`` pages. When the output directory already contains a
+    progress file, the pages committed by the previous run are skipped.
+
+    Parameters
+    ----------
+    data
+        Output of parse_and_remove.
+    outputdir : str
+        Directory of the shards.
+    shards : int
+        Number of shards (default: 8).
+    processes : int
+        Number of worker processes (default: the number of CPUs).
+    commit_every : int
+        Number of pages between the commits (default: 1000).
+
+    Returns
+    -------
+    int
+        The number of pages read from the dump.
+    """
+    writer = ShardWriter(outputdir, shards)
+    pages = islice(wikiPages(data), writer.pages, None)
+    worker = partial(_parseToRecord, verbose=verbose)
+    pool = Pool(processes)
+    try:
+        while True:
+            batch = list(islice(pages, commit_every))
+            if not batch:
+                break
+            for record in pool.map(worker, batch):
+                writer.add(record)
+            writer.commit()
+            if verbose:
+                print('Committed pages:', writer.pages)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        writer.close()
+    return writer.pages
 
 
 def main():
@@ -192,21 +257,49 @@ def main():
     parser.add_argument("-v", "--verbose", action="store_true",
                         help='Print written article titles and count.')
 
+    parser.add_argument("-t", "--timings", action="store_true",
+                        help='Print the time spent in the parsing stages and the slowest pages at the end.')
+
+    parser.add_argument("-p", "--processes", type=int, default=0,
+                        help='Parse with this many worker processes and write the articles to '
+                             'compressed json-lines shards. Interrupted runs are resumed.')
+
+    parser.add_argument("-s", "--shards", type=int, default=8,
+                        help='Number of shards, when using worker processes (default: 8).')
+
+    parser.add_argument("-i", "--index", type=str,
+                        help='Index file of a multistream dump. The worker processes decompress the streams '
+                             'of the dump independently.')
+
 
     args = parser.parse_args()
+    if args.timings and (args.processes or args.index):
+        # the stage timer measures the parsing in this process only
+        parser.error('--timings can not be used with --processes or --index')
     outputDir = args.directory
     inputFile = args.inputfile
     verbose = args.verbose
 
-    if inputFile[-3:] == 'bz2':
+    def write(data):
+        if args.processes:
+            parallelWikiParser(data, outputDir, args.shards, args.processes, verbose=verbose)
+        else:
+            etWikiParser(data, outputDir, verbose, args.timings)
+
+    if args.index:
+        from .multistream import MultistreamDump, parallelMultistreamParser
+        print('Multistream BZ2', inputFile)
+        dump = MultistreamDump(inputFile, args.index)
+        parallelMultistreamParser(dump, outputDir, args.shards, args.processes or None, verbose=verbose)
+    elif inputFile[-3:] == 'bz2':
         print('BZ2', inputFile)
         with BZ2File(inputFile) as xml_file:
             data = parse_and_remove(xml_file, "wikimedia/wikimedia")
-            etWikiParser(data, outputDir, verbose)
+            write(data)
     elif inputFile[-3:] == 'xml':
         print('XML', inputFile)
         data = parse_and_remove(inputFile, "wikimedia/wikimedia")
-        etWikiParser(data, outputDir, verbose)
+        write(data)
     else:
         print("WRONG FILE FORMAT! \nTry etwiki-latest-pages-articles.xml.bz2 from https://dumps.wikimedia.org/etwiki/latest/")
 
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Compressed json-lines shards of parsed articles.
+
+Every article is written to its shard as a separate gzip member, so the shards can be read with
+any gzip reader and single articles can be decompressed using the offsets in the index file.
+The lines of the index file are tab separated: page number, shard, offset, length and title.
+
+The progress file records the number of pages and the sizes of the files at the last commit.
+Anything written after the last commit is truncated, when the writer is opened again.
+"""
+from __future__ import unicode_literals, print_function, absolute_import
+
+import codecs
+import gzip
+import io
+import json
+import os
+
+PROGRESS_FILE = 'progress.json'
+INDEX_FILE = 'index.txt'
+
+
+def shardName(shard):
+    return 'shard-%05d.jsonl.gz' % shard
+
+
+def compressRecord(pageObj):
+    """Compress an article to a gzip member containing a json line."""
+    line = json.dumps(pageObj, sort_keys=True, ensure_ascii=False) + '\n'
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as f:
+        f.write(line.encode('utf-8'))
+    return buffer.getvalue()
+
+
+def decompressRecord(data):
+    with gzip.GzipFile(fileobj=io.BytesIO(data), mode='rb') as f:
+        return json.loads(f.read().decode('utf-8'))
+
+
+def _replace(source, destination):
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        if os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
+
+
+def _openTruncated(path, size):
+    f = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+    f.truncate(size)
+    f.seek(size)
+    return f
+
+
+class ShardWriter(object):
+    """Appends articles to the shards and commits the progress."""
+
+    def __init__(self, outputdir, shards):
+        self.outputdir = outputdir
+        if not os.path.exists(outputdir):
+            os.makedirs(outputdir)
+        progress = self._readProgress()
+        if progress is None:
+            progress = {'pages': 0, 'shards': [0] * shards, 'index': 0}
+        elif len(progress['shards']) != shards:
+            raise ValueError('The output directory contains {} shards, not {}.'.format(len(progress['shards']), shards))
+        self.pages = progress['pages']
+        self.files = [_openTruncated(self._path(shardName(i)), size) for i, size in enumerate(progress['shards'])]
+        self.index = _openTruncated(self._path(INDEX_FILE), progress['index'])
+
+    def _path(self, name):
+        return os.path.join(self.outputdir, name)
+
+    def _readProgress(self):
+        path = self._path(PROGRESS_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def add(self, record):
+        """Add the next page, the record is None for dropped pages and (title, compressed article) otherwise."""
+        if record is not None:
+            title, data = record
+            shard = self.pages % len(self.files)
+            f = self.files[shard]
+            line = '{}\t{}\t{}\t{}\t{}\n'.format(self.pages, shard, f.tell(), len(data), title)
+            f.write(data)
+            self.index.write(line.encode('utf-8'))
+        self.pages += 1
+
+    def commit(self):
+        """Make the pages added so far durable."""
+        for f in self.files + [self.index]:
+            f.flush()
+            os.fsync(f.fileno())
+        progress = {'pages': self.pages, 'shards': [f.tell() for f in self.files], 'index': self.index.tell()}
+        temp = self._path(PROGRESS_FILE + '.tmp')
+        with open(temp, 'w') as f:
+            json.dump(progress, f)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(temp, self._path(PROGRESS_FILE))
+
+    def close(self):
+        for f in self.files + [self.index]:
+            f.close()
+
+
+class ShardReader(object):
+    """Reads the articles written by :py:class:`ShardWriter`."""
+
+    def __init__(self, outputdir):
+        self.outputdir = outputdir
+        self.entries = []
+        with codecs.open(os.path.join(outputdir, INDEX_FILE), 'r', encoding='utf-8') as f:
+            for line in f:
+                page, shard, offset, length, title = line.rstrip('\n').split('\t', 4)
+                self.entries.append((int(page), int(shard), int(offset), int(length), title))
+        self.titles = dict((entry[4], i) for i, entry in enumerate(self.entries))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _read(self, entry):
+        _, shard, offset, length, _ = entry
+        with open(os.path.join(self.outputdir, shardName(shard)), 'rb') as f:
+            f.seek(offset)
+            return decompressRecord(f.read(length))
+
+    def __getitem__(self, i):
+        return self._read(self.entries[i])
+
+    def get(self, title):
+        """The article with the given title or None."""
+        if title not in self.titles:
+            return None
+        return self[self.titles[title]]
+
+    def __iter__(self):
+        for entry in self.entries:
+            yield self._read(entry)
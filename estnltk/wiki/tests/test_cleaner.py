@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import unittest
+
+from ..cleaner import clean, dropSpans, dropNested, StageTimer
+from ..parser import parsePage, templatesCollector
+
+
+class CleanerTest(unittest.TestCase):
+
+    def test_drop_spans(self):
+        self.assertEqual('ac', dropSpans([(3, 4), (1, 3), (1, 2)], 'abcd'))
+        self.assertEqual('abcd', dropSpans([], 'abcd'))
+
+    def test_drop_nested(self):
+        text = 'a<table>b<table>c</table>d</table>e<table>f</table>g'
+        self.assertEqual('aeg', dropNested(text, r'<\s*table\b[^>/]*>', r'<\s*/\s*table>'))
+
+    def test_clean(self):
+        text = ("'''Tallinn''' on <b>Eesti</b> pealinn.<!-- kommentaar --><br/>\n\n\n"
+                "<table><tr><td>tabel</td></tr></table>Valem <math>x^2</math> ja <math>y</math> ja <math>x^2</math>.")
+        self.assertEqual('Tallinn on Eesti pealinn.\nValem formula_1 ja formula_2 ja formula_1.', clean(text))
+
+    def test_templates_collector(self):
+        text, others = templatesCollector('a{{mall}}b{{vaata|c}}d{{x}}', '{', '}')
+        self.assertEqual('ab{{vaata|c}}d', text)
+        self.assertListEqual(['{{mall}}', '{{x}}'], others)
+
+    def test_stage_timer(self):
+        timer = StageTimer(slowest=1)
+        parsePage('Esimene', None, "'''Esimene''' artikkel.", timer=timer)
+        parsePage('Teine', None, "'''Teine''' artikkel.", timer=timer)
+        self.assertEqual(2, timer.pages)
+        self.assertIn('clean.tags', timer.totals)
+        self.assertIn('sections', timer.totals)
+        self.assertEqual(1, len(timer.slowest))
+        self.assertIn('2 pages', timer.report())
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import bz2
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..multistream import MultistreamDump, parallelMultistreamParser, readIndex
+from ..parser import parsePage
+from ..shards import ShardReader
+from .test_shards import PAGE, PAGES
+
+
+def writeMultistream(directory, pages, per_stream):
+    """Write a multistream dump and its compressed index, like the ones of dumps.wikimedia.org."""
+    path = os.path.join(directory, 'dump-multistream.xml.bz2')
+    index_path = os.path.join(directory, 'dump-multistream-index.txt.bz2')
+    index = []
+    with open(path, 'wb') as f:
+        f.write(bz2.compress('<mediawiki>\n  <siteinfo>\n  </siteinfo>\n'.encode('utf-8')))
+        for i in range(0, len(pages), per_stream):
+            offset = f.tell()
+            stream = ''.join(PAGE.format(title=title, text=text) for title, text in pages[i:i + per_stream])
+            if i + per_stream >= len(pages):
+                stream += '</mediawiki>\n'
+            f.write(bz2.compress(stream.encode('utf-8')))
+            index.extend('{}:{}:{}\n'.format(offset, i + j + 1, title)
+                         for j, (title, _) in enumerate(pages[i:i + per_stream]))
+    with open(index_path, 'wb') as f:
+        f.write(bz2.compress(''.join(index).encode('utf-8')))
+    return path, index_path
+
+
+class MultistreamTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.pages = PAGES + [('Pealkiri: koolonitega', 'Tekst [[Eesti]] kohta.')]
+        self.dump = MultistreamDump(*writeMultistream(self.dir, self.pages, 5))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_index(self):
+        self.assertEqual(23, len(self.dump.entries))
+        self.assertEqual((self.dump.offsets[-1], 23, 'Pealkiri: koolonitega'), self.dump.entries[-1])
+        self.assertEqual(5, len(self.dump.streams))
+        self.assertListEqual([5, 5, 5, 5, 3], [count for _, count in self.dump.streams])
+        index_path = os.path.join(self.dir, 'index.txt')
+        with codecs.open(index_path, 'w', encoding='utf-8') as f:
+            f.write('{}:1:{}\n'.format(*self.dump.entries[0][::2]))
+        self.assertEqual([self.dump.entries[0]], readIndex(index_path))
+
+    def test_page(self):
+        title, timestamp, text = self.dump.page('Artikkel 12')
+        self.assertEqual('Artikkel 12', title)
+        self.assertEqual('2015-03-22T08:25:09Z', timestamp)
+        self.assertEqual(dict(self.pages)['Artikkel 12'], text)
+        self.assertEqual(dict(self.pages)['Pealkiri: koolonitega'], self.dump.page('Pealkiri: koolonitega')[2])
+        self.assertRaises(KeyError, self.dump.page, 'Puudub')
+
+    def test_pages(self):
+        self.assertListEqual([title for title, _ in self.pages], [page[0] for page in self.dump.pages()])
+        offsets = self.dump.workerOffsets(1, 2)
+        self.assertListEqual([title for title, _ in self.pages[5:10] + self.pages[15:20]],
+                             [page[0] for page in self.dump.pages(offsets)])
+
+    def test_parallel_parser(self):
+        output = os.path.join(self.dir, 'shards')
+        self.assertEqual(23, parallelMultistreamParser(self.dump, output, shards=2, processes=2, streams_per_commit=2))
+        expected = [page for page in (parsePage(*page) for page in self.dump.pages()) if page is not None]
+        self.assertListEqual(expected, list(ShardReader(output)))
+        # nothing is left to parse
+        self.assertEqual(23, parallelMultistreamParser(self.dump, output, shards=2, processes=2))
+        self.assertListEqual(expected, list(ShardReader(output)))
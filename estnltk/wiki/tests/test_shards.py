@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, print_function, absolute_import
+
+import codecs
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..parser import parse_and_remove, wikiPages, parsePage, parallelWikiParser
+from ..shards import ShardReader
+
+PAGE = '''  <page>
+    <title>{title}</title>
+    <revision>
+      <timestamp>2015-03-22T08:25:09Z</timestamp>
+      <text xml:space="preserve">{text}</text>
+    </revision>
+  </page>
+'''
+
+
+def wikiXml(pages):
+    return '<mediawiki>\n{}</mediawiki>\n'.format(''.join(PAGE.format(title=title, text=text) for title, text in pages))
+
+
+PAGES = [('Artikkel {}'.format(i), "'''Artikkel {}''' on [[Eesti]] [[linn]].\n\n== Ajalugu ==\nLinn rajati {}. aastal."
+          "\n[[Kategooria:Linnad]]".format(i, 1200 + i)) for i in range(20)]
+PAGES.insert(3, ('Mall:Kast', 'Mall'))
+PAGES.insert(7, ('Suunamine', '#REDIRECT [[Artikkel 1]]'))
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt(data, pages):
+    """Pass the tags and texts of the given number of pages and raise Interrupted."""
+    for tag, text in data:
+        if 'text' in tag:
+            if pages == 0:
+                raise Interrupted()
+            pages -= 1
+        yield tag, text
+
+
+class ParallelParserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.xml = os.path.join(self.dir, 'dump.xml')
+        with codecs.open(self.xml, 'w', encoding='utf-8') as f:
+            f.write(wikiXml(PAGES))
+        self.output = os.path.join(self.dir, 'shards')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def expected(self):
+        pages = (parsePage(*page) for page in wikiPages(parse_and_remove(self.xml, 'wikimedia/wikimedia')))
+        return [page for page in pages if page is not None]
+
+    def test_parallel_parser(self):
+        pages = parallelWikiParser(parse_and_remove(self.xml, 'wikimedia/wikimedia'), self.output,
+                                   shards=3, processes=2, commit_every=5)
+        self.assertEqual(22, pages)
+        reader = ShardReader(self.output)
+        expected = self.expected()
+        self.assertEqual(20, len(expected))
+        self.assertListEqual(expected, list(reader))
+        self.assertEqual(expected[5], reader.get('Artikkel 5'))
+        self.assertIsNone(reader.get('Suunamine'))
+        self.assertEqual(3, len([name for name in os.listdir(self.output) if name.endswith('.jsonl.gz')]))
+
+    def test_resume(self):
+        data = interrupt(parse_and_remove(self.xml, 'wikimedia/wikimedia'), 13)
+        self.assertRaises(Interrupted, parallelWikiParser, data, self.output, shards=3, processes=2, commit_every=5)
+        self.assertEqual(8, len(ShardReader(self.output)))  # 2 of 10 committed pages were dropped
+
+        pages = parallelWikiParser(parse_and_remove(self.xml, 'wikimedia/wikimedia'), self.output,
+                                   shards=3, processes=2, commit_every=5)
+        self.assertEqual(22, pages)
+        self.assertListEqual(self.expected(), list(ShardReader(self.output)))
+
+    def test_shard_count(self):
+        parallelWikiParser(parse_and_remove(self.xml, 'wikimedia/wikimedia'), self.output, shards=3, processes=1)
+        self.assertRaises(ValueError, parallelWikiParser, parse_and_remove(self.xml, 'wikimedia/wikimedia'),
+                          self.output, shards=2, processes=1)
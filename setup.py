@@ -48,6 +48,11 @@ setup(
     version = __version__,
 
     packages = find_packages(),
+    entry_points = {
+        'console_scripts': [
+            'estnltk-koondkorpus = estnltk.koondkorpus:main',
+        ],
+    },
     include_package_data=True,
     package_data = {
         'estnltk': ['corpora/arvutustehnika_ja_andmetootlus/*.xml', 'corpora/*.json', 'java-res/*.*'],
@@ -87,10 +92,9 @@ morphological analysis, named entity recognition, etc. for the Estonian language
         'nltk>=3.1',                        # NLTK mainly used for English
         'regex>=2015.07.19',                # improved Python regular expressions
         'pandas>=0.18',                     # Panel Data Analysis library for Python
+        'numpy>=1.9',                       # array operations, used by layer algebra
         'python-crfsuite>=0.8.4',           # Conditional random fields library
         'cached-property>=1.2.0',           # Simple property for caching results
-        'beautifulsoup4>=4.4.0',            # HTML parsing library
-        'html5lib>=0.9999999',              # HTML parsing library
         'elasticsearch==2',                 # database support
         'pyahocorasick>=1.1.4',             # fast pattern matching NOTE: we might have to make this an optional dep if we fail to install it on windows.
         'unicodecsv>= 0.14.1',              # Read/write csv files in unicode